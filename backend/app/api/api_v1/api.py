@@ -1,8 +1,11 @@
 from fastapi import APIRouter
 
-from app.api.api_v1.endpoints import mlflow_registry
+from app.api.api_v1.endpoints import fleet, mlflow_registry, monitoring, webhooks
 
 api_router = APIRouter()
 api_router.include_router(
     mlflow_registry.router, prefix="/model-catalog/mlflow", tags=["Model Catalog"]
 )
+api_router.include_router(fleet.router, prefix="/fleet", tags=["Fleet"])
+api_router.include_router(monitoring.router, prefix="/monitoring", tags=["Monitoring"])
+api_router.include_router(webhooks.router, prefix="/webhooks", tags=["Webhooks"])
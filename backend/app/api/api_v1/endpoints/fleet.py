@@ -0,0 +1,168 @@
+import asyncio
+from concurrent.futures import Executor
+from typing import AsyncIterator, List, Optional, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+
+from app.api import deps
+from app.clients.mlflow import AsyncMLflowClient
+from app.gitops.commit_queue import CommitQueue
+from app.gitops.fleet import FleetRenderer, iter_fleet_models
+from app.gitops.manifest_index import ManifestIndex
+from app.schemas.fleet import FleetCommit, FleetCommitRequest, FleetManifestRequest
+
+router = APIRouter()
+
+
+def fleet_chunks(
+    fleet: FleetManifestRequest, mlflow_client: AsyncMLflowClient
+) -> AsyncIterator[Tuple[List[dict], List[dict]]]:
+    """
+    Resolve the model versions selected by a fleet request.
+
+    Args:
+        fleet (FleetManifestRequest): The fleet request.
+        mlflow_client (AsyncMLflowClient): Client used to resolve the versions.
+
+    Returns:
+        AsyncIterator[Tuple[List[dict], List[dict]]]: Resolved and failed versions, chunk by chunk.
+    """
+    versions = (
+        [(ref.name, ref.version) for ref in fleet.versions]
+        if fleet.versions is not None
+        else None
+    )
+    return iter_fleet_models(mlflow_client, filter=fleet.filter, versions=versions)
+
+
+@router.post(
+    "/manifests",
+    status_code=200,
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/yaml": {}}}},
+)
+async def render_fleet_manifests(
+    fleet: FleetManifestRequest,
+    mlflow_client: AsyncMLflowClient = Depends(deps.get_mlflow_client),
+    render_pool: Executor = Depends(deps.get_render_pool),
+) -> StreamingResponse:
+    """
+    Endpoint to stream the InferenceService manifests of a fleet as one multi-document YAML bundle.
+    """
+    renderer = FleetRenderer(render_pool, fleet.instance_type, fleet.service_account)
+
+    async def bundle() -> AsyncIterator[str]:
+        async for documents in renderer.render(fleet_chunks(fleet, mlflow_client)):
+            yield "".join(f"---\n{document}" for _, document in documents)
+        for failed in renderer.failed + renderer.collisions:
+            # Client errors span several lines; each must stay a comment.
+            error = "\n# ".join(str(failed["error"]).splitlines())
+            yield (f"# skipped {failed['name']} version {failed['version']}: {error}\n")
+
+    return StreamingResponse(bundle(), media_type="application/yaml")
+
+
+async def plan_fleet(
+    fleet: FleetCommitRequest,
+    renderer: FleetRenderer,
+    mlflow_client: AsyncMLflowClient,
+    manifest_index: ManifestIndex,
+) -> Tuple[List[dict], int]:
+    """
+    Render a fleet and plan the commit actions of its changed manifests.
+
+    Args:
+        fleet (FleetCommitRequest): The fleet request.
+        renderer (FleetRenderer): Renderer collecting the failed versions.
+        mlflow_client (AsyncMLflowClient): Client used to resolve the versions.
+        manifest_index (ManifestIndex): Index of the committed manifests.
+
+    Returns:
+        Tuple[List[dict], int]: The commit actions and the number of manifests rendered.
+
+    Raises:
+        HTTPException: 409 if model versions of the fleet share a service name.
+    """
+    directory = fleet.directory.strip("/")
+    actions = []
+    rendered = 0
+    # Only changed manifests are kept until the commit is made.
+    async for documents in renderer.render(fleet_chunks(fleet, mlflow_client)):
+        rendered += len(documents)
+        actions.extend(
+            await run_in_threadpool(
+                manifest_index.plan_documents,
+                fleet.project_id,
+                fleet.branch,
+                {f"{directory}/{name}.yaml": document for name, document in documents},
+            )
+        )
+    if renderer.collisions:
+        raise HTTPException(status_code=409, detail=renderer.collisions)
+    return actions, rendered
+
+
+def fleet_commit(
+    commit: Optional[dict], actions: List[dict], rendered: int, renderer: FleetRenderer
+) -> dict:
+    created = sum(action["action"] == "create" for action in actions)
+    return {
+        "commit_id": commit["id"] if commit else None,
+        "created": created,
+        "updated": len(actions) - created,
+        "unchanged": rendered - len(actions),
+        "failed": renderer.failed,
+    }
+
+
+@router.post("/commit", status_code=200, response_model=FleetCommit)
+async def commit_fleet_manifests(
+    fleet: FleetCommitRequest,
+    mlflow_client: AsyncMLflowClient = Depends(deps.get_mlflow_client),
+    render_pool: Executor = Depends(deps.get_render_pool),
+    manifest_index: ManifestIndex = Depends(deps.get_manifest_index),
+    commit_queue: CommitQueue = Depends(deps.get_commit_queue),
+) -> dict:
+    """
+    Endpoint to commit the changed InferenceService manifests of a fleet in a single GitLab commit.
+    """
+    renderer = FleetRenderer(render_pool, fleet.instance_type, fleet.service_account)
+    actions, rendered = await plan_fleet(fleet, renderer, mlflow_client, manifest_index)
+    commit = await run_in_threadpool(
+        commit_queue.commit,
+        fleet.project_id,
+        fleet.branch,
+        fleet.commit_message,
+        actions,
+    )
+    return fleet_commit(commit, actions, rendered, renderer)
+
+
+@router.post("/deploy", status_code=200, response_model=FleetCommit)
+async def deploy_fleet_manifests(
+    fleet: FleetCommitRequest,
+    mlflow_client: AsyncMLflowClient = Depends(deps.get_mlflow_client),
+    render_pool: Executor = Depends(deps.get_render_pool),
+    manifest_index: ManifestIndex = Depends(deps.get_manifest_index),
+    commit_queue: CommitQueue = Depends(deps.get_commit_queue),
+) -> dict:
+    """
+    Endpoint to deploy the changed InferenceService manifests of a few model versions.
+
+    Deployments to the same branch within GITOPS_COMMIT_DEBOUNCE are merged
+    into one GitLab commit, which the response reports.
+    """
+    renderer = FleetRenderer(render_pool, fleet.instance_type, fleet.service_account)
+    actions, rendered = await plan_fleet(fleet, renderer, mlflow_client, manifest_index)
+    commit = (
+        await asyncio.wrap_future(
+            commit_queue.submit(
+                fleet.project_id, fleet.branch, fleet.commit_message, actions
+            )
+        )
+        if actions
+        else None
+    )
+    return fleet_commit(commit, actions, rendered, renderer)
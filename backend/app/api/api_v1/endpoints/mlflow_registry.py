@@ -1,62 +1,341 @@
-from typing import List, Optional
+from typing import AsyncIterator, Callable, List, Optional
 
-from fastapi import APIRouter, Depends, Path, Query
+import orjson
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Path,
+    Query,
+    Request,
+    Response,
+)
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 
 from app.api import deps
-from app.clients.mlflow import MLflowClient
-from app.schemas.model_catalog import MLflowModelVersion, MLflowRegisteredModels
+from app.api.responses import (
+    CatalogResponse,
+    catalog_response,
+    mlflow_model_version_row,
+    mlflow_model_version_rows,
+)
+from app.catalog.events import (
+    BrokerClosed,
+    CatalogEventBroker,
+    SubscriberLimitReached,
+)
+from app.catalog.index import (
+    CatalogIndex,
+    decode_cursor,
+    encode_cursor,
+    parse_tag_filter,
+)
+from app.catalog.mirror import CatalogMirror, InvalidPageToken, is_mirror_token
+from app.clients.mlflow import AsyncMLflowClient
+from app.core.config import settings
+from app.schemas.model_catalog import (
+    MLflowModelVersion,
+    MLflowModelVersionBatch,
+    MLflowModelVersionBatchRequest,
+    MLflowRegisteredModels,
+)
 
 router = APIRouter()
 
 
+async def read_mirror(
+    mirror: Optional[CatalogMirror],
+    operation: str,
+    refresh: bool,
+    read: Callable[[], Optional[dict]],
+    page_token: Optional[str] = None,
+) -> Optional[dict]:
+    """
+    Answer a catalog read from the mirror if it is enabled, fresh and able to.
+
+    Args:
+        mirror (Optional[CatalogMirror]): The catalog mirror, if enabled.
+        operation (str): The catalog read, used as a metric label.
+        refresh (bool): Whether the caller asked to bypass cached data.
+        read (Callable[[], Optional[dict]]): Runs the read against the mirror.
+        page_token (Optional[str]): The page token of the request.
+
+    Returns:
+        Optional[dict]: The result, or None if MLflow has to answer the read.
+
+    Raises:
+        HTTPException: 400 for an invalid mirror page token.
+    """
+    if mirror is None or (refresh and not is_mirror_token(page_token)):
+        return None
+    if not mirror.serves(operation, page_token):
+        return None
+    try:
+        return await run_in_threadpool(read)
+    except InvalidPageToken as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.get(
     "/models/registered", status_code=200, response_model=MLflowRegisteredModels
 )
-def get_registered_models(
-    mlflow_client: MLflowClient = Depends(deps.get_mlflow_client),
+async def get_registered_models(
+    request: Request,
+    mlflow_client: AsyncMLflowClient = Depends(deps.get_mlflow_client),
+    mirror: Optional[CatalogMirror] = Depends(deps.get_catalog_mirror),
+    refresh: bool = Depends(deps.get_cache_refresh),
     max_results: int = Query(10, description="Maximum number of results to retrieve."),
     filter: Optional[str] = Query(None, description="Filter condition for the search."),
     order_by: Optional[List[str]] = Query(
         None, description="Columns to order the search results by."
     ),
     page_token: Optional[str] = Query(None, description="Token for pagination."),
-) -> dict:
+) -> Response:
     """
     Endpoint to search for registered MLflow models.
     """
-    return mlflow_client.get_registered_models(
-        max_results=max_results, order_by=order_by, filter=filter, page_token=page_token
+    result = await read_mirror(
+        mirror,
+        "registered_models",
+        refresh,
+        lambda: mirror.search_registered_models(
+            max_results=max_results,
+            order_by=order_by,
+            filter=filter,
+            page_token=page_token,
+        ),
+        page_token,
+    ) or await mlflow_client.get_registered_models(
+        max_results=max_results,
+        order_by=order_by,
+        filter=filter,
+        page_token=page_token,
+        refresh=refresh,
+    )
+    return catalog_response(
+        request,
+        {
+            "models": mlflow_model_version_rows(result["models"]),
+            "page_token": result["page_token"],
+        },
     )
 
 
 @router.get(
     "/models/{name}/latest-version", status_code=200, response_model=MLflowModelVersion
 )
-def get_latest_model_version(
+async def get_latest_model_version(
+    request: Request,
     name: str = Path(..., description="MLflow Model name."),
-    mlflow_client: MLflowClient = Depends(deps.get_mlflow_client),
-) -> dict:
+    stage: Optional[str] = Query(
+        None, description="Only consider versions in this stage."
+    ),
+    alias: Optional[str] = Query(
+        None, description="Return the version this alias points to."
+    ),
+    mlflow_client: AsyncMLflowClient = Depends(deps.get_mlflow_client),
+    mirror: Optional[CatalogMirror] = Depends(deps.get_catalog_mirror),
+    refresh: bool = Depends(deps.get_cache_refresh),
+) -> Response:
     """
     Endpoint to retrieve the latest version of a specified model from MLflow.
     """
-    return mlflow_client.get_latest_model_version(name=name)
+    if stage and alias:
+        raise HTTPException(
+            status_code=400, detail="Specify either a stage or an alias, not both."
+        )
+    # Aliases are not mirrored.
+    model = (
+        None
+        if alias
+        else await read_mirror(
+            mirror,
+            "latest_version",
+            refresh,
+            lambda: mirror.get_latest_model_version(name=name, stage=stage),
+        )
+    ) or await mlflow_client.get_latest_model_version(
+        name=name, stage=stage, alias=alias, refresh=refresh
+    )
+    if not model:
+        raise HTTPException(status_code=404, detail="Model has no matching version.")
+    return catalog_response(request, mlflow_model_version_row(model))
 
 
 @router.get("/models/versions", response_model=MLflowRegisteredModels, status_code=200)
-def get_model_versions(
-    mlflow_client: MLflowClient = Depends(deps.get_mlflow_client),
+async def get_model_versions(
+    request: Request,
+    mlflow_client: AsyncMLflowClient = Depends(deps.get_mlflow_client),
+    mirror: Optional[CatalogMirror] = Depends(deps.get_catalog_mirror),
+    refresh: bool = Depends(deps.get_cache_refresh),
     max_results: int = Query(10, description="Maximum number of results to retrieve."),
     filter: Optional[str] = Query(None, description="Filter condition for the search."),
     order_by: Optional[List[str]] = Query(
         None, description="Columns to order the search results by."
     ),
     page_token: Optional[str] = Query(None, description="Token for pagination."),
-) -> dict:
+) -> Response:
     """
     Endpoint to search model versions in MLflow based on filter conditions.
     """
-    return mlflow_client.get_model_versions(
-        max_results=max_results, order_by=order_by, filter=filter, page_token=page_token
+    result = await read_mirror(
+        mirror,
+        "model_versions",
+        refresh,
+        lambda: mirror.search_model_versions(
+            filter=filter,
+            max_results=max_results,
+            order_by=order_by,
+            page_token=page_token,
+        ),
+        page_token,
+    ) or await mlflow_client.get_model_versions(
+        max_results=max_results,
+        order_by=order_by,
+        filter=filter,
+        page_token=page_token,
+        refresh=refresh,
+    )
+    return catalog_response(
+        request,
+        {
+            "models": mlflow_model_version_rows(result["models"]),
+            "page_token": result["page_token"],
+        },
+    )
+
+
+@router.get("/models/search", response_model=MLflowRegisteredModels, status_code=200)
+async def search_catalog(
+    request: Request,
+    catalog_index: CatalogIndex = Depends(deps.get_catalog_index),
+    tag: Optional[List[str]] = Query(
+        None,
+        description="Tag as `key=value`, or `key` for any value; repeat to require several.",
+    ),
+    prefix: Optional[str] = Query(None, description="Model name prefix."),
+    max_results: int = Query(
+        100,
+        ge=1,
+        le=settings.CATALOG_INDEX_MAX_RESULTS,
+        description="Maximum number of results to retrieve.",
+    ),
+    page_token: Optional[str] = Query(None, description="Token for pagination."),
+) -> Response:
+    """
+    Endpoint to search model versions by tags and model name prefix in the in-memory catalog index.
+    """
+    snapshot = catalog_index.snapshot
+    if snapshot is None:
+        raise HTTPException(status_code=503, detail="The catalog index is loading.")
+    try:
+        after = decode_cursor(page_token) if page_token else None
+    except InvalidPageToken as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    models, last = snapshot.search(
+        tags=[parse_tag_filter(t) for t in tag or ()],
+        prefix=prefix,
+        max_results=max_results,
+        after=after,
+    )
+    return catalog_response(
+        request,
+        {
+            "models": mlflow_model_version_rows(models),
+            "page_token": encode_cursor(last) if last else None,
+        },
+    )
+
+
+@router.post(
+    "/models/versions/batch",
+    response_model=MLflowModelVersionBatch,
+    status_code=200,
+)
+async def get_model_version_batch(
+    batch: MLflowModelVersionBatchRequest,
+    mlflow_client: AsyncMLflowClient = Depends(deps.get_mlflow_client),
+) -> CatalogResponse:
+    """
+    Endpoint to retrieve many model versions from MLflow in one request.
+    """
+    results = await mlflow_client.get_model_version_batch(
+        (ref.name, ref.version) for ref in batch.versions
+    )
+    return CatalogResponse(
+        {
+            "results": [
+                {
+                    "name": result["name"],
+                    "version": result["version"],
+                    "model": mlflow_model_version_row(result["model"])
+                    if "model" in result
+                    else None,
+                    "error": result.get("error"),
+                    "status_code": result.get("status_code"),
+                }
+                for result in results
+            ]
+        }
+    )
+
+
+@router.get(
+    "/models/export",
+    status_code=200,
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+async def export_model_versions(
+    mlflow_client: AsyncMLflowClient = Depends(deps.get_mlflow_client),
+    filter: Optional[str] = Query(None, description="Filter condition for the search."),
+    order_by: Optional[List[str]] = Query(
+        None, description="Columns to order the search results by."
+    ),
+) -> StreamingResponse:
+    """
+    Endpoint to stream every matching MLflow model version as newline-delimited JSON.
+    """
+
+    async def ndjson() -> AsyncIterator[bytes]:
+        async for page in mlflow_client.iter_model_version_pages(
+            filter=filter, order_by=order_by
+        ):
+            yield b"".join(
+                orjson.dumps(row) + b"\n" for row in mlflow_model_version_rows(page)
+            )
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
+@router.get(
+    "/events",
+    status_code=200,
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}}},
+)
+async def stream_catalog_events(
+    broker: CatalogEventBroker = Depends(deps.get_catalog_events),
+    last_event_id: Optional[str] = Header(
+        None, description="Id of the last event received, to resume after it."
+    ),
+) -> StreamingResponse:
+    """
+    Endpoint streaming model and model version changes as server-sent events.
+
+    Replaces polling the catalog: clients reload what an event names. After a
+    `reset` event, which means events were missed, they reload everything.
+    """
+    try:
+        queue = broker.subscribe(last_event_id)
+    except (BrokerClosed, SubscriberLimitReached) as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return StreamingResponse(
+        broker.stream(queue),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
@@ -65,12 +344,28 @@ def get_model_versions(
     response_model=MLflowModelVersion,
     status_code=200,
 )
-def get_model_version(
+async def get_model_version(
+    request: Request,
     name: str = Path(..., description="MLflow Model name."),
     version: int = Path(..., description="MLflow Model version."),
-    mlflow_client: MLflowClient = Depends(deps.get_mlflow_client),
-) -> dict:
+    mlflow_client: AsyncMLflowClient = Depends(deps.get_mlflow_client),
+    mirror: Optional[CatalogMirror] = Depends(deps.get_catalog_mirror),
+    refresh: bool = Depends(deps.get_cache_refresh),
+) -> Response:
     """
     Endpoint to retrieve the model version of a specified model from MLflow.
     """
-    return mlflow_client.get_model_version(name=name, version=version)
+    model = await read_mirror(
+        mirror,
+        "model_version",
+        refresh,
+        lambda: mirror.get_model_version(name=name, version=version),
+    ) or await mlflow_client.get_model_version(
+        name=name, version=version, refresh=refresh
+    )
+    # A registered model version is effectively immutable, so clients may reuse it.
+    return catalog_response(
+        request,
+        mlflow_model_version_row(model),
+        cache_control=f"public, max-age={int(settings.MLFLOW_CACHE_TTL_MODEL_VERSION)}",
+    )
@@ -0,0 +1,85 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import PlainTextResponse
+
+from app.api import deps
+from app.catalog.sync import CatalogMirrorSync
+from app.clients.gitlab import GitLabClient
+from app.clients.mlflow import AsyncMLflowClient
+from app.core.profiling import profile_store
+from app.gitops.commit_queue import CommitQueue
+from app.gitops.manifest_index import ManifestIndex
+
+router = APIRouter()
+
+
+@router.get("/stats", status_code=200)
+async def get_stats(
+    request: Request,
+    mlflow_client: AsyncMLflowClient = Depends(deps.get_mlflow_client),
+    gitlab_client: GitLabClient = Depends(deps.get_gitlab_client),
+    commit_queue: CommitQueue = Depends(deps.get_commit_queue),
+    manifest_index: ManifestIndex = Depends(deps.get_manifest_index),
+    catalog_sync: Optional[CatalogMirrorSync] = Depends(deps.get_catalog_sync),
+) -> dict:
+    """
+    Endpoint to retrieve runtime counters of the upstream clients.
+    """
+    state = request.app.state
+    catalog_index = state.catalog_index
+    return {
+        "mlflow": {
+            **mlflow_client.stats(),
+            "cache_snapshot": (
+                state.cache_snapshot.stats() if state.cache_snapshot else None
+            ),
+            "prewarmer": state.prewarmer.stats() if state.prewarmer else None,
+            "invalidation": state.catalog_invalidator.stats(),
+            "events": state.catalog_events.stats(),
+            "change_poller": (
+                state.change_poller.stats() if state.change_poller else None
+            ),
+            "event_fanout": (
+                state.event_fanout.stats() if state.event_fanout else None
+            ),
+        },
+        "gitlab": {
+            **gitlab_client.stats(),
+            "commit_queue": commit_queue.stats(),
+            "manifest_index": manifest_index.stats(),
+        },
+        "catalog_mirror": catalog_sync.stats() if catalog_sync else None,
+        "catalog_index": catalog_index.stats() if catalog_index else None,
+        "metrics_publisher": (
+            state.metrics_publisher.stats() if state.metrics_publisher else None
+        ),
+    }
+
+
+@router.get(
+    "/profiles",
+    status_code=200,
+    dependencies=[Depends(deps.require_profiling_access)],
+)
+async def list_profiles() -> List[dict]:
+    """
+    Endpoint to list the most recent slow request profiles, newest first.
+    """
+    return profile_store.list()
+
+
+@router.get(
+    "/profiles/{profile_id}",
+    status_code=200,
+    response_class=PlainTextResponse,
+    dependencies=[Depends(deps.require_profiling_access)],
+)
+async def get_profile(profile_id: int) -> str:
+    """
+    Endpoint to retrieve the call statistics of a slow request profile.
+    """
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found.")
+    return profile["profile"]
@@ -0,0 +1,56 @@
+import orjson
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Request
+
+from app.api import deps
+from app.catalog.invalidation import (
+    CatalogInvalidator,
+    parse_registry_event,
+    verify_signature,
+)
+from app.core.config import settings
+
+router = APIRouter()
+
+
+@router.post("/mlflow", status_code=202)
+async def receive_mlflow_webhook(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    invalidator: CatalogInvalidator = Depends(deps.get_catalog_invalidator),
+    delivery_id: str = Header("", alias="X-MLflow-Delivery-Id"),
+    timestamp: str = Header("", alias="X-MLflow-Timestamp"),
+    signature: str = Header("", alias="X-MLflow-Signature"),
+) -> dict:
+    """
+    Endpoint receiving MLflow model registry webhooks.
+
+    Evicts the cached responses the change affects and refetches the latest
+    version of the changed model after responding.
+    """
+    if not settings.MLFLOW_WEBHOOK_SECRET:
+        raise HTTPException(status_code=404, detail="Webhooks are disabled.")
+    body = await request.body()
+    if not verify_signature(
+        settings.MLFLOW_WEBHOOK_SECRET,
+        body,
+        delivery_id,
+        timestamp,
+        signature,
+        settings.MLFLOW_WEBHOOK_MAX_AGE,
+    ):
+        raise HTTPException(status_code=403, detail="Invalid webhook signature.")
+    try:
+        event = parse_registry_event(orjson.loads(body))
+    except orjson.JSONDecodeError:
+        event = None
+    if event is None:
+        raise HTTPException(status_code=400, detail="Not a model registry event.")
+
+    invalidated = await invalidator.invalidate(event)
+    background_tasks.add_task(invalidator.refresh, event.name)
+    return {
+        "event": event.event,
+        "name": event.name,
+        "version": event.version,
+        "invalidated": invalidated,
+    }
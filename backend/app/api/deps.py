@@ -1,11 +1,196 @@
-from app.clients.mlflow import MLflowClient
+import hmac
+from concurrent.futures import Executor
+from typing import Optional
 
+from fastapi import Header, HTTPException, Request
 
-def get_mlflow_client() -> MLflowClient:
+from app.catalog.events import CatalogEventBroker
+from app.catalog.index import CatalogIndex
+from app.catalog.invalidation import CatalogInvalidator
+from app.catalog.mirror import CatalogMirror
+from app.catalog.sync import CatalogMirrorSync
+from app.clients.gitlab import GitLabClient
+from app.clients.mlflow import AsyncMLflowClient
+from app.core.config import settings
+from app.gitops.commit_queue import CommitQueue
+from app.gitops.manifest_index import ManifestIndex
+
+
+def get_mlflow_client(request: Request) -> AsyncMLflowClient:
     """
-    Get an MLflow client.
+    Get the shared MLflow client.
+
+    Args:
+        request (Request): The incoming request.
 
     Returns:
-        MLflowClient: An instance of MLflowClient.
+        AsyncMLflowClient: The AsyncMLflowClient owned by the application lifespan.
+    """
+    return request.app.state.mlflow_client
+
+
+def get_gitlab_client(request: Request) -> GitLabClient:
+    """
+    Get the shared GitLab client.
+
+    Args:
+        request (Request): The incoming request.
+
+    Returns:
+        GitLabClient: The GitLabClient owned by the application lifespan.
+    """
+    return request.app.state.gitlab_client
+
+
+def get_commit_queue(request: Request) -> CommitQueue:
+    """
+    Get the shared GitOps commit queue.
+
+    Args:
+        request (Request): The incoming request.
+
+    Returns:
+        CommitQueue: The CommitQueue owned by the application lifespan.
+    """
+    return request.app.state.commit_queue
+
+
+def get_manifest_index(request: Request) -> ManifestIndex:
+    """
+    Get the shared index of committed manifests.
+
+    Args:
+        request (Request): The incoming request.
+
+    Returns:
+        ManifestIndex: The ManifestIndex owned by the application lifespan.
+    """
+    return request.app.state.manifest_index
+
+
+def get_render_pool(request: Request) -> Executor:
+    """
+    Get the shared process pool that renders manifests.
+
+    Args:
+        request (Request): The incoming request.
+
+    Returns:
+        Executor: The process pool owned by the application lifespan.
+    """
+    return request.app.state.render_pool
+
+
+def get_catalog_mirror(request: Request) -> Optional[CatalogMirror]:
+    """
+    Get the shared catalog mirror.
+
+    Args:
+        request (Request): The incoming request.
+
+    Returns:
+        Optional[CatalogMirror]: The mirror, or None if CATALOG_MIRROR_ENABLED is off.
+    """
+    return request.app.state.catalog_mirror
+
+
+def get_catalog_sync(request: Request) -> Optional[CatalogMirrorSync]:
+    """
+    Get the worker syncing the catalog mirror.
+
+    Args:
+        request (Request): The incoming request.
+
+    Returns:
+        Optional[CatalogMirrorSync]: The sync worker, or None if CATALOG_MIRROR_ENABLED is off.
+    """
+    return request.app.state.catalog_sync
+
+
+def get_catalog_index(request: Request) -> CatalogIndex:
+    """
+    Get the shared in-memory catalog index.
+
+    Args:
+        request (Request): The incoming request.
+
+    Returns:
+        CatalogIndex: The CatalogIndex owned by the application lifespan.
+
+    Raises:
+        HTTPException: 404 if CATALOG_INDEX_ENABLED is off.
+    """
+    catalog_index = request.app.state.catalog_index
+    if catalog_index is None:
+        raise HTTPException(status_code=404, detail="The catalog index is disabled.")
+    return catalog_index
+
+
+def get_catalog_events(request: Request) -> CatalogEventBroker:
+    """
+    Get the shared broker of catalog change events.
+
+    Args:
+        request (Request): The incoming request.
+
+    Returns:
+        CatalogEventBroker: The CatalogEventBroker owned by the application lifespan.
+    """
+    return request.app.state.catalog_events
+
+
+def get_catalog_invalidator(request: Request) -> CatalogInvalidator:
+    """
+    Get the shared invalidator of cached MLflow responses.
+
+    Args:
+        request (Request): The incoming request.
+
+    Returns:
+        CatalogInvalidator: The CatalogInvalidator owned by the application lifespan.
+    """
+    return request.app.state.catalog_invalidator
+
+
+def get_cache_refresh(
+    cache_control: Optional[str] = Header(
+        None, description="Send `no-cache` to bypass cached MLflow responses."
+    ),
+) -> bool:
+    """
+    Check whether the caller asked to bypass cached upstream responses.
+
+    Args:
+        cache_control (Optional[str]): The Cache-Control request header.
+
+    Returns:
+        bool: True if the request carries `Cache-Control: no-cache`.
+    """
+    return cache_control is not None and "no-cache" in cache_control.lower()
+
+
+def require_profiling_access(
+    profiling_token: Optional[str] = Header(
+        None, alias="X-Profiling-Token", description="The PROFILING_TOKEN setting."
+    ),
+) -> None:
+    """
+    Guard the profiling endpoints.
+
+    With PROFILING_TOKEN set, callers must send it; without it, the endpoints
+    only exist while PROFILING_ENABLED is on.
+
+    Args:
+        profiling_token (Optional[str]): The X-Profiling-Token request header.
+
+    Raises:
+        HTTPException: 403 for a missing or wrong token, 404 if profiling is off.
     """
-    return MLflowClient()
+    if settings.PROFILING_TOKEN:
+        # Header values arrive decoded as latin-1; compare the raw bytes.
+        if profiling_token is None or not hmac.compare_digest(
+            profiling_token.encode("latin-1"), settings.PROFILING_TOKEN.encode()
+        ):
+            raise HTTPException(status_code=403, detail="Invalid profiling token.")
+    elif not settings.PROFILING_ENABLED:
+        raise HTTPException(status_code=404, detail="Profiling is disabled.")
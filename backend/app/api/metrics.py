@@ -0,0 +1,215 @@
+import asyncio
+import os
+from typing import List, Optional
+
+from anyio import to_thread
+from fastapi import APIRouter, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
+from starlette.datastructures import State
+
+from app.core.config import settings
+from app.core.metrics import (
+    Counter,
+    Gauge,
+    Metric,
+    collect_process_metrics,
+    registry,
+    render,
+    write_process_metrics,
+)
+from app.kubernetes.rendering import renderer
+
+router = APIRouter()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def collect_runtime_metrics(state: State) -> List[Metric]:
+    """
+    Read the counters and gauges of the application's shared objects.
+
+    Args:
+        state (State): The application state.
+
+    Returns:
+        List[Metric]: Metric families describing the current state.
+    """
+    clients = {"mlflow": state.mlflow_client, "gitlab": state.gitlab_client}
+
+    pool_connections = Gauge(
+        "formenos_http_pool_connections",
+        "Connections held by the upstream connection pools.",
+        ("upstream", "state"),
+    )
+    retries = Counter(
+        "formenos_upstream_retries_total",
+        "Upstream calls retried after a transient failure.",
+        ("upstream",),
+    )
+    breaker_open = Gauge(
+        "formenos_circuit_breaker_open",
+        "Whether the upstream circuit breaker rejects calls (1) or not (0).",
+        ("upstream",),
+        multiprocess="max",
+    )
+    for upstream, client in clients.items():
+        pool = client.pool_stats()
+        pool_connections.set(pool["open"] - pool["idle"], upstream, "active")
+        pool_connections.set(pool["idle"], upstream, "idle")
+        stats = client.stats()
+        retries.inc(upstream, amount=stats["retries"])
+        breaker_open.set(stats["circuit_breaker"]["state"] != "closed", upstream)
+
+    cache_requests = Counter(
+        "formenos_cache_requests_total",
+        "Cache lookups by result.",
+        ("cache", "result"),
+    )
+    cache_entries = Gauge(
+        "formenos_cache_entries", "Entries held by the caches.", ("cache",)
+    )
+    mlflow_cache = state.mlflow_client.stats()["cache"]
+    render_cache = renderer.stats()
+    for cache, stats in (("mlflow", mlflow_cache), ("yaml_render", render_cache)):
+        cache_requests.inc(cache, "hit", amount=stats["hits"])
+        cache_requests.inc(cache, "miss", amount=stats["misses"])
+        # Every worker sees all the entries of a shared cache; one reports them.
+        if (
+            cache != "mlflow"
+            or not settings.MLFLOW_CACHE_PATH
+            or settings.SERVER_PRIMARY
+        ):
+            cache_entries.set(stats["entries"], cache)
+
+    limiter = to_thread.current_default_thread_limiter()
+    threadpool = Gauge(
+        "formenos_threadpool_threads",
+        "Worker threads of the default threadpool, in use and allowed.",
+        ("state",),
+    )
+    threadpool.set(limiter.borrowed_tokens, "in_use")
+    threadpool.set(limiter.total_tokens, "max")
+
+    event_subscribers = Gauge(
+        "formenos_catalog_event_subscribers",
+        "Open server-sent catalog event streams.",
+    )
+    event_subscribers.set(len(state.catalog_events.subscribers))
+
+    families: List[Metric] = [
+        pool_connections,
+        retries,
+        breaker_open,
+        cache_requests,
+        cache_entries,
+        threadpool,
+        event_subscribers,
+    ]
+    if state.catalog_mirror is not None:
+        lag = Gauge(
+            "formenos_catalog_mirror_lag_seconds",
+            "Seconds since the last successful sync of the catalog mirror started.",
+            multiprocess="max",
+        )
+        lag.set(state.catalog_mirror.lag())
+        families.append(lag)
+    if state.catalog_index is not None:
+        index_age = Gauge(
+            "formenos_catalog_index_age_seconds",
+            "Seconds since the listing behind the catalog index started.",
+            multiprocess="max",
+        )
+        index_age.set(state.catalog_index.age())
+        cache_entries.set(len(state.catalog_index.snapshot or ()), "catalog_index")
+        families.append(index_age)
+    return families
+
+
+def metrics_directory() -> Optional[str]:
+    """
+    Get the directory where the server workers share their metrics.
+
+    Returns:
+        Optional[str]: The directory, or None when this process serves alone.
+    """
+    if settings.SERVER_SHARED_DIR is None:
+        return None
+    return os.path.join(settings.SERVER_SHARED_DIR, "metrics")
+
+
+async def write_worker_metrics(state: State) -> None:
+    """
+    Write this worker's metric families for the other workers' scrapes.
+
+    Args:
+        state (State): The application state.
+    """
+    directory = metrics_directory()
+    if directory is not None:
+        families = [*registry.collect(), *collect_runtime_metrics(state)]
+        await run_in_threadpool(write_process_metrics, directory, os.getpid(), families)
+
+
+class WorkerMetricsPublisher:
+    """
+    Keeps this worker's metrics in the shared directory current between scrapes.
+    """
+
+    def __init__(self, state: State, interval: Optional[float] = None) -> None:
+        """
+        Initialize WorkerMetricsPublisher.
+
+        Args:
+            state (State): The application state.
+            interval (Optional[float]): Seconds between writes (defaults to METRICS_WRITE_INTERVAL).
+        """
+        self.state = state
+        self.interval = interval or settings.METRICS_WRITE_INTERVAL
+        self.writes = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+
+    async def run(self) -> None:
+        """
+        Write every interval until cancelled; a failed write is retried on the next one.
+        """
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await write_worker_metrics(self.state)
+                self.writes += 1
+                self.last_error = None
+            except Exception as e:
+                self.failures += 1
+                self.last_error = str(e)
+
+    def stats(self) -> dict:
+        """
+        Get publisher counters.
+
+        Returns:
+            dict: Writes, failed writes and the last error.
+        """
+        return {
+            "writes": self.writes,
+            "failures": self.failures,
+            "last_error": self.last_error,
+        }
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics(request: Request) -> PlainTextResponse:
+    """
+    Endpoint exposing the API's metrics in the Prometheus text format.
+
+    Under app.server, whichever worker answers merges the metrics of all of
+    them, including the counters of the workers that exited.
+    """
+    directory = metrics_directory()
+    if directory is None:
+        families = [*registry.collect(), *collect_runtime_metrics(request.app.state)]
+    else:
+        await write_worker_metrics(request.app.state)
+        families = await run_in_threadpool(collect_process_metrics, directory)
+    return PlainTextResponse(render(families), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,152 @@
+import cProfile
+import hmac
+import threading
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import HTTP_REQUEST_DURATION
+from app.core.profiling import (
+    ProfileStore,
+    current_timings,
+    profile_store,
+    server_timing,
+    start_timings,
+    stop_timings,
+)
+
+PROFILING_TOKEN_HEADER = "X-Profiling-Token"
+
+# Label for requests that matched no route, so unknown paths cannot add series.
+UNMATCHED_ROUTE = "unmatched"
+# Methods labelled as sent; any other method, which clients can make up, is "other".
+HTTP_METHODS = frozenset(
+    {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "TRACE", "CONNECT"}
+)
+
+
+def method_label(method: str) -> str:
+    return method if method in HTTP_METHODS else "other"
+
+
+class MetricsMiddleware:
+    """
+    Records the duration of every HTTP request by method, route template and status.
+
+    Routes are labelled with their template (e.g. `/models/{name}/latest-version`),
+    never with the requested path, to keep the number of series bounded.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # FastAPI stores the matched route in the scope while routing.
+            route = getattr(scope.get("route"), "path_format", UNMATCHED_ROUTE)
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - started,
+                method_label(scope["method"]),
+                route,
+                str(status_code),
+            )
+
+
+def profiling_requested(scope: Scope) -> bool:
+    """
+    Check whether a request should be profiled.
+
+    Args:
+        scope (Scope): The ASGI scope of the request.
+
+    Returns:
+        bool: True if profiling is enabled, or the request carries the profiling token.
+    """
+    if settings.PROFILING_ENABLED:
+        return True
+    if not settings.PROFILING_TOKEN:
+        return False
+    header = PROFILING_TOKEN_HEADER.lower().encode()
+    for key, value in scope["headers"]:
+        if key == header:
+            return hmac.compare_digest(value, settings.PROFILING_TOKEN.encode())
+    return False
+
+
+class ProfilingMiddleware:
+    """
+    Profiles requests on demand and reports where their time went.
+
+    A profiled request gets a Server-Timing header with its upstream, parse
+    and serialize phases. There is no validate phase: catalog responses are
+    built in schema shape and are not validated. It is also run under
+    cProfile; requests slower than PROFILING_THRESHOLD keep their profile in
+    a ring buffer. cProfile can only trace one request per thread at a time,
+    so concurrent requests are timed but not profiled while another one is,
+    and a profile also covers other coroutines interleaved on the event loop.
+    """
+
+    def __init__(self, app: ASGIApp, store: ProfileStore = profile_store) -> None:
+        self.app = app
+        self.store = store
+        self._profiler_lock = threading.Lock()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not profiling_requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        token = start_timings()
+        timings = current_timings()
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                header = server_timing(timings, time.perf_counter() - started)
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"server-timing", header.encode()),
+                ]
+            await send(message)
+
+        profiler = None
+        if self._profiler_lock.acquire(blocking=False):
+            profiler = cProfile.Profile()
+        try:
+            if profiler is not None:
+                profiler.enable()
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            duration = time.perf_counter() - started
+            if profiler is not None:
+                profiler.disable()
+                self._profiler_lock.release()
+                if duration >= settings.PROFILING_THRESHOLD:
+                    self.store.add(
+                        profiler,
+                        method_label(scope["method"]),
+                        scope["path"],
+                        status_code,
+                        duration,
+                        timings,
+                    )
+            stop_timings(token)
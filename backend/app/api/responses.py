@@ -0,0 +1,107 @@
+import hashlib
+import time
+from typing import Any, Dict, List, Optional
+
+from fastapi import Request, Response
+from fastapi.responses import ORJSONResponse
+
+from app.core.metrics import RESPONSE_SERIALIZATION_DURATION
+from app.core.profiling import record_phase
+from app.schemas.model_catalog import MLflowModelVersion
+
+MLFLOW_MODEL_TYPE = MLflowModelVersion.model_fields["type"].default
+
+
+def mlflow_model_version_row(model: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Shape a parsed model version as an MLflowModelVersion payload without validating it.
+
+    The MLflow clients already produce every other schema field, so only the
+    defaulted `type` is added.
+
+    Args:
+        model (Dict[str, Any]): A model version parsed by the MLflow client.
+
+    Returns:
+        Dict[str, Any]: The MLflowModelVersion payload.
+    """
+    return {**model, "type": MLFLOW_MODEL_TYPE}
+
+
+def mlflow_model_version_rows(models: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Shape a page of parsed model versions as MLflowModelVersion payloads.
+
+    Args:
+        models (List[Dict[str, Any]]): Model versions parsed by the MLflow client.
+
+    Returns:
+        List[Dict[str, Any]]: The MLflowModelVersion payloads.
+    """
+    return [{**model, "type": MLFLOW_MODEL_TYPE} for model in models]
+
+
+class CatalogResponse(ORJSONResponse):
+    """
+    JSON response for catalog payloads that are already in schema shape.
+
+    Returning it from an endpoint skips FastAPI's response model validation
+    and jsonable_encoder pass; the body is encoded once by orjson.
+    """
+
+    def render(self, content: Any) -> bytes:
+        started = time.perf_counter()
+        body = super().render(content)
+        elapsed = time.perf_counter() - started
+        RESPONSE_SERIALIZATION_DURATION.observe(elapsed, "catalog")
+        record_phase("serialize", elapsed)
+        return body
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an entity tag using weak comparison.
+
+    Args:
+        if_none_match (Optional[str]): The If-None-Match request header.
+        etag (str): The current entity tag of the resource.
+
+    Returns:
+        bool: True if the client already holds the current representation.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def catalog_response(
+    request: Request, content: Any, cache_control: str = "no-cache"
+) -> Response:
+    """
+    Build a catalog response with an ETag derived from its encoded body.
+
+    Requests whose If-None-Match holds the same ETag get an empty 304 Not
+    Modified instead of the body. Each page of a paginated listing has its own
+    URL and therefore its own ETag.
+
+    Args:
+        request (Request): The incoming request.
+        content (Any): Schema-shaped response payload.
+        cache_control (str): Cache-Control header value.
+
+    Returns:
+        Response: A CatalogResponse, or a 304 response if the client copy is current.
+    """
+    response = CatalogResponse(content)
+    etag = f'"{hashlib.blake2b(response.body, digest_size=16).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return response
@@ -0,0 +1,419 @@
+import asyncio
+import os
+import secrets
+import sqlite3
+from collections import deque
+from typing import AsyncIterator, Deque, List, Optional, Set, Tuple
+
+import orjson
+from fastapi.concurrency import run_in_threadpool
+
+from app.catalog.invalidation import CatalogInvalidator, RegistryEvent
+from app.core.config import settings
+
+
+class SubscriberLimitReached(RuntimeError):
+    """
+    Raised when the broker already serves CATALOG_EVENTS_MAX_SUBSCRIBERS streams.
+    """
+
+
+class BrokerClosed(RuntimeError):
+    """
+    Raised when subscribing to a broker closed for shutdown.
+    """
+
+
+def format_event(event: dict) -> bytes:
+    """
+    Encode an event for a text/event-stream response.
+
+    Args:
+        event (dict): The event id, type and data.
+
+    Returns:
+        bytes: The server-sent event.
+    """
+    return (
+        f"id: {event['id']}\nevent: {event['event']}\ndata: ".encode()
+        + orjson.dumps(event["data"])
+        + b"\n\n"
+    )
+
+
+class CatalogEventBroker:
+    """
+    Fans catalog change events out to server-sent event subscribers.
+
+    Changes are detected once upstream, by webhooks or the change poller
+    through the CatalogInvalidator, and copied into a bounded queue per
+    subscriber, so MLflow load does not grow with the number of clients.
+    A subscriber whose queue overflows is disconnected; the recent history
+    lets it resume from its Last-Event-ID when it reconnects. Event ids carry
+    an epoch made of the process id and random bytes, so an id from another
+    worker or from before a restart gets a `reset` event, telling the client
+    to reload the catalog.
+    """
+
+    def __init__(
+        self,
+        buffer_size: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        max_subscribers: Optional[int] = None,
+    ) -> None:
+        """
+        Initialize CatalogEventBroker.
+
+        Args:
+            buffer_size (Optional[int]): Events kept for resuming (defaults to CATALOG_EVENTS_BUFFER_SIZE).
+            queue_size (Optional[int]): Events queued per subscriber (defaults to CATALOG_EVENTS_QUEUE_SIZE).
+            max_subscribers (Optional[int]): Concurrent subscribers (defaults to CATALOG_EVENTS_MAX_SUBSCRIBERS).
+        """
+        self.queue_size = queue_size or settings.CATALOG_EVENTS_QUEUE_SIZE
+        self.max_subscribers = (
+            settings.CATALOG_EVENTS_MAX_SUBSCRIBERS
+            if max_subscribers is None
+            else max_subscribers
+        )
+        # Workers forked in the same millisecond share a start time, not this.
+        self.epoch = f"{os.getpid():x}{secrets.token_hex(4)}"
+        self.sequence = 0
+        self.history: Deque[dict] = deque(
+            maxlen=buffer_size or settings.CATALOG_EVENTS_BUFFER_SIZE
+        )
+        # A None in a queue ends that subscriber's stream.
+        self.subscribers: Set[asyncio.Queue] = set()
+        self.published = 0
+        self.evicted = 0
+        self.closed = False
+
+    def _event_id(self, sequence: int) -> str:
+        return f"{self.epoch}-{sequence}"
+
+    def publish(self, change: RegistryEvent) -> dict:
+        """
+        Record a change and queue it for every subscriber.
+
+        Args:
+            change (RegistryEvent): The registry change.
+
+        Returns:
+            dict: The published event.
+        """
+        self.sequence += 1
+        event = {
+            "id": self._event_id(self.sequence),
+            "event": "model_version" if change.version else "registered_model",
+            "data": {
+                "name": change.name,
+                "version": change.version,
+                "change": change.event,
+            },
+        }
+        self.history.append(event)
+        self.published += 1
+        for queue in list(self.subscribers):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self._evict(queue)
+        return event
+
+    def _end(self, queue: asyncio.Queue) -> None:
+        self.subscribers.discard(queue)
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(None)
+
+    def _evict(self, queue: asyncio.Queue) -> None:
+        self._end(queue)
+        self.evicted += 1
+
+    def close(self) -> None:
+        """
+        End every stream and refuse new subscribers, so a stopping server is not held open.
+
+        Clients reconnect to another worker and resume from their Last-Event-ID.
+        """
+        self.closed = True
+        for queue in list(self.subscribers):
+            self._end(queue)
+
+    def _missed(self, last_event_id: str) -> Optional[List[dict]]:
+        """
+        Get the events published after an event.
+
+        Args:
+            last_event_id (str): Id of the last event the client received.
+
+        Returns:
+            Optional[List[dict]]: The missed events, or None if they are no
+            longer buffered or the id is not from this broker.
+        """
+        epoch, _, sequence = last_event_id.partition("-")
+        if epoch != self.epoch or not sequence.isdigit():
+            return None
+        last = int(sequence)
+        oldest = self.sequence - len(self.history) + 1
+        if last > self.sequence or last < oldest - 1:
+            return None
+        return list(self.history)[last - oldest + 1 :]
+
+    def subscribe(self, last_event_id: Optional[str] = None) -> asyncio.Queue:
+        """
+        Register a subscriber, queueing the events it missed.
+
+        Args:
+            last_event_id (Optional[str]): The Last-Event-ID of a reconnecting client.
+
+        Returns:
+            asyncio.Queue: The subscriber's queue.
+
+        Raises:
+            BrokerClosed: If the broker was closed for shutdown.
+            SubscriberLimitReached: If max_subscribers streams are open.
+        """
+        if self.closed:
+            raise BrokerClosed("The server is shutting down.")
+        if len(self.subscribers) >= self.max_subscribers:
+            raise SubscriberLimitReached("Too many catalog event subscribers.")
+        queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        if last_event_id is not None:
+            missed = self._missed(last_event_id)
+            if missed is None or len(missed) >= self.queue_size:
+                missed = [
+                    {
+                        "id": self._event_id(self.sequence),
+                        "event": "reset",
+                        "data": {},
+                    }
+                ]
+            for event in missed:
+                queue.put_nowait(event)
+        self.subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self.subscribers.discard(queue)
+
+    async def stream(
+        self, queue: asyncio.Queue, heartbeat: Optional[float] = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Yield a subscriber's events as server-sent events until it is evicted or the broker closes.
+
+        Args:
+            queue (asyncio.Queue): A queue returned by subscribe.
+            heartbeat (Optional[float]): Seconds of silence before a keep-alive
+                comment (defaults to CATALOG_EVENTS_HEARTBEAT).
+
+        Yields:
+            bytes: Encoded events and keep-alive comments.
+        """
+        heartbeat = heartbeat or settings.CATALOG_EVENTS_HEARTBEAT
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield b": keep-alive\n\n"
+                    continue
+                if event is None:
+                    return
+                yield format_event(event)
+        finally:
+            self.unsubscribe(queue)
+
+    def stats(self) -> dict:
+        """
+        Get broker counters.
+
+        Returns:
+            dict: Subscribers, published and evicted counts and the last event id.
+        """
+        return {
+            "subscribers": len(self.subscribers),
+            "published": self.published,
+            "evicted": self.evicted,
+            "last_event_id": self._event_id(self.sequence),
+        }
+
+
+class CatalogEventFanout:
+    """
+    Passes the registry changes one server worker detects on to the others.
+
+    A webhook reaches a single worker and the change poller runs in the
+    primary one only. Each worker appends the changes it detects to a SQLite
+    log in SERVER_SHARED_DIR and applies the ones the others appended as if
+    it had detected them: it evicts what they affect from its cache and
+    publishes them to its own subscribers. Changes reach the other workers
+    within CATALOG_EVENTS_FANOUT_INTERVAL. The log keeps the last
+    CATALOG_EVENTS_BUFFER_SIZE changes; a worker that falls further behind
+    evicts its whole cache.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS catalog_events (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            origin INTEGER NOT NULL,
+            event TEXT NOT NULL,
+            name TEXT NOT NULL,
+            version TEXT
+        );
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        interval: Optional[float] = None,
+        buffer_size: Optional[int] = None,
+    ) -> None:
+        """
+        Initialize CatalogEventFanout.
+
+        Args:
+            path (Optional[str]): SQLite log shared by the workers (defaults to a file in SERVER_SHARED_DIR).
+            interval (Optional[float]): Seconds between exchanges (defaults to CATALOG_EVENTS_FANOUT_INTERVAL).
+            buffer_size (Optional[int]): Changes kept in the log (defaults to CATALOG_EVENTS_BUFFER_SIZE).
+        """
+        self.path = path or os.path.join(
+            settings.SERVER_SHARED_DIR, "catalog_events.sqlite3"
+        )
+        self.interval = interval or settings.CATALOG_EVENTS_FANOUT_INTERVAL
+        self.buffer_size = buffer_size or settings.CATALOG_EVENTS_BUFFER_SIZE
+        self.origin = os.getpid()
+        # Changes detected here and not yet appended to the log.
+        self.pending: List[RegistryEvent] = []
+        # Sequence number of the last change read from the log.
+        self.position = 0
+        self.shared = 0
+        self.received = 0
+        self.missed = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def open(self) -> None:
+        """
+        Open the log, skipping the changes appended before this worker started.
+        """
+        connection = sqlite3.connect(
+            self.path, timeout=5.0, isolation_level=None, check_same_thread=False
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(self.SCHEMA)
+        self.position = connection.execute(
+            "SELECT coalesce(max(seq), 0) FROM catalog_events"
+        ).fetchone()[0]
+        self._connection = connection
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def publish(self, change: RegistryEvent) -> None:
+        """
+        Queue a change detected by this worker for the others.
+
+        Args:
+            change (RegistryEvent): The registry change.
+        """
+        self.pending.append(change)
+
+    def sync(self, changes: List[RegistryEvent]) -> Tuple[List[RegistryEvent], bool]:
+        """
+        Append changes to the log and read the ones other workers appended since the last sync.
+
+        Args:
+            changes (List[RegistryEvent]): Changes detected by this worker.
+
+        Returns:
+            Tuple[List[RegistryEvent], bool]: The other workers' changes, and
+            whether some were dropped from the log before this worker read them.
+        """
+        if self._connection is None:
+            raise RuntimeError("The catalog event log is not open.")
+        connection = self._connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.executemany(
+                "INSERT INTO catalog_events (origin, event, name, version) "
+                "VALUES (?, ?, ?, ?)",
+                [
+                    (self.origin, change.event, change.name, change.version)
+                    for change in changes
+                ],
+            )
+            oldest, newest = connection.execute(
+                "SELECT min(seq), max(seq) FROM catalog_events"
+            ).fetchone()
+            rows = connection.execute(
+                "SELECT event, name, version FROM catalog_events "
+                "WHERE seq > ? AND origin != ? ORDER BY seq",
+                (self.position, self.origin),
+            ).fetchall()
+            connection.execute(
+                "DELETE FROM catalog_events WHERE seq <= ?",
+                ((newest or 0) - self.buffer_size,),
+            )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        missed = oldest is not None and oldest > self.position + 1
+        self.position = newest or self.position
+        return [RegistryEvent(*row) for row in rows], missed
+
+    async def exchange(self, invalidator: CatalogInvalidator) -> None:
+        """
+        Share the pending changes and apply the other workers', recording a failure instead of raising.
+
+        Args:
+            invalidator (CatalogInvalidator): Applies the other workers' changes.
+        """
+        changes, self.pending = self.pending, []
+        try:
+            received, missed = await run_in_threadpool(self.sync, changes)
+            self.last_error = None
+        except Exception as e:
+            # Kept for the next exchange.
+            self.pending = changes + self.pending
+            self.failures += 1
+            self.last_error = str(e)
+            return
+        self.shared += len(changes)
+        if missed:
+            self.missed += 1
+            await invalidator.mlflow_client.invalidate_matching(lambda _key: True)
+        for change in received:
+            await invalidator.invalidate(change, local=False)
+        self.received += len(received)
+
+    async def run(self, invalidator: CatalogInvalidator) -> None:
+        """
+        Exchange changes with the other workers every interval until cancelled.
+
+        Args:
+            invalidator (CatalogInvalidator): Applies the other workers' changes.
+        """
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.exchange(invalidator)
+
+    def stats(self) -> dict:
+        """
+        Get fan-out counters.
+
+        Returns:
+            dict: Changes shared and received, times changes were missed,
+            failed exchanges and the last error.
+        """
+        return {
+            "shared": self.shared,
+            "received": self.received,
+            "missed": self.missed,
+            "failures": self.failures,
+            "last_error": self.last_error,
+        }
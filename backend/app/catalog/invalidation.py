@@ -0,0 +1,324 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Set, Tuple
+
+from app.catalog.sync import registered_models_since
+from app.clients.cache import CacheKey
+from app.clients.mlflow import REGISTERED_MODELS_SEARCH_PATH, AsyncMLflowClient
+from app.core.config import settings
+
+# Search results list the versions of many models, so any change may affect them.
+SEARCH_OPERATIONS = frozenset({"get_registered_models", "get_model_versions"})
+
+
+@dataclass(frozen=True, slots=True)
+class RegistryEvent:
+    """
+    A change to a registered model or one of its versions.
+    """
+
+    event: str
+    name: str
+    version: Optional[str] = None
+
+
+def parse_registry_event(payload: Any) -> Optional[RegistryEvent]:
+    """
+    Read the changed model from a model registry webhook payload.
+
+    Accepts MLflow webhooks (`entity`, `action` and a `data` object) and
+    Databricks registry webhooks (`event`, `model_name` and `version`).
+
+    Args:
+        payload (Any): The decoded JSON body.
+
+    Returns:
+        Optional[RegistryEvent]: The event, or None if it names no model.
+    """
+    if not isinstance(payload, dict):
+        return None
+    data = payload.get("data") if isinstance(payload.get("data"), dict) else payload
+    name = data.get("name") or data.get("model_name")
+    if not isinstance(name, str) or not name:
+        return None
+    version = data.get("version")
+    event = payload.get("event") or f"{payload.get('entity')}.{payload.get('action')}"
+    return RegistryEvent(
+        event=str(event),
+        name=name,
+        version=None if version is None else str(version),
+    )
+
+
+def verify_signature(
+    secret: str,
+    body: bytes,
+    delivery_id: str,
+    timestamp: str,
+    signature: str,
+    max_age: float,
+    now: Optional[float] = None,
+) -> bool:
+    """
+    Check the signature MLflow sends with a webhook delivery.
+
+    MLflow signs `<delivery id>.<timestamp>.<body>` with HMAC-SHA256 and sends
+    `v1,<base64 digest>`. Deliveries older than max_age are rejected, so a
+    captured request cannot be replayed later.
+
+    Args:
+        secret (str): The webhook secret shared with MLflow.
+        body (bytes): The raw request body.
+        delivery_id (str): The X-MLflow-Delivery-Id header.
+        timestamp (str): The X-MLflow-Timestamp header, in Unix seconds.
+        signature (str): The X-MLflow-Signature header.
+        max_age (float): Maximum age of a delivery in seconds.
+        now (Optional[float]): Current time, defaults to the wall clock.
+
+    Returns:
+        bool: Whether the delivery is authentic and recent.
+    """
+    try:
+        age = (time.time() if now is None else now) - int(timestamp)
+    except ValueError:
+        return False
+    if not -max_age <= age <= max_age:
+        return False
+    version, _, digest = signature.partition(",")
+    expected = hmac.new(
+        secret.encode(),
+        f"{delivery_id}.{timestamp}.".encode() + body,
+        hashlib.sha256,
+    ).digest()
+    return version == "v1" and hmac.compare_digest(
+        digest.encode(), base64.b64encode(expected)
+    )
+
+
+def affects(key: CacheKey, event: RegistryEvent) -> bool:
+    """
+    Check whether a registry change may make a cached MLflow response stale.
+
+    Args:
+        key (CacheKey): A key built by make_cache_key.
+        event (RegistryEvent): The change.
+
+    Returns:
+        bool: True for searches, lookups of the changed model and, for a change
+        to one version, pinned lookups of that version only.
+    """
+    operation, params = key[0], dict(key[1])
+    if operation in SEARCH_OPERATIONS:
+        return True
+    if params.get("name") != event.name:
+        return False
+    return (
+        operation != "get_model_version"
+        or event.version is None
+        or params.get("version") == event.version
+    )
+
+
+class CatalogInvalidator:
+    """
+    Evicts the MLflow responses a registry change affects and refetches the
+    changed model's latest version, so the next lookup is served warm.
+    """
+
+    def __init__(
+        self,
+        mlflow_client: AsyncMLflowClient,
+        on_change: Optional[Callable[[RegistryEvent], Any]] = None,
+        share: Optional[Callable[[RegistryEvent], Any]] = None,
+    ) -> None:
+        """
+        Initialize CatalogInvalidator.
+
+        Args:
+            mlflow_client (AsyncMLflowClient): Client whose cache is kept current.
+            on_change (Optional[Callable[[RegistryEvent], Any]]): Also called with every change.
+            share (Optional[Callable[[RegistryEvent], Any]]): Also called with the
+                changes this process detected, to pass them on to the other server workers.
+        """
+        self.mlflow_client = mlflow_client
+        self.on_change = on_change
+        self.share = share
+        self.events = 0
+        self.invalidated = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+
+    async def invalidate(self, event: RegistryEvent, local: bool = True) -> int:
+        """
+        Evict the cached responses affected by a change.
+
+        Args:
+            event (RegistryEvent): The change.
+            local (bool): Whether this process detected the change, rather than
+                another server worker that shared it.
+
+        Returns:
+            int: Number of entries evicted.
+        """
+        count = await self.mlflow_client.invalidate_matching(
+            lambda key: affects(key, event)
+        )
+        self.events += 1
+        self.invalidated += count
+        if self.on_change is not None:
+            self.on_change(event)
+        if local and self.share is not None:
+            self.share(event)
+        return count
+
+    async def refresh(self, name: str) -> None:
+        """
+        Refetch the latest version of a model, recording a failure instead of raising.
+
+        Args:
+            name (str): The model name.
+        """
+        try:
+            await self.mlflow_client.get_latest_model_version(name, refresh=True)
+        except Exception as e:
+            self.failures += 1
+            self.last_error = str(e)
+
+    def stats(self) -> dict:
+        """
+        Get invalidation counters.
+
+        Returns:
+            dict: Events applied, entries evicted, failed refreshes and the last error.
+        """
+        return {
+            "events": self.events,
+            "invalidated": self.invalidated,
+            "failures": self.failures,
+            "last_error": self.last_error,
+        }
+
+
+def updates(models: List[dict]) -> List[Tuple[str, int]]:
+    return [
+        (model["name"], int(model.get("last_updated_timestamp") or 0))
+        for model in models
+    ]
+
+
+class RegistryChangePoller:
+    """
+    Fallback for MLflow servers without webhooks: detects changed registered
+    models by their `last_updated_timestamp` and feeds them to the invalidator.
+
+    MLflow bumps that timestamp when a version is created or changes stage,
+    but not for tag or alias changes; those are only picked up by webhooks
+    or once the cached entries expire.
+    """
+
+    def __init__(
+        self,
+        mlflow_client: AsyncMLflowClient,
+        invalidator: CatalogInvalidator,
+        interval: Optional[float] = None,
+        page_size: Optional[int] = None,
+    ) -> None:
+        """
+        Initialize RegistryChangePoller.
+
+        Args:
+            mlflow_client (AsyncMLflowClient): Client used to list registered models.
+            invalidator (CatalogInvalidator): Receives the changed models.
+            interval (Optional[float]): Seconds between polls (defaults to MLFLOW_CHANGE_POLL_INTERVAL).
+            page_size (Optional[int]): Results per MLflow page (defaults to CATALOG_MIRROR_PAGE_SIZE).
+        """
+        self.mlflow_client = mlflow_client
+        self.invalidator = invalidator
+        self.interval = interval or settings.MLFLOW_CHANGE_POLL_INTERVAL
+        self.page_size = page_size or settings.CATALOG_MIRROR_PAGE_SIZE
+        self.watermark: Optional[int] = None
+        # Models updated exactly at the watermark, already reported.
+        self.at_watermark: Set[Tuple[str, int]] = set()
+        self.polls = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+
+    async def _newest_update(self) -> List[Tuple[str, int]]:
+        response = await self.mlflow_client.perform_request(
+            "get",
+            REGISTERED_MODELS_SEARCH_PATH,
+            params={"max_results": 1, "order_by": "last_updated_timestamp DESC"},
+        )
+        return updates(response.json().get("registered_models", []))
+
+    async def poll(self) -> List[str]:
+        """
+        Report the registered models updated since the previous poll.
+
+        The first poll only records where the registry stands.
+
+        Returns:
+            List[str]: Names of the changed models.
+        """
+        self.polls += 1
+        if self.watermark is None:
+            self._advance(await self._newest_update())
+            return []
+        models = updates(
+            await registered_models_since(
+                self.mlflow_client, self.page_size, self.watermark
+            )
+        )
+        changed = [
+            name for name, updated in models if (name, updated) not in self.at_watermark
+        ]
+        self._advance(models)
+        semaphore = asyncio.Semaphore(settings.MLFLOW_BATCH_CONCURRENCY)
+
+        async def update(name: str) -> None:
+            await self.invalidator.invalidate(RegistryEvent(event="poll", name=name))
+            async with semaphore:
+                await self.invalidator.refresh(name)
+
+        await asyncio.gather(*(update(name) for name in changed))
+        return changed
+
+    def _advance(self, models: List[Tuple[str, int]]) -> None:
+        if models:
+            self.watermark = max(updated for _, updated in models)
+            self.at_watermark = {
+                model for model in models if model[1] == self.watermark
+            }
+        elif self.watermark is None:
+            self.watermark = 0
+
+    async def run(self) -> None:
+        """
+        Poll every interval until cancelled.
+        """
+        while True:
+            try:
+                await self.poll()
+                self.last_error = None
+            except Exception as e:
+                self.failures += 1
+                self.last_error = str(e)
+            await asyncio.sleep(self.interval)
+
+    def stats(self) -> dict:
+        """
+        Get poller counters.
+
+        Returns:
+            dict: Polls, the watermark, failures and the last error.
+        """
+        return {
+            "polls": self.polls,
+            "watermark": self.watermark,
+            "failures": self.failures,
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,705 @@
+import base64
+import math
+import queue
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import orjson
+
+from app.core.config import settings
+from app.core.metrics import CATALOG_MIRROR_READS
+
+PAGE_TOKEN_PREFIX = "mirror:"
+
+NAME_FILTER = re.compile(
+    r"^\s*name\s*(=|!=|LIKE|ILIKE)\s*'((?:[^']|'')*)'\s*$", re.IGNORECASE
+)
+ORDER_BY = re.compile(r"^\s*(\w+)(?:\s+(ASC|DESC))?\s*$", re.IGNORECASE)
+
+# Sort keys MLflow accepts, mapped to mirror columns.
+MODEL_ORDER_COLUMNS = {
+    "name": "name",
+    "timestamp": "creation_timestamp",
+    "creation_timestamp": "creation_timestamp",
+    "last_updated_timestamp": "last_updated_timestamp",
+}
+VERSION_ORDER_COLUMNS = {**MODEL_ORDER_COLUMNS, "version_number": "version"}
+
+VERSION_COLUMNS = "name, version, creation_timestamp, description, source, tags"
+
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS mlflow_registered_models (
+        name TEXT PRIMARY KEY,
+        creation_timestamp BIGINT NOT NULL,
+        last_updated_timestamp BIGINT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS mlflow_model_versions (
+        name TEXT NOT NULL,
+        version INTEGER NOT NULL,
+        creation_timestamp BIGINT NOT NULL,
+        last_updated_timestamp BIGINT NOT NULL,
+        current_stage TEXT,
+        description TEXT,
+        source TEXT,
+        tags TEXT,
+        is_latest SMALLINT NOT NULL,
+        PRIMARY KEY (name, version)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_registered_models_created"
+    " ON mlflow_registered_models (creation_timestamp, name)",
+    "CREATE INDEX IF NOT EXISTS ix_registered_models_updated"
+    " ON mlflow_registered_models (last_updated_timestamp, name)",
+    "CREATE INDEX IF NOT EXISTS ix_model_versions_created"
+    " ON mlflow_model_versions (creation_timestamp, name, version)",
+    "CREATE INDEX IF NOT EXISTS ix_model_versions_updated"
+    " ON mlflow_model_versions (last_updated_timestamp, name, version)",
+    "CREATE INDEX IF NOT EXISTS ix_model_versions_version"
+    " ON mlflow_model_versions (version, name)",
+    """
+    CREATE TABLE IF NOT EXISTS catalog_mirror_state (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    )
+    """,
+)
+
+# Postgres advisory lock held by mirror writes, so syncs of several servers
+# sharing the database take turns instead of colliding on primary keys.
+WRITE_LOCK_KEY = 0x6D6972726F72
+
+Clauses = Tuple[List[str], List[Any]]
+
+
+class InvalidPageToken(ValueError):
+    """
+    Raised for mirror page tokens that are malformed or belong to another ordering.
+    """
+
+
+def postgres_connect() -> Callable[[], Any]:
+    """
+    Build a connection factory for the database configured by the POSTGRES_* settings.
+
+    Returns:
+        Callable[[], Any]: Opens a new psycopg2 connection.
+
+    Raises:
+        RuntimeError: If psycopg2 is not installed.
+    """
+    try:
+        import psycopg2
+    except ImportError as e:
+        raise RuntimeError(
+            "The catalog mirror requires psycopg2: install the `mirror` extra."
+        ) from e
+    dsn = str(settings.SQLALCHEMY_DATABASE_URI).replace("+psycopg2", "", 1)
+    return lambda: psycopg2.connect(dsn)
+
+
+def translate_filter(filter: Optional[str]) -> Optional[Clauses]:
+    """
+    Translate an MLflow search filter into SQL conditions on the model name.
+
+    Args:
+        filter (Optional[str]): The MLflow filter string.
+
+    Returns:
+        Optional[Clauses]: WHERE conditions and their parameters, or None if
+        the filter is not supported by the mirror.
+    """
+    if not filter or not filter.strip():
+        return [], []
+    match = NAME_FILTER.match(filter)
+    if not match:
+        return None
+    operator, value = match.group(1).upper(), match.group(2).replace("''", "'")
+    condition = {
+        "=": "name = ?",
+        "!=": "name <> ?",
+        "LIKE": "name LIKE ?",
+        "ILIKE": "LOWER(name) LIKE LOWER(?)",
+    }[operator]
+    return [condition], [value]
+
+
+def parse_order_by(
+    order_by: Optional[List[str]], columns: Dict[str, str]
+) -> Optional[Tuple[str, bool]]:
+    """
+    Parse an MLflow order_by list into a single mirror sort column.
+
+    Args:
+        order_by (Optional[List[str]]): MLflow order clauses, e.g. `["name DESC"]`.
+        columns (Dict[str, str]): Supported MLflow sort keys mapped to columns.
+
+    Returns:
+        Optional[Tuple[str, bool]]: The column and whether it sorts descending,
+        or None if the ordering is not supported by the mirror.
+    """
+    if not order_by:
+        return "name", False
+    if len(order_by) != 1:
+        return None
+    match = ORDER_BY.match(order_by[0])
+    if not match or match.group(1).lower() not in columns:
+        return None
+    descending = (match.group(2) or "ASC").upper() == "DESC"
+    return columns[match.group(1).lower()], descending
+
+
+def encode_page_token(ordering: str, key: Sequence[Any]) -> str:
+    payload = orjson.dumps({"order": ordering, "key": list(key)})
+    return PAGE_TOKEN_PREFIX + base64.urlsafe_b64encode(payload).decode()
+
+
+def decode_page_token(token: str, ordering: str, key_length: int) -> List[Any]:
+    """
+    Decode the keyset position stored in a mirror page token.
+
+    Args:
+        token (str): The page token.
+        ordering (str): The ordering of the current request.
+        key_length (int): Number of columns in the sort key.
+
+    Returns:
+        List[Any]: The sort key of the last row of the previous page.
+
+    Raises:
+        InvalidPageToken: If the token is malformed or was issued for another ordering.
+    """
+    try:
+        payload = orjson.loads(
+            base64.urlsafe_b64decode(token.removeprefix(PAGE_TOKEN_PREFIX))
+        )
+        key = payload["key"]
+        valid = payload["order"] == ordering and len(key) == key_length
+    except (ValueError, TypeError, KeyError):
+        valid = False
+    if not valid:
+        raise InvalidPageToken("Invalid page token.")
+    return key
+
+
+def is_mirror_token(page_token: Optional[str]) -> bool:
+    return page_token is not None and page_token.startswith(PAGE_TOKEN_PREFIX)
+
+
+def model_row(model: dict) -> tuple:
+    return (
+        model["name"],
+        int(model.get("creation_timestamp") or 0),
+        int(model.get("last_updated_timestamp") or 0),
+    )
+
+
+def version_row(version: dict, latest: bool) -> tuple:
+    tags = version.get("tags")
+    return (
+        version["name"],
+        int(version["version"]),
+        int(version.get("creation_timestamp") or 0),
+        int(version.get("last_updated_timestamp") or 0),
+        version.get("current_stage"),
+        version.get("description"),
+        version.get("source"),
+        orjson.dumps(tags).decode() if tags is not None else None,
+        int(latest),
+    )
+
+
+def latest_versions(models: List[dict]) -> set:
+    return {
+        (model["name"], int(version["version"]))
+        for model in models
+        for version in model.get("latest_versions", [])
+    }
+
+
+class CatalogMirror:
+    """
+    Registered models and model versions of MLflow, mirrored into SQL tables.
+
+    Reads are answered from indexed tables with keyset pagination while the
+    mirror is fresh. A read returns None when the mirror cannot answer it,
+    e.g. for a filter it does not support, so the caller can ask MLflow.
+    """
+
+    def __init__(
+        self,
+        connect: Optional[Callable[[], Any]] = None,
+        paramstyle: str = "format",
+        pool_size: Optional[int] = None,
+        max_lag: Optional[float] = None,
+        clock: Callable[[], float] = time.time,
+        write_lock: Optional[int] = None,
+    ) -> None:
+        """
+        Initialize CatalogMirror.
+
+        Args:
+            connect (Optional[Callable[[], Any]]): Opens a DB-API connection (defaults to the POSTGRES_* database).
+            paramstyle (str): Placeholder style of the driver, `format` or `qmark`.
+            pool_size (Optional[int]): Maximum open connections (defaults to CATALOG_MIRROR_POOL_SIZE).
+            max_lag (Optional[float]): Seconds since the last sync the mirror is trusted (defaults to CATALOG_MIRROR_MAX_LAG).
+            clock (Callable[[], float]): Wall clock.
+            write_lock (Optional[int]): Postgres advisory lock key taken by writes
+                (defaults to WRITE_LOCK_KEY for the POSTGRES_* database).
+        """
+        self.write_lock = (
+            WRITE_LOCK_KEY if connect is None and write_lock is None else write_lock
+        )
+        self._connect = connect or postgres_connect()
+        self.paramstyle = paramstyle
+        self.max_lag = settings.CATALOG_MIRROR_MAX_LAG if max_lag is None else max_lag
+        self.clock = clock
+        self.synced_at: Optional[float] = None
+        self.full_synced_at: Optional[float] = None
+        self.watermark: Optional[int] = None
+        self._idle: "queue.LifoQueue" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(
+            pool_size or settings.CATALOG_MIRROR_POOL_SIZE
+        )
+
+    def _sql(self, statement: str) -> str:
+        return statement if self.paramstyle == "qmark" else statement.replace("?", "%s")
+
+    @contextmanager
+    def _cursor(self) -> Iterator[Any]:
+        """
+        Borrow a pooled connection and run a transaction on it.
+
+        Yields:
+            Any: A DB-API cursor; the transaction commits when the block exits.
+        """
+        with self._slots:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                connection = self._connect()
+            try:
+                cursor = connection.cursor()
+                try:
+                    yield cursor
+                finally:
+                    cursor.close()
+                connection.commit()
+            except BaseException:
+                # The connection may be broken; open a new one next time.
+                connection.close()
+                raise
+            self._idle.put(connection)
+
+    def open(self) -> None:
+        """
+        Create the mirror tables if needed and load the sync state.
+        """
+        with self._cursor() as cursor:
+            for statement in SCHEMA:
+                cursor.execute(statement)
+        self.load_state()
+
+    def load_state(self) -> None:
+        """
+        Load the sync state, e.g. as written by the sync of another worker.
+        """
+        with self._cursor() as cursor:
+            cursor.execute("SELECT key, value FROM catalog_mirror_state")
+            state = dict(cursor.fetchall())
+        self.watermark = int(state["watermark"]) if "watermark" in state else None
+        self.synced_at = float(state["synced_at"]) if "synced_at" in state else None
+        self.full_synced_at = (
+            float(state["full_synced_at"]) if "full_synced_at" in state else None
+        )
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def lag(self) -> float:
+        """
+        Get the age of the mirror.
+
+        Returns:
+            float: Seconds since the last successful sync started, infinite if it never synced.
+        """
+        if self.synced_at is None:
+            return math.inf
+        return max(0.0, self.clock() - self.synced_at)
+
+    def serves(self, operation: str, page_token: Optional[str] = None) -> bool:
+        """
+        Decide whether a read should be answered by the mirror.
+
+        Pages are served by whoever issued their token, so a client paging
+        through results never switches between the mirror and MLflow.
+
+        Args:
+            operation (str): The catalog read, used as a metric label.
+            page_token (Optional[str]): The page token of the request.
+
+        Returns:
+            bool: True if the mirror should answer the read.
+        """
+        if page_token:
+            return is_mirror_token(page_token)
+        if self.lag() > self.max_lag:
+            CATALOG_MIRROR_READS.inc(operation, "stale")
+            return False
+        return True
+
+    def _served(self, operation: str, result: Optional[Any]) -> Optional[Any]:
+        CATALOG_MIRROR_READS.inc(operation, "mirror" if result else "fallback")
+        return result
+
+    @staticmethod
+    def _version(row: Sequence[Any]) -> dict:
+        name, version, creation_timestamp, description, source, tags = row
+        return {
+            "name": name,
+            "version": str(version),
+            "creation_timestamp": creation_timestamp,
+            "tags": orjson.loads(tags) if tags is not None else None,
+            "description": description,
+            "source": source,
+        }
+
+    def _page(
+        self,
+        cursor: Any,
+        select: str,
+        where: Clauses,
+        key: Sequence[str],
+        descending: bool,
+        ordering: str,
+        max_results: int,
+        page_token: Optional[str],
+    ) -> Tuple[List[Sequence[Any]], Optional[str]]:
+        """
+        Run one keyset-paginated query.
+
+        Args:
+            cursor (Any): The DB-API cursor.
+            select (str): SELECT and FROM part of the query; the key columns come first.
+            where (Clauses): Filter conditions and parameters.
+            key (Sequence[str]): Columns of the unique sort key.
+            descending (bool): Whether to sort descending.
+            ordering (str): The requested ordering, bound into page tokens.
+            max_results (int): Page size.
+            page_token (Optional[str]): Token of the page to read.
+
+        Returns:
+            Tuple[List[Sequence[Any]], Optional[str]]: The rows and the token of the next page.
+        """
+        conditions, params = list(where[0]), list(where[1])
+        if page_token:
+            conditions.append(
+                f"({', '.join(key)}) {'<' if descending else '>'} "
+                f"({', '.join('?' for _ in key)})"
+            )
+            params.extend(decode_page_token(page_token, ordering, len(key)))
+        direction = "DESC" if descending else "ASC"
+        statement = (
+            select
+            + (f" WHERE {' AND '.join(conditions)}" if conditions else "")
+            + f" ORDER BY {', '.join(f'{column} {direction}' for column in key)}"
+            + " LIMIT ?"
+        )
+        cursor.execute(self._sql(statement), [*params, max_results + 1])
+        rows = cursor.fetchall()
+        if len(rows) <= max_results:
+            return rows, None
+        rows = rows[:max_results]
+        return rows, encode_page_token(ordering, rows[-1][: len(key)])
+
+    def search_registered_models(
+        self,
+        max_results: int = 10,
+        order_by: Optional[List[str]] = None,
+        filter: Optional[str] = None,
+        page_token: Optional[str] = None,
+    ) -> Optional[dict]:
+        """
+        Search registered models, listing the latest versions of each like MLflow does.
+
+        Args:
+            max_results (int): Maximum number of registered models per page.
+            order_by (Optional[List[str]]): A single MLflow order clause.
+            filter (Optional[str]): A filter on the model name.
+            page_token (Optional[str]): Mirror token of the page to read.
+
+        Returns:
+            Optional[dict]: Parsed model versions and the next page token, or
+            None if the search is not supported by the mirror.
+
+        Raises:
+            InvalidPageToken: If the page token is not valid for this search.
+        """
+        where = translate_filter(filter)
+        ordering = parse_order_by(order_by, MODEL_ORDER_COLUMNS)
+        if where is None or ordering is None:
+            return self._served("registered_models", None)
+        column, descending = ordering
+        key = ("name",) if column == "name" else (column, "name")
+        with self._cursor() as cursor:
+            rows, next_token = self._page(
+                cursor,
+                f"SELECT {', '.join(key)} FROM mlflow_registered_models",
+                where,
+                key,
+                descending,
+                f"{column} {'DESC' if descending else 'ASC'}",
+                max(1, max_results),
+                page_token,
+            )
+            names = [row[key.index("name")] for row in rows]
+            versions: Dict[str, List[dict]] = {name: [] for name in names}
+            if names:
+                cursor.execute(
+                    self._sql(
+                        f"SELECT {VERSION_COLUMNS} FROM mlflow_model_versions"
+                        f" WHERE is_latest = 1"
+                        f" AND name IN ({', '.join('?' for _ in names)})"
+                        f" ORDER BY name, version"
+                    ),
+                    names,
+                )
+                for row in cursor.fetchall():
+                    versions[row[0]].append(self._version(row))
+        CATALOG_MIRROR_READS.inc("registered_models", "mirror")
+        return {
+            "models": [version for name in names for version in versions[name]],
+            "page_token": next_token,
+        }
+
+    def search_model_versions(
+        self,
+        filter: Optional[str] = None,
+        max_results: int = 10,
+        order_by: Optional[List[str]] = None,
+        page_token: Optional[str] = None,
+    ) -> Optional[dict]:
+        """
+        Search model versions.
+
+        Args:
+            filter (Optional[str]): A filter on the model name.
+            max_results (int): Maximum number of versions per page.
+            order_by (Optional[List[str]]): A single MLflow order clause.
+            page_token (Optional[str]): Mirror token of the page to read.
+
+        Returns:
+            Optional[dict]: Parsed model versions and the next page token, or
+            None if the search is not supported by the mirror.
+
+        Raises:
+            InvalidPageToken: If the page token is not valid for this search.
+        """
+        where = translate_filter(filter)
+        ordering = parse_order_by(order_by, VERSION_ORDER_COLUMNS)
+        if where is None or ordering is None:
+            return self._served("model_versions", None)
+        column, descending = ordering
+        key = {"name": ("name", "version"), "version": ("version", "name")}.get(
+            column, (column, "name", "version")
+        )
+        extra = [c for c in VERSION_COLUMNS.split(", ") if c not in key]
+        with self._cursor() as cursor:
+            rows, next_token = self._page(
+                cursor,
+                f"SELECT {', '.join([*key, *extra])} FROM mlflow_model_versions",
+                where,
+                key,
+                descending,
+                f"{column} {'DESC' if descending else 'ASC'}",
+                max(1, max_results),
+                page_token,
+            )
+        columns = [*key, *extra]
+        order = [columns.index(c) for c in VERSION_COLUMNS.split(", ")]
+        CATALOG_MIRROR_READS.inc("model_versions", "mirror")
+        return {
+            "models": [self._version([row[i] for i in order]) for row in rows],
+            "page_token": next_token,
+        }
+
+    def get_model_version(self, name: str, version: int) -> Optional[dict]:
+        """
+        Look up one model version.
+
+        Args:
+            name (str): The model name.
+            version (int): The version number.
+
+        Returns:
+            Optional[dict]: The parsed model version, or None if it is not mirrored (yet).
+        """
+        with self._cursor() as cursor:
+            cursor.execute(
+                self._sql(
+                    f"SELECT {VERSION_COLUMNS} FROM mlflow_model_versions"
+                    " WHERE name = ? AND version = ?"
+                ),
+                [name, int(version)],
+            )
+            row = cursor.fetchone()
+        return self._served("model_version", self._version(row) if row else None)
+
+    def get_latest_model_version(
+        self, name: str, stage: Optional[str] = None
+    ) -> Optional[dict]:
+        """
+        Look up the newest version of a model, optionally within a stage.
+
+        Args:
+            name (str): The model name.
+            stage (Optional[str]): Only consider versions in this stage.
+
+        Returns:
+            Optional[dict]: The parsed model version, or None if the model has none mirrored.
+        """
+        conditions, params = ["name = ?"], [name]
+        if stage:
+            conditions.append("LOWER(current_stage) = LOWER(?)")
+            params.append(stage)
+        with self._cursor() as cursor:
+            cursor.execute(
+                self._sql(
+                    f"SELECT {VERSION_COLUMNS} FROM mlflow_model_versions"
+                    f" WHERE {' AND '.join(conditions)}"
+                    " ORDER BY version DESC LIMIT 1"
+                ),
+                params,
+            )
+            row = cursor.fetchone()
+        return self._served("latest_version", self._version(row) if row else None)
+
+    def _write(
+        self,
+        cursor: Any,
+        models: List[dict],
+        versions: List[dict],
+        state: Dict[str, str],
+    ) -> None:
+        latest = latest_versions(models)
+        cursor.executemany(
+            self._sql(
+                "INSERT INTO mlflow_registered_models"
+                " (name, creation_timestamp, last_updated_timestamp) VALUES (?, ?, ?)"
+            ),
+            [model_row(model) for model in models],
+        )
+        cursor.executemany(
+            self._sql(
+                "INSERT INTO mlflow_model_versions (name, version,"
+                " creation_timestamp, last_updated_timestamp, current_stage,"
+                " description, source, tags, is_latest)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+            ),
+            [
+                version_row(
+                    version, (version["name"], int(version["version"])) in latest
+                )
+                for version in versions
+            ],
+        )
+        cursor.executemany(
+            self._sql(
+                "INSERT INTO catalog_mirror_state (key, value) VALUES (?, ?)"
+                " ON CONFLICT (key) DO UPDATE SET value = excluded.value"
+            ),
+            list(state.items()),
+        )
+
+    def _lock_writes(self, cursor: Any) -> None:
+        # Held until the transaction ends.
+        if self.write_lock is not None:
+            cursor.execute(
+                self._sql("SELECT pg_advisory_xact_lock(?)"), [self.write_lock]
+            )
+
+    def _next_watermark(self, models: List[dict]) -> int:
+        return max([self.watermark or 0, *(model_row(model)[2] for model in models)])
+
+    def replace_all(
+        self, models: List[dict], versions: List[dict], synced_at: float
+    ) -> None:
+        """
+        Replace the whole mirror in one transaction, dropping deleted models.
+
+        Args:
+            models (List[dict]): Every registered model, as MLflow returns it.
+            versions (List[dict]): Every model version, as MLflow returns it.
+            synced_at (float): Wall clock time the sync started.
+        """
+        watermark = self._next_watermark(models)
+        with self._cursor() as cursor:
+            self._lock_writes(cursor)
+            cursor.execute("DELETE FROM mlflow_model_versions")
+            cursor.execute("DELETE FROM mlflow_registered_models")
+            self._write(
+                cursor,
+                models,
+                versions,
+                {
+                    "watermark": str(watermark),
+                    "synced_at": repr(synced_at),
+                    "full_synced_at": repr(synced_at),
+                },
+            )
+        self.watermark = watermark
+        self.synced_at = self.full_synced_at = synced_at
+
+    def replace_models(
+        self, models: List[dict], versions: List[dict], synced_at: float
+    ) -> None:
+        """
+        Replace some registered models and all of their versions in one transaction.
+
+        Args:
+            models (List[dict]): The changed registered models, as MLflow returns them.
+            versions (List[dict]): Every version of those models.
+            synced_at (float): Wall clock time the sync started.
+        """
+        watermark = self._next_watermark(models)
+        names = [(model["name"],) for model in models]
+        with self._cursor() as cursor:
+            self._lock_writes(cursor)
+            cursor.executemany(
+                self._sql("DELETE FROM mlflow_model_versions WHERE name = ?"), names
+            )
+            cursor.executemany(
+                self._sql("DELETE FROM mlflow_registered_models WHERE name = ?"), names
+            )
+            self._write(
+                cursor,
+                models,
+                versions,
+                {"watermark": str(watermark), "synced_at": repr(synced_at)},
+            )
+        self.watermark = watermark
+        self.synced_at = synced_at
+
+    def stats(self) -> dict:
+        """
+        Get mirror freshness for monitoring.
+
+        Returns:
+            dict: Lag in seconds, whether reads are served, and the sync watermark.
+        """
+        lag = self.lag()
+        return {
+            "lag_seconds": None if math.isinf(lag) else round(lag, 3),
+            "fresh": lag <= self.max_lag,
+            "watermark": self.watermark,
+            "full_synced_at": self.full_synced_at,
+        }
@@ -0,0 +1,256 @@
+import asyncio
+import time
+from typing import AsyncIterator, Callable, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.catalog.mirror import CatalogMirror
+from app.clients.mlflow import (
+    MODEL_VERSIONS_SEARCH_PATH,
+    REGISTERED_MODELS_SEARCH_PATH,
+    AsyncMLflowClient,
+)
+from app.core.config import settings
+
+# MLflow caps registered model searches at this page size.
+MAX_REGISTERED_MODELS_PAGE = 1000
+
+
+def name_filter(name: str) -> str:
+    """
+    Build an MLflow model version filter selecting a registered model.
+
+    MLflow strips the quotes around a filter value without unescaping it,
+    so a quote inside the value can only be written by delimiting it with
+    the other quote. A name holding both kinds is matched by a LIKE pattern
+    with `_` for its quotes, which may also match other names.
+
+    Args:
+        name (str): The registered model name.
+
+    Returns:
+        str: The filter; callers must drop versions of other models.
+    """
+    if "'" not in name:
+        return f"name='{name}'"
+    if '"' not in name:
+        return f'name="{name}"'
+    return "name LIKE '" + name.replace("'", "_").replace('"', "_") + "'"
+
+
+async def iter_pages(
+    mlflow_client: AsyncMLflowClient, path: str, params: dict, items: str
+) -> AsyncIterator[List[dict]]:
+    """
+    Walk every page of an MLflow search, bypassing the response cache.
+
+    Args:
+        mlflow_client (AsyncMLflowClient): Client used for the requests.
+        path (str): API endpoint path.
+        params (dict): Query parameters of the first page.
+        items (str): Response field holding the results.
+
+    Yields:
+        List[dict]: The results of each page, as MLflow returns them.
+    """
+    page_token = None
+    while True:
+        response = await mlflow_client.perform_request(
+            "get",
+            path,
+            params={**params, **({"page_token": page_token} if page_token else {})},
+        )
+        data = response.json()
+        yield data.get(items, [])
+        page_token = data.get("next_page_token")
+        if not page_token:
+            return
+
+
+async def registered_models_since(
+    mlflow_client: AsyncMLflowClient, page_size: int, watermark: Optional[int] = None
+) -> List[dict]:
+    """
+    List registered models, most recently updated first.
+
+    Args:
+        mlflow_client (AsyncMLflowClient): Client used for the requests.
+        page_size (int): Results per MLflow page.
+        watermark (Optional[int]): Stop at models last updated before this timestamp.
+
+    Returns:
+        List[dict]: The registered models, as MLflow returns them.
+    """
+    params = {
+        "max_results": min(page_size, MAX_REGISTERED_MODELS_PAGE),
+        "order_by": "last_updated_timestamp DESC",
+    }
+    models = []
+    async for page in iter_pages(
+        mlflow_client, REGISTERED_MODELS_SEARCH_PATH, params, "registered_models"
+    ):
+        for model in page:
+            if (
+                watermark is not None
+                and int(model.get("last_updated_timestamp") or 0) < watermark
+            ):
+                return models
+            models.append(model)
+    return models
+
+
+class CatalogMirrorSync:
+    """
+    Keeps a CatalogMirror current with MLflow.
+
+    Incremental syncs walk the registered models most recently updated first,
+    stop at the watermark of the previous sync and re-read the versions of the
+    models that changed. Full syncs re-read the whole registry, which also
+    drops models deleted in MLflow.
+    """
+
+    def __init__(
+        self,
+        mlflow_client: AsyncMLflowClient,
+        mirror: CatalogMirror,
+        interval: Optional[float] = None,
+        full_sync_interval: Optional[float] = None,
+        page_size: Optional[int] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Initialize CatalogMirrorSync.
+
+        Args:
+            mlflow_client (AsyncMLflowClient): Client used to read the registry.
+            mirror (CatalogMirror): The mirror to keep current.
+            interval (Optional[float]): Seconds between syncs (defaults to CATALOG_MIRROR_SYNC_INTERVAL).
+            full_sync_interval (Optional[float]): Seconds between full syncs (defaults to CATALOG_MIRROR_FULL_SYNC_INTERVAL).
+            page_size (Optional[int]): Results per MLflow page (defaults to CATALOG_MIRROR_PAGE_SIZE).
+            clock (Callable[[], float]): Wall clock.
+        """
+        self.mlflow_client = mlflow_client
+        self.mirror = mirror
+        self.interval = (
+            settings.CATALOG_MIRROR_SYNC_INTERVAL if interval is None else interval
+        )
+        self.full_sync_interval = (
+            settings.CATALOG_MIRROR_FULL_SYNC_INTERVAL
+            if full_sync_interval is None
+            else full_sync_interval
+        )
+        self.page_size = page_size or settings.CATALOG_MIRROR_PAGE_SIZE
+        self.clock = clock
+        self.syncs = 0
+        self.full_syncs = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+
+    async def _model_versions(self, filter: Optional[str] = None) -> List[dict]:
+        params = {
+            "max_results": self.page_size,
+            **({"filter": filter} if filter else {}),
+        }
+        versions = []
+        async for page in iter_pages(
+            self.mlflow_client, MODEL_VERSIONS_SEARCH_PATH, params, "model_versions"
+        ):
+            versions.extend(page)
+        return versions
+
+    async def _registered_models(self, watermark: Optional[int] = None) -> List[dict]:
+        return await registered_models_since(
+            self.mlflow_client, self.page_size, watermark
+        )
+
+    def _full_sync_due(self) -> bool:
+        return (
+            self.mirror.watermark is None
+            or self.mirror.full_synced_at is None
+            or self.clock() - self.mirror.full_synced_at >= self.full_sync_interval
+        )
+
+    async def sync(self, full: Optional[bool] = None) -> dict:
+        """
+        Bring the mirror up to date with MLflow.
+
+        Args:
+            full (Optional[bool]): Force a full or incremental sync; by default a
+            full sync runs first and then every full_sync_interval.
+
+        Returns:
+            dict: Whether the sync was full, and the number of models and versions written.
+        """
+        full = self._full_sync_due() if full is None else full
+        started = self.clock()
+        if full:
+            models, versions = await asyncio.gather(
+                self._registered_models(), self._model_versions()
+            )
+            await run_in_threadpool(self.mirror.replace_all, models, versions, started)
+            self.full_syncs += 1
+        else:
+            models = await self._registered_models(self.mirror.watermark)
+            semaphore = asyncio.Semaphore(settings.MLFLOW_BATCH_CONCURRENCY)
+
+            async def model_versions(name: str) -> List[dict]:
+                async with semaphore:
+                    versions = await self._model_versions(name_filter(name))
+                return [version for version in versions if version["name"] == name]
+
+            pages = await asyncio.gather(
+                *(model_versions(model["name"]) for model in models)
+            )
+            versions = [version for page in pages for version in page]
+            await run_in_threadpool(
+                self.mirror.replace_models, models, versions, started
+            )
+        self.syncs += 1
+        return {"full": full, "models": len(models), "versions": len(versions)}
+
+    async def run(self) -> None:
+        """
+        Sync every interval until cancelled.
+
+        A failed sync is retried on the next interval; meanwhile the mirror
+        ages and reads fall back to MLflow once it is stale.
+        """
+        while True:
+            try:
+                await self.sync()
+                self.last_error = None
+            except Exception as e:
+                self.failures += 1
+                self.last_error = str(e)
+            await asyncio.sleep(self.interval)
+
+    async def follow(self) -> None:
+        """
+        Reload the mirror's sync state every interval until cancelled.
+
+        Run instead of run() in the workers that do not sync, so they see the
+        syncing worker's progress and keep serving reads from the mirror.
+        """
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await run_in_threadpool(self.mirror.load_state)
+                self.last_error = None
+            except Exception as e:
+                self.failures += 1
+                self.last_error = str(e)
+
+    def stats(self) -> dict:
+        """
+        Get sync counters and mirror freshness.
+
+        Returns:
+            dict: Syncs, full syncs, failures, the last error and the mirror stats.
+        """
+        return {
+            **self.mirror.stats(),
+            "syncs": self.syncs,
+            "full_syncs": self.full_syncs,
+            "failures": self.failures,
+            "last_error": self.last_error,
+        }
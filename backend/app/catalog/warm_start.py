@@ -0,0 +1,252 @@
+import asyncio
+import os
+import time
+from collections import Counter
+from typing import Callable, List, Optional
+
+import orjson
+from fastapi.concurrency import run_in_threadpool
+
+from app.clients.cache import freeze_key
+from app.clients.mlflow import AsyncMLflowClient
+from app.core.config import settings
+
+# Bump when the shape of cached MLflow responses changes, which discards older snapshots.
+SNAPSHOT_FORMAT = 1
+# Hot catalog responses worth carrying over a restart: registered model pages
+# and pinned versions. Latest versions go stale within seconds.
+SNAPSHOT_OPERATIONS = frozenset({"get_registered_models", "get_model_version"})
+
+
+class CacheSnapshot:
+    """
+    Persists hot MLflow responses to disk, so a restarted server starts warm.
+
+    Entries keep their absolute expiry: a restored entry expires when it
+    would have without the restart. A snapshot written by another snapshot
+    format or for another MLflow server is ignored. Writes go to a temporary
+    file renamed over the snapshot, so a crash never leaves a partial one.
+    """
+
+    def __init__(
+        self,
+        mlflow_client: AsyncMLflowClient,
+        path: Optional[str] = None,
+        interval: Optional[float] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Initialize CacheSnapshot.
+
+        Args:
+            mlflow_client (AsyncMLflowClient): Client whose response cache is persisted.
+            path (Optional[str]): Snapshot file (defaults to MLFLOW_CACHE_SNAPSHOT_PATH).
+            interval (Optional[float]): Seconds between writes (defaults to MLFLOW_CACHE_SNAPSHOT_INTERVAL).
+            clock (Callable[[], float]): Wall clock, comparable across restarts.
+        """
+        self.mlflow_client = mlflow_client
+        self.path = path or settings.MLFLOW_CACHE_SNAPSHOT_PATH
+        self.interval = (
+            settings.MLFLOW_CACHE_SNAPSHOT_INTERVAL if interval is None else interval
+        )
+        self.clock = clock
+        self.loaded = 0
+        self.saved = 0
+        self.saved_at: Optional[float] = None
+        self.failures = 0
+        self.last_error: Optional[str] = None
+
+    def save(self) -> int:
+        """
+        Write the live hot entries and the per-model request counts.
+
+        Returns:
+            int: Number of entries written.
+        """
+        now = self.clock()
+        entries = [
+            [key, value, now + ttl]
+            for key, value, ttl in self.mlflow_client.cache.items()
+            if key[0] in SNAPSHOT_OPERATIONS
+        ]
+        data = orjson.dumps(
+            {
+                "format": SNAPSHOT_FORMAT,
+                "mlflow_uri": settings.MLFLOW_TRACKING_URI,
+                "written_at": now,
+                "entries": entries,
+                "popularity": dict(self.mlflow_client.popularity),
+            }
+        )
+        # Unique per process, workers sharing the path never write the same file.
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as snapshot:
+            snapshot.write(data)
+        os.replace(temporary, self.path)
+        self.saved = len(entries)
+        self.saved_at = now
+        return self.saved
+
+    def load(self) -> int:
+        """
+        Restore the unexpired entries and request counts of the snapshot, if compatible.
+
+        Returns:
+            int: Number of entries restored; 0 without a compatible snapshot.
+        """
+        try:
+            with open(self.path, "rb") as snapshot:
+                data = orjson.loads(snapshot.read())
+            if (
+                isinstance(data, dict)
+                and data.get("format") == SNAPSHOT_FORMAT
+                and data.get("mlflow_uri") == settings.MLFLOW_TRACKING_URI
+            ):
+                self._restore(data)
+        except FileNotFoundError:
+            pass
+        except (OSError, KeyError, TypeError, ValueError) as e:
+            # A damaged snapshot only costs the warm start.
+            self.failures += 1
+            self.last_error = str(e)
+        return self.loaded
+
+    def _restore(self, data: dict) -> None:
+        now = self.clock()
+        cache = self.mlflow_client.cache
+        for key, value, expires_at in data["entries"]:
+            if expires_at > now:
+                cache.set(freeze_key(key), value, expires_at - now)
+                self.loaded += 1
+        self.mlflow_client.popularity.update(data["popularity"])
+        self.mlflow_client.trim_popularity()
+
+    async def checkpoint(self) -> None:
+        """
+        Write the snapshot off the event loop, recording a failure instead of raising.
+        """
+        try:
+            await run_in_threadpool(self.save)
+            self.last_error = None
+        except Exception as e:
+            self.failures += 1
+            self.last_error = str(e)
+
+    async def run(self) -> None:
+        """
+        Write the snapshot every interval until cancelled.
+        """
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.checkpoint()
+
+    def stats(self) -> dict:
+        """
+        Get snapshot counters.
+
+        Returns:
+            dict: Entries restored and last written, the last write time and failures.
+        """
+        return {
+            "loaded": self.loaded,
+            "saved": self.saved,
+            "saved_at": self.saved_at,
+            "failures": self.failures,
+            "last_error": self.last_error,
+        }
+
+
+class CatalogPreWarmer:
+    """
+    Keeps the latest version of the most requested models cached.
+
+    Every interval, the latest versions of the top N models by lookups are
+    refetched, so their cache entries are replaced before they expire and
+    those lookups never wait for MLflow. Lookup counts are halved after each
+    round, so the selection follows recent demand.
+    """
+
+    def __init__(
+        self,
+        mlflow_client: AsyncMLflowClient,
+        top_n: Optional[int] = None,
+        interval: Optional[float] = None,
+    ) -> None:
+        """
+        Initialize CatalogPreWarmer.
+
+        Args:
+            mlflow_client (AsyncMLflowClient): Client whose cache is kept warm.
+            top_n (Optional[int]): Models to keep warm (defaults to MLFLOW_PREWARM_TOP_N).
+            interval (Optional[float]): Seconds between rounds (defaults to MLFLOW_PREWARM_INTERVAL).
+        """
+        self.mlflow_client = mlflow_client
+        self.top_n = settings.MLFLOW_PREWARM_TOP_N if top_n is None else top_n
+        self.interval = (
+            settings.MLFLOW_PREWARM_INTERVAL if interval is None else interval
+        )
+        self.rounds = 0
+        self.refreshed = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+
+    def hottest(self) -> List[str]:
+        """
+        Pick the models to refresh and decay the lookup counts.
+
+        Returns:
+            List[str]: The most requested model names, most requested first.
+        """
+        popularity = self.mlflow_client.popularity
+        names = [name for name, _ in popularity.most_common(self.top_n)]
+        decayed = Counter(
+            {name: count // 2 for name, count in popularity.items() if count > 1}
+        )
+        popularity.clear()
+        popularity.update(decayed)
+        return names
+
+    async def warm(self) -> int:
+        """
+        Refetch the latest version of the hottest models.
+
+        Returns:
+            int: Number of models refreshed.
+        """
+        semaphore = asyncio.Semaphore(settings.MLFLOW_BATCH_CONCURRENCY)
+
+        async def refresh(name: str) -> None:
+            async with semaphore:
+                await self.mlflow_client.get_latest_model_version(name, refresh=True)
+
+        results = await asyncio.gather(
+            *(refresh(name) for name in self.hottest()), return_exceptions=True
+        )
+        errors = [result for result in results if isinstance(result, Exception)]
+        self.rounds += 1
+        self.refreshed += len(results) - len(errors)
+        self.failures += len(errors)
+        self.last_error = str(errors[-1]) if errors else self.last_error
+        return len(results) - len(errors)
+
+    async def run(self) -> None:
+        """
+        Warm every interval until cancelled.
+        """
+        while True:
+            await self.warm()
+            await asyncio.sleep(self.interval)
+
+    def stats(self) -> dict:
+        """
+        Get pre-warmer counters.
+
+        Returns:
+            dict: Rounds, models refreshed, failed refreshes and the last error.
+        """
+        return {
+            "rounds": self.rounds,
+            "refreshed": self.refreshed,
+            "failures": self.failures,
+            "last_error": self.last_error,
+        }
@@ -1,6 +1,13 @@
-from typing import Optional, Type
+import asyncio
+import time
+from typing import Optional, Type, Union
 
-from httpx import Client, HTTPError, Response
+from httpx import AsyncClient, Client, HTTPError, Limits, Response, Timeout
+
+from app.clients.resilience import CircuitBreaker, RetryPolicy
+from app.core.config import settings
+from app.core.metrics import UPSTREAM_REQUEST_DURATION
+from app.core.profiling import record_phase
 
 
 class BaseClientError(Exception):
@@ -21,34 +28,242 @@ class BaseClientError(Exception):
         super().__init__(self.message)
 
 
-class BaseClient:
+def default_limits() -> Limits:
     """
-    Base client for interacting with any external service.
+    Build connection pool limits from the application settings.
+
+    Returns:
+        Limits: Connection pool limits for an HTTP session.
+    """
+    return Limits(
+        max_connections=settings.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+    )
+
+
+def default_retry_policy() -> RetryPolicy:
+    """
+    Build a retry policy from the application settings.
+
+    Returns:
+        RetryPolicy: Retry policy for an upstream client.
+    """
+    return RetryPolicy(
+        max_attempts=settings.HTTP_RETRY_MAX_ATTEMPTS,
+        backoff_base=settings.HTTP_RETRY_BACKOFF_BASE,
+        backoff_max=settings.HTTP_RETRY_BACKOFF_MAX,
+    )
+
+
+def default_circuit_breaker() -> CircuitBreaker:
+    """
+    Build a circuit breaker from the application settings.
+
+    Returns:
+        CircuitBreaker: Circuit breaker for an upstream client.
+    """
+    return CircuitBreaker(
+        failure_threshold=settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+        recovery_timeout=settings.CIRCUIT_BREAKER_RECOVERY_TIMEOUT,
+    )
+
+
+DEFAULT_HEADERS = {"Content-Type": "application/json", "User-agent": "Formenos API"}
+
+
+def connection_pool_stats(session: Union[Client, AsyncClient]) -> dict:
+    """
+    Count the connections held by an HTTP session's pool.
+
+    Args:
+        session (Union[Client, AsyncClient]): The HTTP session.
+
+    Returns:
+        dict: Open and idle connections; zero before the first request.
+    """
+    # httpx does not expose its connection pool publicly.
+    pool = getattr(getattr(session, "_transport", None), "_pool", None)
+    connections = list(getattr(pool, "connections", []))
+    return {
+        "open": len(connections),
+        "idle": sum(connection.is_idle() for connection in connections),
+    }
+
+
+def observe_upstream_request(
+    client: "ClientCore", method: str, started: float, response: Optional[Response]
+) -> None:
+    """
+    Record the duration and outcome of an upstream call, retries included,
+    in the metrics and the timings of the current request.
+
+    Args:
+        client (ClientCore): The client that performed the call.
+        method (str): HTTP method of the call.
+        started (float): perf_counter() value when the call started.
+        response (Optional[Response]): The last HTTP response, if one was received.
+    """
+    elapsed = time.perf_counter() - started
+    outcome = f"{response.status_code // 100}xx" if response is not None else "error"
+    UPSTREAM_REQUEST_DURATION.observe(elapsed, client.upstream, method.upper(), outcome)
+    record_phase("upstream", elapsed)
+
+
+def request_error(
+    client: object,
+    error_class: Type[BaseClientError],
+    method: str,
+    path: str,
+    response: Optional[Response],
+) -> BaseClientError:
+    """
+    Build the error raised when a request to an external service fails.
+
+    Args:
+        client (object): The client that performed the request.
+        error_class (Type[BaseClientError]): The error class to instantiate.
+        method (str): HTTP method of the failed request.
+        path (str): API endpoint path of the failed request.
+        response (Optional[Response]): Raw HTTP response, if one was received.
+
+    Returns:
+        BaseClientError: The error to raise.
+    """
+    return error_class(
+        f"{client.__class__.__name__} request failure:\n"
+        f"{method.upper()}: {path}\n"
+        f"Message: {response is not None and response.text}",
+        raw_response=response,
+    )
+
+
+class ClientCore:
+    """
+    Configuration and failure handling shared by the sync and async base clients.
     """
 
     base_uri: str
     base_error: Type[BaseClientError]
+    # Label of the upstream in metrics.
+    upstream: str = "upstream"
+
+    def __init__(
+        self,
+        base_uri: str,
+        error_class: Type[BaseClientError],
+        timeout: Optional[float] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+    ) -> None:
+        self.base_uri = base_uri
+        self.base_error = error_class
+        self.timeout = Timeout(
+            settings.HTTP_TIMEOUT if timeout is None else timeout,
+            connect=settings.HTTP_CONNECT_TIMEOUT,
+        )
+        self.retry_policy = retry_policy or default_retry_policy()
+        self.circuit_breaker = circuit_breaker or default_circuit_breaker()
+        self.retries = 0
+
+    def stats(self) -> dict:
+        """
+        Get client counters for monitoring.
+
+        Returns:
+            dict: Retry count and circuit breaker state.
+        """
+        return {
+            "retries": self.retries,
+            "circuit_breaker": self.circuit_breaker.stats(),
+        }
+
+    def _check_circuit(self, method: str, path: str) -> None:
+        if not self.circuit_breaker.allow_request():
+            raise self.base_error(
+                f"{self.__class__.__name__} request failure:\n"
+                f"{method.upper()}: {path}\n"
+                "Message: circuit breaker is open"
+            )
+
+    def _handle_failure(
+        self,
+        method: str,
+        path: str,
+        attempt: int,
+        error: HTTPError,
+        response: Optional[Response],
+    ) -> float:
+        """
+        Record a failed attempt and decide whether to retry it.
+
+        Args:
+            method (str): HTTP method of the request.
+            path (str): API endpoint path of the request.
+            attempt (int): Number of attempts made so far.
+            error (HTTPError): The error raised by the attempt.
+            response (Optional[Response]): Raw HTTP response, if one was received.
+
+        Returns:
+            float: Seconds to wait before the next attempt.
+
+        Raises:
+            BaseClientError: If the request should not be retried.
+        """
+        if self.retry_policy.is_upstream_failure(error, response):
+            self.circuit_breaker.record_failure()
+        else:
+            self.circuit_breaker.record_success()
+        delay = self.retry_policy.next_delay(method, attempt, error, response)
+        if delay is None or not self.circuit_breaker.allow_request():
+            raise request_error(self, self.base_error, method, path, response)
+        self.retries += 1
+        return delay
+
 
-    def __init__(self, base_uri: str, error_class: Type[BaseClientError]) -> None:
+class BaseClient(ClientCore):
+    """
+    Base client for interacting with any external service.
+    """
+
+    def __init__(
+        self,
+        base_uri: str,
+        error_class: Type[BaseClientError],
+        limits: Optional[Limits] = None,
+        http2: Optional[bool] = None,
+        timeout: Optional[float] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+    ) -> None:
         """
         Initialize BaseClient.
 
+        The underlying session keeps a pool of connections alive, so a single
+        client instance should be shared and closed once it is no longer needed.
+
         Args:
             base_uri (str): Base URI for the client.
             error_class (Type[BaseClientError]): The error class to use for exceptions.
+            limits (Optional[Limits]): Connection pool limits (defaults to the HTTP_* settings).
+            http2 (Optional[bool]): Whether to enable HTTP/2 (defaults to HTTP2_ENABLED).
+            timeout (Optional[float]): Read/write/pool timeout in seconds (defaults to HTTP_TIMEOUT).
+            retry_policy (Optional[RetryPolicy]): Retry policy (defaults to the HTTP_RETRY_* settings).
+            circuit_breaker (Optional[CircuitBreaker]): Circuit breaker (defaults to the CIRCUIT_BREAKER_* settings).
         """
-        self.base_uri = base_uri
-        self.base_error = error_class
-        self.session = Client()
-        self.session.headers.update(
-            {"Content-Type": "application/json", "User-agent": "Formenos API"}
+        super().__init__(base_uri, error_class, timeout, retry_policy, circuit_breaker)
+        self.session = Client(
+            limits=limits or default_limits(),
+            http2=settings.HTTP2_ENABLED if http2 is None else http2,
+            timeout=self.timeout,
         )
+        self.session.headers.update(DEFAULT_HEADERS)
 
     def perform_request(
         self, method: str, path: str, params: dict = None, json: dict = None
     ) -> Response:
         """
-        Perform HTTP request to the server.
+        Perform HTTP request to the server, retrying transient failures.
 
         Args:
             method (str): HTTP method (e.g., 'get', 'post').
@@ -59,17 +274,148 @@ class BaseClient:
             Response: HTTP response.
 
         Raises:
-            BaseClientError: If HTTP request fails.
+            BaseClientError: If HTTP request fails or the circuit breaker is open.
         """
         url = f"{self.base_uri}{path}"
+        self._check_circuit(method, path)
+        started = time.perf_counter()
+        attempt = 0
+        response = None
         try:
-            response = self.session.request(method, url, params=params, json=json)
-            response.raise_for_status()
-        except HTTPError:
-            raise self.base_error(
-                f"{self.__class__.__name__} request failure:\n"
-                f"{method.upper()}: {path}\n"
-                f"Message: {response is not None and response.text}",
-                raw_response=response,
-            )
-        return response
+            while True:
+                attempt += 1
+                response = None
+                try:
+                    response = self.session.request(
+                        method, url, params=params, json=json
+                    )
+                    response.raise_for_status()
+                except HTTPError as error:
+                    time.sleep(
+                        self._handle_failure(method, path, attempt, error, response)
+                    )
+                    continue
+                self.circuit_breaker.record_success()
+                return response
+        finally:
+            observe_upstream_request(self, method, started, response)
+
+    def pool_stats(self) -> dict:
+        """
+        Get the connection pool usage of the session.
+
+        Returns:
+            dict: Open and idle connections.
+        """
+        return connection_pool_stats(self.session)
+
+    def close(self) -> None:
+        """
+        Close the underlying session and release pooled connections.
+        """
+        self.session.close()
+
+    def __enter__(self) -> "BaseClient":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class AsyncBaseClient(ClientCore):
+    """
+    Asynchronous base client for interacting with any external service.
+    """
+
+    def __init__(
+        self,
+        base_uri: str,
+        error_class: Type[BaseClientError],
+        limits: Optional[Limits] = None,
+        http2: Optional[bool] = None,
+        timeout: Optional[float] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+    ) -> None:
+        """
+        Initialize AsyncBaseClient.
+
+        Args:
+            base_uri (str): Base URI for the client.
+            error_class (Type[BaseClientError]): The error class to use for exceptions.
+            limits (Optional[Limits]): Connection pool limits (defaults to the HTTP_* settings).
+            http2 (Optional[bool]): Whether to enable HTTP/2 (defaults to HTTP2_ENABLED).
+            timeout (Optional[float]): Read/write/pool timeout in seconds (defaults to HTTP_TIMEOUT).
+            retry_policy (Optional[RetryPolicy]): Retry policy (defaults to the HTTP_RETRY_* settings).
+            circuit_breaker (Optional[CircuitBreaker]): Circuit breaker (defaults to the CIRCUIT_BREAKER_* settings).
+        """
+        super().__init__(base_uri, error_class, timeout, retry_policy, circuit_breaker)
+        self.session = AsyncClient(
+            limits=limits or default_limits(),
+            http2=settings.HTTP2_ENABLED if http2 is None else http2,
+            timeout=self.timeout,
+        )
+        self.session.headers.update(DEFAULT_HEADERS)
+
+    async def perform_request(
+        self, method: str, path: str, params: dict = None, json: dict = None
+    ) -> Response:
+        """
+        Perform HTTP request to the server without blocking the event loop,
+        retrying transient failures.
+
+        Args:
+            method (str): HTTP method (e.g., 'get', 'post').
+            path (str): API endpoint path.
+            params (dict): Query parameters to include in the request.
+
+        Returns:
+            Response: HTTP response.
+
+        Raises:
+            BaseClientError: If HTTP request fails or the circuit breaker is open.
+        """
+        url = f"{self.base_uri}{path}"
+        self._check_circuit(method, path)
+        started = time.perf_counter()
+        attempt = 0
+        response = None
+        try:
+            while True:
+                attempt += 1
+                response = None
+                try:
+                    response = await self.session.request(
+                        method, url, params=params, json=json
+                    )
+                    response.raise_for_status()
+                except HTTPError as error:
+                    await asyncio.sleep(
+                        self._handle_failure(method, path, attempt, error, response)
+                    )
+                    continue
+                self.circuit_breaker.record_success()
+                return response
+        finally:
+            observe_upstream_request(self, method, started, response)
+
+    def pool_stats(self) -> dict:
+        """
+        Get the connection pool usage of the session.
+
+        Returns:
+            dict: Open and idle connections.
+        """
+        return connection_pool_stats(self.session)
+
+    async def close(self) -> None:
+        """
+        Close the underlying session and release pooled connections.
+        """
+        await self.session.aclose()
+
+    async def __aenter__(self) -> "AsyncBaseClient":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
@@ -1,4 +1,5 @@
-from typing import Optional
+from typing import Dict, Optional
+from urllib.parse import quote
 
 from httpx import Response
 
@@ -27,18 +28,22 @@ class GitLabClient(BaseClient):
     Client for interacting with GitLab APIs.
     """
 
+    upstream = "gitlab"
+
     def __init__(self) -> None:
         """
         Initialize GitLabClient with specific base URI and error class.
         """
         super().__init__(
-            base_uri=settings.GITLAB_BASE_URI, error_class=GitLabClientError
+            base_uri=settings.GITLAB_BASE_URI,
+            error_class=GitLabClientError,
+            timeout=settings.GITLAB_TIMEOUT,
         )
         self.session.headers.update({"Private-Token": settings.GITLAB_ACCESS_TOKEN})
 
     def perform_commit(
         self, project_id: str, branch: str, commit_message: str, actions
-    ) -> None:
+    ) -> dict:
         """
         Commit multiple actions to the specified branch in a GitLab project.
 
@@ -47,6 +52,9 @@ class GitLabClient(BaseClient):
             branch (str): The branch name to commit to.
             commit_message (str): The commit message.
             actions (List[Dict]): List of actions to perform in the commit.
+
+        Returns:
+            dict: The created commit as returned by GitLab.
         """
         url = f"/api/v4/projects/{project_id}/repository/commits"
 
@@ -55,4 +63,56 @@ class GitLabClient(BaseClient):
             "commit_message": commit_message,
             "actions": actions,
         }
-        self.perform_request("POST", url, json=payload)
+        response = self.perform_request("POST", url, json=payload)
+        return response.json()
+
+    def file_exists(self, project_id: str, file_path: str, ref: str) -> bool:
+        """
+        Check whether a file exists on a branch of a GitLab project.
+
+        Args:
+            project_id (str): The ID of the GitLab project.
+            file_path (str): Path of the file in the repository.
+            ref (str): Branch, tag or commit to look in.
+
+        Returns:
+            bool: True if the file exists.
+        """
+        url = f"/api/v4/projects/{project_id}/repository/files/{quote(file_path, safe='')}"
+        try:
+            self.perform_request("HEAD", url, params={"ref": ref})
+        except GitLabClientError as e:
+            if e.raw_response is not None and e.raw_response.status_code == 404:
+                return False
+            raise
+        return True
+
+    def get_tree(
+        self, project_id: str, ref: str, path: Optional[str] = None
+    ) -> Dict[str, str]:
+        """
+        List the blobs of a GitLab project's repository tree, recursively.
+
+        Args:
+            project_id (str): The ID of the GitLab project.
+            ref (str): Branch, tag or commit to list.
+            path (Optional[str]): Only list files below this directory.
+
+        Returns:
+            Dict[str, str]: Git blob SHA of every file, keyed by its path.
+        """
+        url = f"/api/v4/projects/{project_id}/repository/tree"
+        params = {"ref": ref, "recursive": "true", "per_page": 100, "page": 1}
+        if path:
+            params["path"] = path
+
+        blobs = {}
+        while True:
+            response = self.perform_request("GET", url, params=params)
+            for entry in response.json():
+                if entry["type"] == "blob":
+                    blobs[entry["path"]] = entry["id"]
+            next_page = response.headers.get("x-next-page")
+            if not next_page:
+                return blobs
+            params["page"] = int(next_page)
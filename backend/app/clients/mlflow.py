@@ -1,9 +1,24 @@
-from typing import List, Optional
+import asyncio
+from collections import Counter
+from typing import AsyncIterator, Callable, Iterable, List, Optional, Tuple, Union
 
+from fastapi.concurrency import run_in_threadpool
 from httpx import Response
 
-from app.clients.base_client import BaseClient, BaseClientError
+from app.clients.base_client import AsyncBaseClient, BaseClient, BaseClientError
+from app.clients.cache import CacheKey, SharedTTLCache, TTLCache, make_cache_key
+from app.clients.singleflight import SingleFlight
 from app.core.config import settings
+from app.core.profiling import timed_phase
+
+MLFLOW_HEADERS = {"Content-Type": "application/json", "User-agent": "PenroseML API"}
+
+REGISTERED_MODELS_SEARCH_PATH = "/api/2.0/mlflow/registered-models/search"
+REGISTERED_MODEL_PATH = "/api/2.0/mlflow/registered-models/get"
+MODEL_VERSION_BY_ALIAS_PATH = "/api/2.0/mlflow/registered-models/alias"
+LATEST_VERSIONS_PATH = "/api/2.0/mlflow/registered-models/get-latest-versions"
+MODEL_VERSIONS_SEARCH_PATH = "/api/2.0/mlflow/model-versions/search"
+MODEL_VERSION_PATH = "/api/2.0/mlflow/model-versions/get"
 
 
 class MLflowClientError(BaseClientError):
@@ -15,18 +30,83 @@ class MLflowClientError(BaseClientError):
         super().__init__(message, raw_response)
 
 
-class MLflowClient(BaseClient):
+class MLflowAPIMixin:
     """
-    Client for interacting with MLflow Tracking Server.
+    Request building, response parsing and caching shared by the sync and async MLflow clients.
     """
 
-    def __init__(self) -> None:
-        super().__init__(
-            base_uri=settings.MLFLOW_TRACKING_URI, error_class=MLflowClientError
-        )
-        self.session.headers.update(
-            {"Content-Type": "application/json", "User-agent": "PenroseML API"}
-        )
+    upstream = "mlflow"
+
+    cache: Union[TTLCache, SharedTTLCache]
+    # Successful lookups per model name, so the hottest models can be kept warm.
+    popularity: Counter
+    # Names counted in `popularity`; past twice as many, the least requested are dropped.
+    POPULARITY_SIZE = 1000
+    # Bumped by every invalidation; responses requested before it are not cached.
+    generation: int
+    # Whether the response being parsed may be cached; parsing is synchronous,
+    # so it is set right before.
+    _storing: bool
+
+    def _init_cache(self) -> None:
+        if settings.MLFLOW_CACHE_PATH:
+            self.cache = SharedTTLCache(
+                settings.MLFLOW_CACHE_PATH,
+                max_entries=settings.MLFLOW_CACHE_MAX_ENTRIES,
+                max_bytes=settings.MLFLOW_CACHE_MAX_BYTES,
+            )
+        else:
+            self.cache = TTLCache(
+                max_entries=settings.MLFLOW_CACHE_MAX_ENTRIES,
+                max_bytes=settings.MLFLOW_CACHE_MAX_BYTES,
+            )
+        latest_ttl = settings.MLFLOW_CACHE_TTL_LATEST_VERSION
+        search_ttl = settings.MLFLOW_CACHE_TTL_SEARCH
+        if settings.MLFLOW_WEBHOOK_SECRET:
+            # Webhooks report every registry change, which evicts what it
+            # affects, so entries can live longer. Polling only sees updated
+            # registered models, not alias or tag changes.
+            latest_ttl = search_ttl = settings.MLFLOW_CACHE_TTL_INVALIDATED
+        self.cache_ttls = {
+            "get_registered_models": search_ttl,
+            "get_latest_model_version": latest_ttl,
+            "get_model_versions": search_ttl,
+            "get_model_version": settings.MLFLOW_CACHE_TTL_MODEL_VERSION,
+        }
+        self.popularity = Counter()
+        self.generation = 0
+        self._storing = True
+
+    def count_lookup(self, params: dict) -> None:
+        """
+        Count a successful lookup towards its model's popularity.
+
+        Args:
+            params (dict): Query parameters of the lookup.
+        """
+        if params.get("name"):
+            self.popularity[params["name"]] += 1
+            if len(self.popularity) > 2 * self.POPULARITY_SIZE:
+                self.trim_popularity()
+
+    def trim_popularity(self) -> None:
+        """
+        Keep the counts of the most requested models only.
+        """
+        size = max(self.POPULARITY_SIZE, settings.MLFLOW_PREWARM_TOP_N)
+        if len(self.popularity) > size:
+            kept = self.popularity.most_common(size)
+            self.popularity.clear()
+            self.popularity.update(dict(kept))
+
+    def stats(self) -> dict:
+        """
+        Get client counters for monitoring.
+
+        Returns:
+            dict: Retry, circuit breaker and response cache counters.
+        """
+        return {**super().stats(), "cache": self.cache.stats()}
 
     @staticmethod
     def _parse_response(model: dict) -> dict:
@@ -48,12 +128,190 @@ class MLflowClient(BaseClient):
             "source": model.get("source"),
         }
 
+    @staticmethod
+    def _registered_models_params(
+        max_results: int,
+        order_by: Optional[List[str]],
+        filter: Optional[str],
+        page_token: Optional[str],
+    ) -> dict:
+        # Prepare params dictionary and filter out empty values
+        return {
+            "max_results": max_results,
+            **({"order_by": ",".join(order_by)} if order_by else {}),
+            **({"filter": filter} if filter else {}),
+            **({"page_token": page_token} if page_token else {}),
+        }
+
+    @staticmethod
+    def _model_versions_params(
+        filter: str,
+        max_results: int,
+        order_by: Optional[List[str]],
+        page_token: Optional[str],
+    ) -> dict:
+        # Prepare params dictionary and filter out empty values
+        return {
+            "max_results": max_results,
+            "filter": filter,
+            **({"order_by": ",".join(order_by)} if order_by else {}),
+            **({"page_token": page_token} if page_token else {}),
+        }
+
+    @staticmethod
+    def _newest_version(versions: List[dict]) -> Optional[dict]:
+        return max(versions, key=lambda v: int(v.get("version") or 0), default=None)
+
+    def _latest_version_request(
+        self, name: str, stage: Optional[str], alias: Optional[str]
+    ) -> Tuple[str, dict, Callable[[dict], dict]]:
+        """
+        Choose the cheapest MLflow call resolving the latest version of a model.
+
+        Args:
+            name (str): The name of the model.
+            stage (Optional[str]): Only consider versions in this stage.
+            alias (Optional[str]): Resolve the version this alias points to.
+
+        Returns:
+            Tuple[str, dict, Callable[[dict], dict]]: Endpoint path, query params and response parser.
+        """
+        if alias:
+            return (
+                MODEL_VERSION_BY_ALIAS_PATH,
+                {"name": name, "alias": alias},
+                self._parse_model_version,
+            )
+        if stage:
+            return (
+                LATEST_VERSIONS_PATH,
+                {"name": name, "stages": stage},
+                self._parse_latest_model_version,
+            )
+        return REGISTERED_MODEL_PATH, {"name": name}, self._parse_registered_model
+
+    def _remember_latest_version(self, model: dict) -> None:
+        """
+        Index the newest version of a registered model returned by a search, so a
+        following latest-version lookup for it is answered without a round trip.
+
+        Args:
+            model (dict): A registered model including its `latest_versions`.
+        """
+        newest = self._newest_version(model.get("latest_versions", []))
+        if newest is not None and self._storing:
+            self.cache.set(
+                make_cache_key("get_latest_model_version", {"name": model.get("name")}),
+                self._parse_response(newest),
+                self.cache_ttls["get_latest_model_version"],
+            )
+
+    def _parse_registered_models(self, response_data: dict) -> dict:
+        registered_models = []
+        for model in response_data.get("registered_models", []):
+            self._remember_latest_version(model)
+            registered_models.extend(
+                self._parse_response(version)
+                for version in model.get("latest_versions", [])
+            )
+
+        return {
+            "models": registered_models,
+            "page_token": response_data.get("next_page_token"),
+        }
+
+    def _parse_registered_model(self, response_data: dict) -> dict:
+        # `latest_versions` holds the newest version of every stage, so its maximum
+        # is the newest version overall; aliases can only point at existing
+        # versions and never add a newer one.
+        model = response_data.get("registered_model", {})
+        newest = self._newest_version(model.get("latest_versions", []))
+        return self._parse_response(newest) if newest else {}
+
+    def _parse_latest_model_version(self, response_data: dict) -> dict:
+        newest = self._newest_version(response_data.get("model_versions", []))
+        return self._parse_response(newest) if newest else {}
+
+    def _parse_model_versions(self, response_data: dict) -> dict:
+        model_versions = [
+            self._parse_response(version_info)
+            for version_info in response_data.get("model_versions", [])
+        ]
+
+        return {
+            "models": model_versions,
+            "page_token": response_data.get("next_page_token"),
+        }
+
+    def _parse_model_version(self, response_data: dict) -> dict:
+        return self._parse_response(response_data.get("model_version", {}))
+
+
+class MLflowClient(MLflowAPIMixin, BaseClient):
+    """
+    Client for interacting with MLflow Tracking Server.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(
+            base_uri=settings.MLFLOW_TRACKING_URI,
+            error_class=MLflowClientError,
+            timeout=settings.MLFLOW_TIMEOUT,
+        )
+        self.session.headers.update(MLFLOW_HEADERS)
+        self._init_cache()
+
+    def close(self) -> None:
+        """
+        Close the underlying session and the connection to a shared response cache.
+        """
+        super().close()
+        if isinstance(self.cache, SharedTTLCache):
+            self.cache.close()
+
+    def _fetch(
+        self,
+        operation: str,
+        path: str,
+        params: dict,
+        parse: Callable[[dict], dict],
+        refresh: bool = False,
+    ) -> dict:
+        """
+        Fetch and parse an MLflow GET endpoint, going through the response cache.
+
+        Args:
+            operation (str): Name of the client operation, used for keys and TTLs.
+            path (str): API endpoint path.
+            params (dict): Query parameters.
+            parse (Callable[[dict], dict]): Parser for the JSON response body.
+            refresh (bool): Skip the cached value and store a fresh one.
+
+        Returns:
+            dict: The parsed response.
+        """
+        key = make_cache_key(operation, params)
+        if not refresh:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.count_lookup(params)
+                return cached
+        response = self.perform_request("get", path, params=params)
+        with timed_phase("parse"):
+            result = parse(response.json())
+        self.cache.set(key, result, self.cache_ttls[operation])
+        # Refreshes, such as the pre-warmer's, do not count as demand.
+        if not refresh:
+            self.count_lookup(params)
+        return result
+
     def get_registered_models(
         self,
         max_results: int = 10,
         order_by: Optional[List[str]] = None,
         filter: Optional[str] = None,
         page_token: Optional[str] = None,
+        refresh: bool = False,
     ) -> dict:
         """
         Get registered models from MLflow server.
@@ -63,54 +321,46 @@ class MLflowClient(BaseClient):
             order_by (Optional[List[str]]): List of columns for ordering search results.
             filter (Optional[str]): String filter condition.
             page_token (Optional[str]): Token for pagination to retrieve next page of results.
+            refresh (bool): Bypass the response cache.
 
         Returns:
             dict: Dictionary containing registered models information, including page token and more indicator.
         """
-        # Prepare params dictionary and filter out empty values
-        params = {
-            "max_results": max_results,
-            **({"order_by": ",".join(order_by)} if order_by else {}),
-            **({"filter": filter} if filter else {}),
-            **({"page_token": page_token} if page_token else {}),
-        }
-
-        response = self.perform_request(
-            "get", "/api/2.0/mlflow/registered-models/search", params=params
+        params = self._registered_models_params(
+            max_results, order_by, filter, page_token
+        )
+        return self._fetch(
+            "get_registered_models",
+            REGISTERED_MODELS_SEARCH_PATH,
+            params,
+            self._parse_registered_models,
+            refresh,
         )
-        response_data = response.json()
-
-        registered_models = [
-            self._parse_response(version)
-            for model in response_data.get("registered_models", [])
-            for version in model.get("latest_versions", [])
-        ]
-
-        return {
-            "models": registered_models,
-            "page_token": response_data.get("next_page_token"),
-        }
 
-    def get_latest_model_version(self, name: str) -> dict:
+    def get_latest_model_version(
+        self,
+        name: str,
+        stage: Optional[str] = None,
+        alias: Optional[str] = None,
+        refresh: bool = False,
+    ) -> dict:
         """
         Fetches the latest version of a registered model by its name from the MLflow server.
 
+        Without a stage or alias this is the highest version number of the model,
+        answered from a preceding registered models search when possible.
+
         Args:
             name (str): The name of the model to fetch.
+            stage (Optional[str]): Only consider versions in this stage.
+            alias (Optional[str]): Return the version this alias points to.
+            refresh (bool): Bypass the response cache.
 
         Returns:
             dict: A dictionary containing details of the latest model version.
         """
-        params = {"name": name}
-
-        response = self.perform_request(
-            "get",
-            "/api/2.0/mlflow/registered-models/get-latest-versions",
-            params=params,
-        )
-
-        models = response.json().get("model_versions", [])
-        return self._parse_response(models[0]) if models else {}
+        path, params, parse = self._latest_version_request(name, stage, alias)
+        return self._fetch("get_latest_model_version", path, params, parse, refresh)
 
     def get_model_versions(
         self,
@@ -118,6 +368,7 @@ class MLflowClient(BaseClient):
         max_results: int = 10,
         order_by: Optional[List[str]] = None,
         page_token: Optional[str] = None,
+        refresh: bool = False,
     ) -> dict:
         """
         Search for model versions in MLflow server based on filter conditions.
@@ -127,48 +378,340 @@ class MLflowClient(BaseClient):
             max_results (int): Maximum number of results to retrieve.
             order_by (Optional[List[str]]): Columns to order the search results by.
             page_token (Optional[str]): Token for pagination.
+            refresh (bool): Bypass the response cache.
 
         Returns:
             dict: Dictionary containing model versions information.
         """
-        # Prepare params dictionary and filter out empty values
-        params = {
-            "max_results": max_results,
-            "filter": filter,
-            **({"order_by": ",".join(order_by)} if order_by else {}),
-            **({"page_token": page_token} if page_token else {}),
-        }
+        params = self._model_versions_params(filter, max_results, order_by, page_token)
+        return self._fetch(
+            "get_model_versions",
+            MODEL_VERSIONS_SEARCH_PATH,
+            params,
+            self._parse_model_versions,
+            refresh,
+        )
 
-        response = self.perform_request(
-            "get", "/api/2.0/mlflow/model-versions/search", params=params
+    def get_model_version(self, name: str, version: str, refresh: bool = False) -> dict:
+        """
+        Retrieves a specific model version by its name and version number from the MLflow server.
+
+        Args:
+            name (str): The name of the model.
+            version (str): The version of the model.
+            refresh (bool): Bypass the response cache.
+
+        Returns:
+            dict: A dictionary containing model version information.
+        """
+        return self._fetch(
+            "get_model_version",
+            MODEL_VERSION_PATH,
+            {"name": name, "version": version},
+            self._parse_model_version,
+            refresh,
         )
-        response_data = response.json()
 
-        model_versions = [
-            self._parse_response(version_info)
-            for version_info in response_data.get("model_versions", [])
-        ]
 
-        return {
-            "models": model_versions,
-            "page_token": response_data.get("next_page_token"),
-        }
+class AsyncMLflowClient(MLflowAPIMixin, AsyncBaseClient):
+    """
+    Asynchronous client for interacting with MLflow Tracking Server.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(
+            base_uri=settings.MLFLOW_TRACKING_URI,
+            error_class=MLflowClientError,
+            timeout=settings.MLFLOW_TIMEOUT,
+        )
+        self.session.headers.update(MLFLOW_HEADERS)
+        self._init_cache()
+        self.singleflight = SingleFlight()
+
+    def stats(self) -> dict:
+        """
+        Get client counters for monitoring.
+
+        Returns:
+            dict: Retry, circuit breaker, response cache and request coalescing counters.
+        """
+        return {**super().stats(), "singleflight": self.singleflight.stats()}
+
+    async def invalidate_matching(self, predicate: Callable[[CacheKey], bool]) -> int:
+        """
+        Evict the cached responses whose key matches a predicate.
+
+        Responses requested before the eviction may predate the change behind
+        it, so they are returned but not cached. The generation changes right
+        away, on the event loop; the eviction runs in the threadpool, since a
+        shared cache scans every entry and may wait for another worker's write.
 
-    def get_model_version(self, name: str, version: str) -> dict:
+        Args:
+            predicate (Callable[[CacheKey], bool]): Selects the keys to evict.
+
+        Returns:
+            int: Number of entries evicted.
+        """
+        self.generation += 1
+        return await run_in_threadpool(self.cache.invalidate_matching, predicate)
+
+    async def close(self) -> None:
+        """
+        Close the underlying session and the connection to a shared response cache.
+        """
+        await super().close()
+        if isinstance(self.cache, SharedTTLCache):
+            self.cache.close()
+
+    async def _fetch(
+        self,
+        operation: str,
+        path: str,
+        params: dict,
+        parse: Callable[[dict], dict],
+        refresh: bool = False,
+    ) -> dict:
+        """
+        Fetch and parse an MLflow GET endpoint through the response cache,
+        coalescing concurrent identical requests.
+
+        Args:
+            operation (str): Name of the client operation, used for keys and TTLs.
+            path (str): API endpoint path.
+            params (dict): Query parameters.
+            parse (Callable[[dict], dict]): Parser for the JSON response body.
+            refresh (bool): Skip the cached value and store a fresh one.
+
+        Returns:
+            dict: The parsed response.
+        """
+        key = make_cache_key(operation, params)
+        if not refresh:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.count_lookup(params)
+                return cached
+
+        generation = self.generation
+
+        async def fetch() -> dict:
+            response = await self.perform_request("get", path, params=params)
+            self._storing = self.generation == generation
+            try:
+                with timed_phase("parse"):
+                    result = parse(response.json())
+            finally:
+                storing, self._storing = self._storing, True
+            if storing:
+                self.cache.set(key, result, self.cache_ttls[operation])
+            return result
+
+        # Identical concurrent misses share a single upstream request; one
+        # requested after an invalidation never joins a request made before it.
+        result = await self.singleflight.do((key, generation), fetch)
+        # Refreshes, such as the pre-warmer's, do not count as demand.
+        if not refresh:
+            self.count_lookup(params)
+        return result
+
+    async def get_registered_models(
+        self,
+        max_results: int = 10,
+        order_by: Optional[List[str]] = None,
+        filter: Optional[str] = None,
+        page_token: Optional[str] = None,
+        refresh: bool = False,
+    ) -> dict:
+        """
+        Get registered models from MLflow server.
+
+        Args:
+            max_results (int): Maximum number of results to retrieve (default is 10).
+            order_by (Optional[List[str]]): List of columns for ordering search results.
+            filter (Optional[str]): String filter condition.
+            page_token (Optional[str]): Token for pagination to retrieve next page of results.
+            refresh (bool): Bypass the response cache.
+
+        Returns:
+            dict: Dictionary containing registered models information, including page token and more indicator.
+        """
+        params = self._registered_models_params(
+            max_results, order_by, filter, page_token
+        )
+        return await self._fetch(
+            "get_registered_models",
+            REGISTERED_MODELS_SEARCH_PATH,
+            params,
+            self._parse_registered_models,
+            refresh,
+        )
+
+    async def get_latest_model_version(
+        self,
+        name: str,
+        stage: Optional[str] = None,
+        alias: Optional[str] = None,
+        refresh: bool = False,
+    ) -> dict:
+        """
+        Fetches the latest version of a registered model by its name from the MLflow server.
+
+        Without a stage or alias this is the highest version number of the model,
+        answered from a preceding registered models search when possible.
+
+        Args:
+            name (str): The name of the model to fetch.
+            stage (Optional[str]): Only consider versions in this stage.
+            alias (Optional[str]): Return the version this alias points to.
+            refresh (bool): Bypass the response cache.
+
+        Returns:
+            dict: A dictionary containing details of the latest model version.
+        """
+        path, params, parse = self._latest_version_request(name, stage, alias)
+        return await self._fetch(
+            "get_latest_model_version", path, params, parse, refresh
+        )
+
+    async def get_model_versions(
+        self,
+        filter: str,
+        max_results: int = 10,
+        order_by: Optional[List[str]] = None,
+        page_token: Optional[str] = None,
+        refresh: bool = False,
+    ) -> dict:
+        """
+        Search for model versions in MLflow server based on filter conditions.
+
+        Args:
+            filter (str): Filter condition for the search.
+            max_results (int): Maximum number of results to retrieve.
+            order_by (Optional[List[str]]): Columns to order the search results by.
+            page_token (Optional[str]): Token for pagination.
+            refresh (bool): Bypass the response cache.
+
+        Returns:
+            dict: Dictionary containing model versions information.
+        """
+        params = self._model_versions_params(filter, max_results, order_by, page_token)
+        return await self._fetch(
+            "get_model_versions",
+            MODEL_VERSIONS_SEARCH_PATH,
+            params,
+            self._parse_model_versions,
+            refresh,
+        )
+
+    async def get_model_version(
+        self, name: str, version: str, refresh: bool = False
+    ) -> dict:
         """
         Retrieves a specific model version by its name and version number from the MLflow server.
 
         Args:
             name (str): The name of the model.
             version (str): The version of the model.
+            refresh (bool): Bypass the response cache.
 
         Returns:
             dict: A dictionary containing model version information.
         """
-        params = {"name": name, "version": version}
+        return await self._fetch(
+            "get_model_version",
+            MODEL_VERSION_PATH,
+            {"name": name, "version": version},
+            self._parse_model_version,
+            refresh,
+        )
+
+    async def iter_model_version_pages(
+        self,
+        filter: Optional[str] = None,
+        page_size: Optional[int] = None,
+        order_by: Optional[List[str]] = None,
+    ) -> AsyncIterator[List[dict]]:
+        """
+        Walk every page of a model version search, bypassing the response cache.
+
+        The next page is requested as soon as the current one is yielded, so the
+        upstream round trip overlaps with the caller's processing while at most
+        two pages are held in memory.
+
+        Args:
+            filter (Optional[str]): Filter condition for the search.
+            page_size (Optional[int]): Results per upstream page (defaults to MLFLOW_EXPORT_PAGE_SIZE).
+            order_by (Optional[List[str]]): Columns to order the search results by.
 
-        response = self.perform_request(
-            "get", "/api/2.0/mlflow/model-versions/get", params=params
+        Yields:
+            List[dict]: Parsed model versions of one page.
+        """
+        params = self._model_versions_params(
+            filter, page_size or settings.MLFLOW_EXPORT_PAGE_SIZE, order_by, None
         )
 
-        return self._parse_response(response.json().get("model_version", {}))
+        async def fetch_page(page_token: Optional[str]) -> dict:
+            page_params = {
+                **params,
+                **({"page_token": page_token} if page_token else {}),
+            }
+            response = await self.perform_request(
+                "get", MODEL_VERSIONS_SEARCH_PATH, params=page_params
+            )
+            return response.json()
+
+        next_page = asyncio.ensure_future(fetch_page(None))
+        try:
+            while next_page is not None:
+                page = await next_page
+                page_token = page.get("next_page_token")
+                next_page = (
+                    asyncio.ensure_future(fetch_page(page_token))
+                    if page_token
+                    else None
+                )
+                yield self._parse_model_versions(page)["models"]
+        finally:
+            if next_page is not None and not next_page.done():
+                next_page.cancel()
+
+    async def get_model_version_batch(
+        self,
+        versions: Iterable[Tuple[str, int]],
+        concurrency: Optional[int] = None,
+    ) -> List[dict]:
+        """
+        Retrieves many model versions concurrently, one result per distinct (name, version) pair.
+
+        Lookups go through the response cache and request coalescing, at most
+        `concurrency` of them are in flight at once, and a failed lookup is
+        reported in its own result instead of failing the batch.
+
+        Args:
+            versions (Iterable[Tuple[str, int]]): The (name, version) pairs to retrieve.
+            concurrency (Optional[int]): Maximum concurrent lookups (defaults to MLFLOW_BATCH_CONCURRENCY).
+
+        Returns:
+            List[dict]: Results in first-seen order, each with either `model` or `error` set.
+        """
+        semaphore = asyncio.Semaphore(concurrency or settings.MLFLOW_BATCH_CONCURRENCY)
+
+        async def resolve(name: str, version: int) -> dict:
+            result = {"name": name, "version": version}
+            async with semaphore:
+                try:
+                    model = await self.get_model_version(name=name, version=version)
+                except MLflowClientError as e:
+                    raw_response = e.raw_response
+                    return {
+                        **result,
+                        "error": e.message,
+                        "status_code": raw_response.status_code
+                        if raw_response is not None
+                        else None,
+                    }
+            return {**result, "model": model}
+
+        return await asyncio.gather(
+            *(resolve(name, version) for name, version in dict.fromkeys(versions))
+        )
@@ -0,0 +1,228 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, FrozenSet, Optional
+
+from httpx import ConnectError, ConnectTimeout, HTTPError, Response
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def parse_retry_after(response: Optional[Response], now: float) -> Optional[float]:
+    """
+    Parse the Retry-After header of a response into a delay in seconds.
+
+    Args:
+        response (Optional[Response]): The HTTP response.
+        now (float): Current UNIX time, used for HTTP-date values.
+
+    Returns:
+        Optional[float]: The delay in seconds, or None if absent or invalid.
+    """
+    value = response.headers.get("retry-after") if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - now)
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """
+    Decides whether and when a failed request is retried.
+
+    Idempotent methods are retried on transport errors and on 429/5xx
+    responses. Other methods are only retried when the request cannot have
+    been processed: connection failures and 429 responses.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int,
+        backoff_base: float,
+        backoff_max: float,
+        retryable_statuses: FrozenSet[int] = RETRYABLE_STATUSES,
+        rng: Callable[[float, float], float] = random.uniform,
+    ) -> None:
+        """
+        Initialize RetryPolicy.
+
+        Args:
+            max_attempts (int): Maximum attempts per request, including the first one.
+            backoff_base (float): Backoff of the first retry in seconds, doubled on each retry.
+            backoff_max (float): Upper bound of a single delay, also for Retry-After.
+            retryable_statuses (FrozenSet[int]): Status codes worth retrying.
+            rng (Callable[[float, float], float]): Source of jitter.
+        """
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retryable_statuses = retryable_statuses
+        self.rng = rng
+
+    def is_upstream_failure(
+        self, error: Optional[HTTPError], response: Optional[Response]
+    ) -> bool:
+        """
+        Check whether an outcome indicates an unhealthy upstream.
+
+        Args:
+            error (Optional[HTTPError]): The error raised by the request, if any.
+            response (Optional[Response]): The HTTP response, if one was received.
+
+        Returns:
+            bool: True for transport errors and retryable status codes.
+        """
+        if response is None:
+            return error is not None
+        return response.status_code in self.retryable_statuses
+
+    def next_delay(
+        self,
+        method: str,
+        attempt: int,
+        error: HTTPError,
+        response: Optional[Response],
+    ) -> Optional[float]:
+        """
+        Compute the delay before retrying a failed request.
+
+        Args:
+            method (str): HTTP method of the request.
+            attempt (int): Number of attempts made so far.
+            error (HTTPError): The error raised by the request.
+            response (Optional[Response]): The HTTP response, if one was received.
+
+        Returns:
+            Optional[float]: Seconds to wait before retrying, or None to give up.
+        """
+        if attempt >= self.max_attempts:
+            return None
+        if not self.is_upstream_failure(error, response):
+            return None
+        if method.upper() not in IDEMPOTENT_METHODS:
+            never_processed = isinstance(error, (ConnectError, ConnectTimeout)) or (
+                response is not None and response.status_code == 429
+            )
+            if not never_processed:
+                return None
+
+        retry_after = parse_retry_after(response, time.time())
+        if retry_after is not None:
+            return retry_after if retry_after <= self.backoff_max else None
+        # Full jitter: spread retries of concurrent callers over the whole window.
+        return self.rng(
+            0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        )
+
+
+class CircuitBreaker:
+    """
+    Fails fast while an upstream keeps failing.
+
+    The breaker opens after `failure_threshold` consecutive failures. Once
+    `recovery_timeout` has passed it lets a single probe request through
+    (half-open); the probe's outcome closes or reopens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        recovery_timeout: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize CircuitBreaker.
+
+        Args:
+            failure_threshold (int): Consecutive failures that open the breaker; 0 disables it.
+            recovery_timeout (float): Seconds to stay open before probing.
+            clock (Callable[[], float]): Monotonic clock.
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened = 0
+        self.rejected = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._probe_started = 0.0
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a request may be sent to the upstream.
+
+        Returns:
+            bool: False while the breaker is open or a half-open probe is in flight.
+        """
+        with self._lock:
+            if self.state == self.OPEN:
+                if self.clock() - self._opened_at < self.recovery_timeout:
+                    self.rejected += 1
+                    return False
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN:
+                # A probe that never reported back (e.g. a cancelled request)
+                # is given up on after another recovery timeout.
+                now = self.clock()
+                if self._probing and now - self._probe_started < self.recovery_timeout:
+                    self.rejected += 1
+                    return False
+                self._probing = True
+                self._probe_started = now
+            return True
+
+    def record_success(self) -> None:
+        """
+        Record a request that reached a healthy upstream.
+        """
+        with self._lock:
+            self.consecutive_failures = 0
+            self._probing = False
+            self.state = self.CLOSED
+
+    def record_failure(self) -> None:
+        """
+        Record a request that failed because of the upstream.
+        """
+        with self._lock:
+            self.consecutive_failures += 1
+            self._probing = False
+            if self.failure_threshold <= 0:
+                return
+            if (
+                self.state == self.HALF_OPEN
+                or self.consecutive_failures >= self.failure_threshold
+            ):
+                if self.state != self.OPEN:
+                    self.opened += 1
+                self.state = self.OPEN
+                self._opened_at = self.clock()
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Get breaker state and counters.
+
+        Returns:
+            Dict[str, object]: Current state, consecutive failures, times opened and rejected requests.
+        """
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
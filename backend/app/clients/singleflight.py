@@ -0,0 +1,67 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent identical async calls.
+
+    The first caller for a key starts the call; callers arriving while it is in
+    flight wait for the same result or error instead of starting their own.
+    The shared call runs in its own task, so a cancelled caller does not cancel
+    it for the others.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize SingleFlight.
+        """
+        self.executed = 0
+        self.coalesced = 0
+        self._calls: Dict[Hashable, "asyncio.Task[Any]"] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run fn once for all concurrent callers with the same key.
+
+        Args:
+            key (Hashable): Identity of the call.
+            fn (Callable[[], Awaitable[T]]): Coroutine factory performing the call.
+
+        Returns:
+            T: The result of the shared call.
+
+        Raises:
+            Exception: Whatever the shared call raised.
+        """
+        task = self._calls.get(key)
+        if task is None:
+            self.executed += 1
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get coalescing counters.
+
+        Returns:
+            Dict[str, int]: Executed and coalesced call counts and calls in flight.
+        """
+        return {
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._calls),
+        }
+
+    def _forget(self, key: Hashable, task: "asyncio.Task[Any]") -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every caller went away.
+            task.exception()
@@ -1,7 +1,13 @@
 import json
-from typing import Annotated, Any, Dict
-
-from pydantic import AnyUrl, BeforeValidator, PostgresDsn, computed_field
+from typing import Annotated, Any, Dict, Optional
+
+from pydantic import (
+    AnyUrl,
+    BeforeValidator,
+    PostgresDsn,
+    PrivateAttr,
+    computed_field,
+)
 from pydantic_core import MultiHostUrl
 from pydantic_settings import BaseSettings
 
@@ -61,9 +67,120 @@ class Settings(BaseSettings):
     ] = []
 
     MLFLOW_TRACKING_URI: str
+    MLFLOW_TIMEOUT: float = 10.0
+
+    MLFLOW_CACHE_MAX_ENTRIES: int = 2048
+    MLFLOW_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    # SQLite file shared by the server workers of a host, e.g. on /dev/shm;
+    # None keeps a cache per process.
+    MLFLOW_CACHE_PATH: Optional[str] = None
+    # Snapshot of registered model pages and pinned versions restored on startup.
+    MLFLOW_CACHE_SNAPSHOT_PATH: Optional[str] = None
+    MLFLOW_CACHE_SNAPSHOT_INTERVAL: float = 60.0
+    # Keeps the latest version of the most requested models fresh; 0 disables it.
+    MLFLOW_PREWARM_TOP_N: int = 0
+    MLFLOW_PREWARM_INTERVAL: float = 8.0
+    # Registry change events, from signed webhooks or polling, evict the cached
+    # entries of the changed model. With webhooks, latest and search results use
+    # the longer MLFLOW_CACHE_TTL_INVALIDATED; polling misses alias and tag
+    # changes, so it keeps their usual TTLs. Under app.server, the worker a
+    # webhook reaches, or the primary one that polls, passes each change on to
+    # the others.
+    MLFLOW_WEBHOOK_SECRET: Optional[str] = None
+    MLFLOW_WEBHOOK_MAX_AGE: float = 300.0
+    # Seconds between polls for changed registered models; 0 disables polling.
+    MLFLOW_CHANGE_POLL_INTERVAL: float = 0.0
+    MLFLOW_CACHE_TTL_INVALIDATED: float = 300.0
+
+    # Server-sent catalog change events, fed by the webhooks or the change poller.
+    CATALOG_EVENTS_BUFFER_SIZE: int = 1000
+    CATALOG_EVENTS_QUEUE_SIZE: int = 100
+    CATALOG_EVENTS_MAX_SUBSCRIBERS: int = 1000
+    CATALOG_EVENTS_HEARTBEAT: float = 15.0
+    # Seconds between exchanges of changes between server workers.
+    CATALOG_EVENTS_FANOUT_INTERVAL: float = 1.0
+    # Pinned model versions are effectively immutable; latest/search results are not.
+    MLFLOW_CACHE_TTL_MODEL_VERSION: float = 3600.0
+    MLFLOW_CACHE_TTL_LATEST_VERSION: float = 10.0
+    MLFLOW_CACHE_TTL_SEARCH: float = 10.0
+    MLFLOW_EXPORT_PAGE_SIZE: int = 1000
+    MLFLOW_BATCH_MAX_ITEMS: int = 500
+    MLFLOW_BATCH_CONCURRENCY: int = 16
+
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    # HTTP/2 requires the optional ``h2`` package (``httpx[http2]``).
+    HTTP2_ENABLED: bool = False
+    HTTP_TIMEOUT: float = 10.0
+    HTTP_CONNECT_TIMEOUT: float = 3.0
+    HTTP_RETRY_MAX_ATTEMPTS: int = 3
+    HTTP_RETRY_BACKOFF_BASE: float = 0.2
+    HTTP_RETRY_BACKOFF_MAX: float = 5.0
+
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_BREAKER_RECOVERY_TIMEOUT: float = 30.0
 
     GITLAB_BASE_URI: str
     GITLAB_ACCESS_TOKEN: str
+    GITLAB_TIMEOUT: float = 30.0
+
+    GITOPS_COMMIT_DEBOUNCE: float = 2.0
+    GITOPS_COMMIT_MAX_ACTIONS: int = 500
+    GITOPS_COMMIT_CONFLICT_RETRIES: int = 3
+    # Seconds a branch's blob SHAs are trusted before the tree is listed again.
+    GITOPS_TREE_TTL: float = 300.0
+
+    YAML_RENDER_CACHE_SIZE: int = 16384
+    # Processes rendering fleet manifests; None uses one per CPU.
+    FLEET_RENDER_WORKERS: Optional[int] = None
+    FLEET_CHUNK_SIZE: int = 250
+    FLEET_RENDER_WINDOW: int = 4
+    FLEET_MAX_VERSIONS: int = 20000
+
+    # Profiles every request; otherwise only requests carrying PROFILING_TOKEN.
+    PROFILING_ENABLED: bool = False
+    PROFILING_TOKEN: Optional[str] = None
+    PROFILING_THRESHOLD: float = 0.5
+    PROFILING_BUFFER_SIZE: int = 20
+    PROFILING_TOP_FUNCTIONS: int = 40
+
+    # Serves catalog reads from a Postgres mirror of the MLflow registry, synced
+    # by the primary server worker.
+    CATALOG_MIRROR_ENABLED: bool = False
+    CATALOG_MIRROR_SYNC_INTERVAL: float = 30.0
+    CATALOG_MIRROR_FULL_SYNC_INTERVAL: float = 3600.0
+    # Seconds since the last sync after which reads go to MLflow again.
+    CATALOG_MIRROR_MAX_LAG: float = 120.0
+    CATALOG_MIRROR_POOL_SIZE: int = 4
+    CATALOG_MIRROR_PAGE_SIZE: int = 1000
+
+    # Keeps an in-memory index of every model version for tag and name searches;
+    # each server worker builds its own, so it costs one listing per worker.
+    CATALOG_INDEX_ENABLED: bool = False
+    CATALOG_INDEX_REFRESH_INTERVAL: float = 300.0
+    CATALOG_INDEX_MAX_RESULTS: int = 1000
+
+    # Production server (app.server); None workers uses one per available CPU.
+    SERVER_WORKERS: Optional[int] = None
+    SERVER_BACKLOG: int = 2048
+    SERVER_KEEP_ALIVE: int = 5
+    # Seconds a stopping worker waits for in-flight requests before closing them.
+    SERVER_GRACEFUL_TIMEOUT: int = 30
+    SERVER_READY_TIMEOUT: float = 60.0
+    # Recycles a worker after this many requests; None never does.
+    SERVER_MAX_REQUESTS: Optional[int] = None
+    # Threads per worker running blocking work (run_in_threadpool, sync endpoints).
+    THREADPOOL_SIZE: int = 40
+    # Whether this process runs the background jobs needed once per server, like
+    # the catalog mirror sync; app.server sets it in one worker only.
+    SERVER_PRIMARY: bool = True
+    # Directory app.server creates for its workers to share state, such as their
+    # metrics; None when the process serves alone.
+    SERVER_SHARED_DIR: Optional[str] = None
+    # Seconds between writes of a worker's metrics to the shared directory; a
+    # worker that crashes loses the counts of its last interval.
+    METRICS_WRITE_INTERVAL: float = 10.0
 
     KSERVE_SERVICE_ACCOUNT: str
 
@@ -99,11 +216,15 @@ class Settings(BaseSettings):
             path=self.POSTGRES_DB,
         )
 
+    _server_types: Dict[str, Dict[str, str]] = PrivateAttr(default_factory=dict)
+
+    def model_post_init(self, __context: Any) -> None:
+        # Resolved once: resources look their server type up on every render.
+        self._server_types = {**self.DEFAULT_SERVER_TYPES, **self.CUSTOM_SERVER_TYPES}
+
     @property
     def SERVER_TYPES(self) -> Dict[str, Dict[str, str]]:
-        server_types = self.DEFAULT_SERVER_TYPES.copy()
-        server_types.update(self.CUSTOM_SERVER_TYPES)
-        return server_types
+        return self._server_types
 
 
 settings = Settings()
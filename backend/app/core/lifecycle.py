@@ -0,0 +1,42 @@
+"""
+Callbacks run as soon as the server starts shutting down.
+
+uvicorn waits for open connections before it runs the lifespan shutdown, so
+a long-lived response such as an event stream would hold a stopping worker
+until the graceful timeout. Callbacks registered here run first, when the
+server stops accepting connections, and let such responses end on their own.
+app.server runs them; under plain uvicorn only the lifespan shutdown runs.
+"""
+
+import logging
+from typing import Callable, List
+
+logger = logging.getLogger("uvicorn.error")
+
+_callbacks: List[Callable[[], None]] = []
+
+
+def on_shutdown(callback: Callable[[], None]) -> None:
+    """
+    Register a callback for the start of the shutdown.
+
+    Args:
+        callback (Callable[[], None]): Called on the event loop, without arguments.
+    """
+    _callbacks.append(callback)
+
+
+def remove_shutdown(callback: Callable[[], None]) -> None:
+    if callback in _callbacks:
+        _callbacks.remove(callback)
+
+
+def shutting_down() -> None:
+    """
+    Run the registered callbacks, logging the ones that fail.
+    """
+    for callback in list(_callbacks):
+        try:
+            callback()
+        except Exception:
+            logger.exception("Shutdown callback %r failed.", callback)
@@ -0,0 +1,519 @@
+import bisect
+import fcntl
+import math
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+import orjson
+
+# Upper bounds in seconds, from a cache hit to a slow upstream call.
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+Labels = Tuple[str, ...]
+Sample = Tuple[str, Dict[str, str], float]
+MetricType = TypeVar("MetricType", bound="Metric")
+
+
+def format_value(value: float) -> str:
+    """
+    Format a sample value as the Prometheus text format expects it.
+
+    Args:
+        value (float): The sample value.
+
+    Returns:
+        str: The formatted value.
+    """
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+def escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_sample(name: str, labels: Dict[str, str], value: float) -> str:
+    """
+    Format a single sample line.
+
+    Args:
+        name (str): The sample name.
+        labels (Dict[str, str]): The sample labels.
+        value (float): The sample value.
+
+    Returns:
+        str: The sample in the Prometheus text exposition format.
+    """
+    if labels:
+        label_text = ",".join(
+            f'{key}="{escape_label(str(value))}"' for key, value in labels.items()
+        )
+        return f"{name}{{{label_text}}} {format_value(value)}"
+    return f"{name} {format_value(value)}"
+
+
+class Metric:
+    """
+    A metric family with a fixed set of label names.
+    """
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """
+        Initialize Metric.
+
+        Args:
+            name (str): The metric name.
+            documentation (str): The HELP text.
+            labelnames (Sequence[str]): Names of the labels; keep their values bounded.
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def samples(self) -> Iterable[Sample]:
+        raise NotImplementedError
+
+    def values(self) -> Dict[Labels, Any]:
+        raise NotImplementedError
+
+    def merge(self, labels: Labels, value: Any) -> None:
+        """
+        Fold in the value another process holds for a label set.
+
+        Args:
+            labels (Labels): The label values.
+            value (Any): The value, as `values` returns it.
+        """
+        raise NotImplementedError
+
+    def dump(self) -> dict:
+        """
+        Describe the family and its values for another process to merge.
+
+        Returns:
+            dict: The family, loadable with `load_metric`.
+        """
+        return {
+            "type": self.type_name,
+            "name": self.name,
+            "documentation": self.documentation,
+            "labelnames": self.labelnames,
+            "values": list(self.values().items()),
+        }
+
+    def render(self) -> str:
+        """
+        Render the metric family in the Prometheus text exposition format.
+
+        Returns:
+            str: HELP and TYPE lines followed by every sample.
+        """
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        lines.extend(format_sample(*sample) for sample in self.samples())
+        return "\n".join(lines) + "\n"
+
+    def _labels(self, values: Labels) -> Dict[str, str]:
+        return dict(zip(self.labelnames, values))
+
+
+class Counter(Metric):
+    """
+    A monotonically increasing count.
+    """
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def values(self) -> Dict[Labels, float]:
+        with self._lock:
+            return dict(self._values)
+
+    def merge(self, labels: Labels, value: float) -> None:
+        self.inc(*labels, amount=value)
+
+    def samples(self) -> Iterable[Sample]:
+        return [
+            (self.name, self._labels(key), value)
+            for key, value in self.values().items()
+        ]
+
+
+class Gauge(Metric):
+    """
+    A value that goes up and down, set directly or read from a callback at scrape time.
+    """
+
+    type_name = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        callback: Optional[Callable[[], Dict[Labels, float]]] = None,
+        multiprocess: str = "sum",
+    ):
+        """
+        Initialize Gauge.
+
+        Args:
+            name (str): The metric name.
+            documentation (str): The HELP text.
+            labelnames (Sequence[str]): Names of the labels.
+            callback (Optional[Callable[[], Dict[Labels, float]]]): Reads the values, keyed by label values.
+            multiprocess (str): How the values of several processes combine, "sum" or "max".
+        """
+        super().__init__(name, documentation, labelnames)
+        if multiprocess not in ("sum", "max"):
+            raise ValueError(f"unknown multiprocess mode {multiprocess!r}")
+        self.callback = callback
+        self.multiprocess = multiprocess
+        self._values: Dict[Labels, float] = {}
+
+    def set(self, value: float, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+    def values(self) -> Dict[Labels, float]:
+        if self.callback is not None:
+            return dict(self.callback())
+        with self._lock:
+            return dict(self._values)
+
+    def merge(self, labels: Labels, value: float) -> None:
+        with self._lock:
+            current = self._values.get(labels)
+            if current is None:
+                self._values[labels] = value
+            elif self.multiprocess == "max":
+                self._values[labels] = max(current, value)
+            else:
+                self._values[labels] = current + value
+
+    def dump(self) -> dict:
+        return {**super().dump(), "multiprocess": self.multiprocess}
+
+    def samples(self) -> Iterable[Sample]:
+        return [
+            (self.name, self._labels(key), value)
+            for key, value in self.values().items()
+        ]
+
+
+class Histogram(Metric):
+    """
+    Observations counted into cumulative buckets.
+    """
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        """
+        Initialize Histogram.
+
+        Args:
+            name (str): The metric name.
+            documentation (str): The HELP text.
+            labelnames (Sequence[str]): Names of the labels.
+            buckets (Sequence[float]): Upper bounds of the buckets, ascending.
+        """
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        # Per label set: a count per bucket (plus +Inf), the sum and the count.
+        self._values: Dict[Labels, List[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(labels)
+            if series is None:
+                series = self._values[labels] = [0.0] * (len(self.buckets) + 3)
+            series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def values(self) -> Dict[Labels, List[float]]:
+        with self._lock:
+            return {key: list(series) for key, series in self._values.items()}
+
+    def merge(self, labels: Labels, value: List[float]) -> None:
+        with self._lock:
+            series = self._values.get(labels)
+            if series is None:
+                self._values[labels] = list(value)
+            else:
+                for index, count in enumerate(value):
+                    series[index] += count
+
+    def dump(self) -> dict:
+        return {**super().dump(), "buckets": self.buckets}
+
+    def samples(self) -> Iterable[Sample]:
+        samples = []
+        for key, series in self.values().items():
+            labels = self._labels(key)
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (math.inf,), series):
+                cumulative += count
+                samples.append(
+                    (
+                        f"{self.name}_bucket",
+                        {**labels, "le": format_value(bound)},
+                        cumulative,
+                    )
+                )
+            samples.append((f"{self.name}_sum", labels, series[-2]))
+            samples.append((f"{self.name}_count", labels, series[-1]))
+        return samples
+
+
+class Registry:
+    """
+    The metric families exposed on /metrics.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: MetricType) -> MetricType:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def collect(self) -> List[Metric]:
+        with self._lock:
+            return list(self._metrics.values())
+
+    def render(self, extra: Iterable[Metric] = ()) -> str:
+        """
+        Render every registered metric family.
+
+        Args:
+            extra (Iterable[Metric]): Families collected at scrape time, rendered after the registered ones.
+
+        Returns:
+            str: The Prometheus text exposition of the registry.
+        """
+        return render([*self.collect(), *extra])
+
+
+def render(metrics: Iterable[Metric]) -> str:
+    return "".join(metric.render() for metric in metrics)
+
+
+def load_metric(family: dict) -> Metric:
+    """
+    Rebuild a metric family dumped by another process.
+
+    Args:
+        family (dict): The family, as `Metric.dump` describes it.
+
+    Returns:
+        Metric: The family with its values.
+    """
+    metric: Metric
+    args = (family["name"], family["documentation"], family["labelnames"])
+    if family["type"] == Counter.type_name:
+        metric = Counter(*args)
+    elif family["type"] == Gauge.type_name:
+        metric = Gauge(*args, multiprocess=family["multiprocess"])
+    elif family["type"] == Histogram.type_name:
+        metric = Histogram(*args, buckets=family["buckets"])
+    else:
+        raise ValueError(f"unknown metric type {family['type']!r}")
+    for labels, value in family["values"]:
+        metric.merge(tuple(labels), value)
+    return metric
+
+
+def merge_metrics(families: Iterable[dict]) -> List[Metric]:
+    """
+    Combine the families dumped by several processes.
+
+    Counters and histograms add up; gauges add up or keep the maximum, as
+    their `multiprocess` mode says.
+
+    Args:
+        families (Iterable[dict]): Dumped families, several per name.
+
+    Returns:
+        List[Metric]: One family per name, in order of first appearance.
+    """
+    merged: Dict[str, Metric] = {}
+    for family in families:
+        metric = merged.get(family["name"])
+        if metric is None:
+            merged[family["name"]] = load_metric(family)
+        else:
+            for labels, value in family["values"]:
+                metric.merge(tuple(labels), value)
+    return list(merged.values())
+
+
+# Counters of exited processes, kept so that totals never go down.
+RETIRED_METRICS = "retired.json"
+
+
+@contextmanager
+def _locked(directory: str, operation: int) -> Iterator[None]:
+    with open(os.path.join(directory, ".lock"), "a") as lock:
+        fcntl.flock(lock, operation)
+        yield
+
+
+def _read_families(path: str) -> List[dict]:
+    try:
+        with open(path, "rb") as dumped:
+            return orjson.loads(dumped.read())
+    except FileNotFoundError:
+        return []
+
+
+def _write_families(path: str, families: Iterable[dict]) -> None:
+    # A temporary file per write, so concurrent writes of one process never share it.
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as dumped:
+            dumped.write(orjson.dumps(list(families)))
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def write_process_metrics(directory: str, pid: int, metrics: Iterable[Metric]) -> None:
+    """
+    Write a process's metric families for the other processes to merge.
+
+    Args:
+        directory (str): Directory shared by the processes.
+        pid (int): The process whose families these are.
+        metrics (Iterable[Metric]): Its families.
+    """
+    _write_families(
+        os.path.join(directory, f"{pid}.json"), [metric.dump() for metric in metrics]
+    )
+
+
+def collect_process_metrics(directory: str) -> List[Metric]:
+    """
+    Merge the families written by every process, running or exited.
+
+    Args:
+        directory (str): Directory shared by the processes.
+
+    Returns:
+        List[Metric]: The merged families.
+    """
+    families: List[dict] = []
+    with _locked(directory, fcntl.LOCK_SH):
+        for entry in sorted(os.listdir(directory)):
+            if entry.endswith(".json"):
+                families.extend(_read_families(os.path.join(directory, entry)))
+    return merge_metrics(families)
+
+
+def retire_process_metrics(directory: str, pid: int) -> None:
+    """
+    Fold an exited process's counters and histograms into the retired ones and drop its gauges.
+
+    Args:
+        directory (str): Directory shared by the processes.
+        pid (int): The exited process.
+    """
+    path = os.path.join(directory, f"{pid}.json")
+    retired = os.path.join(directory, RETIRED_METRICS)
+    with _locked(directory, fcntl.LOCK_EX):
+        families = _read_families(path)
+        if not families:
+            return
+        kept = [family for family in families if family["type"] != Gauge.type_name]
+        merged = merge_metrics([*_read_families(retired), *kept])
+        _write_families(retired, [metric.dump() for metric in merged])
+        os.unlink(path)
+
+
+registry = Registry()
+
+HTTP_REQUEST_DURATION = registry.register(
+    Histogram(
+        "formenos_http_request_duration_seconds",
+        "Time spent handling HTTP requests, by route template.",
+        ("method", "route", "status"),
+    )
+)
+UPSTREAM_REQUEST_DURATION = registry.register(
+    Histogram(
+        "formenos_upstream_request_duration_seconds",
+        "Time spent on upstream HTTP calls, including retries.",
+        ("upstream", "method", "outcome"),
+    )
+)
+RESPONSE_SERIALIZATION_DURATION = registry.register(
+    Histogram(
+        "formenos_response_serialization_seconds",
+        "Time spent encoding response bodies.",
+        ("response",),
+        buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.1),
+    )
+)
+CATALOG_MIRROR_READS = registry.register(
+    Counter(
+        "formenos_catalog_mirror_reads_total",
+        "Catalog reads by whether the mirror served them or they went to MLflow.",
+        ("operation", "result"),
+    )
+)
@@ -0,0 +1,166 @@
+import cProfile
+import io
+import itertools
+import pstats
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Deque, Dict, Iterator, List, Optional
+
+from app.core.config import settings
+
+# Phase durations of the current request in seconds; None when it is not timed.
+_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar(
+    "request_timings", default=None
+)
+
+
+def start_timings() -> Token:
+    """
+    Start timing the phases of the current request.
+
+    Returns:
+        Token: Token to pass to stop_timings().
+    """
+    return _timings.set({})
+
+
+def stop_timings(token: Token) -> None:
+    _timings.reset(token)
+
+
+def current_timings() -> Optional[Dict[str, float]]:
+    return _timings.get()
+
+
+def record_phase(name: str, seconds: float) -> None:
+    """
+    Add time spent in a phase to the current request, if it is being timed.
+
+    Args:
+        name (str): The phase, e.g. `upstream` or `serialize`.
+        seconds (float): Time spent.
+    """
+    timings = _timings.get()
+    if timings is not None:
+        timings[name] = timings.get(name, 0.0) + seconds
+
+
+@contextmanager
+def timed_phase(name: str) -> Iterator[None]:
+    """
+    Time a block as a phase of the current request.
+
+    Args:
+        name (str): The phase.
+    """
+    if _timings.get() is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(name, time.perf_counter() - started)
+
+
+def server_timing(timings: Dict[str, float], total: float) -> str:
+    """
+    Format phase durations as a Server-Timing header value.
+
+    Args:
+        timings (Dict[str, float]): Phase durations in seconds.
+        total (float): Total request duration in seconds.
+
+    Returns:
+        str: The header value, durations in milliseconds.
+    """
+    metrics = [*timings.items(), ("total", total)]
+    return ", ".join(f"{name};dur={seconds * 1000:.2f}" for name, seconds in metrics)
+
+
+class ProfileStore:
+    """
+    Ring buffer of the most recent slow request profiles.
+    """
+
+    def __init__(self, max_profiles: Optional[int] = None) -> None:
+        """
+        Initialize ProfileStore.
+
+        Args:
+            max_profiles (Optional[int]): Profiles to keep (defaults to PROFILING_BUFFER_SIZE).
+        """
+        self._profiles: Deque[dict] = deque(
+            maxlen=max_profiles or settings.PROFILING_BUFFER_SIZE
+        )
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def add(
+        self,
+        profiler: cProfile.Profile,
+        method: str,
+        path: str,
+        status_code: int,
+        duration: float,
+        timings: Dict[str, float],
+    ) -> dict:
+        """
+        Store the profile of a slow request.
+
+        Args:
+            profiler (cProfile.Profile): The profiler that ran during the request.
+            method (str): HTTP method of the request.
+            path (str): Path of the request.
+            status_code (int): Status code of the response.
+            duration (float): Request duration in seconds.
+            timings (Dict[str, float]): Phase durations in seconds.
+
+        Returns:
+            dict: The stored profile.
+        """
+        stream = io.StringIO()
+        stats = pstats.Stats(profiler, stream=stream)
+        stats.sort_stats("cumulative").print_stats(settings.PROFILING_TOP_FUNCTIONS)
+        with self._lock:
+            profile = {
+                "id": next(self._ids),
+                "timestamp": time.time(),
+                "method": method,
+                "path": path,
+                "status_code": status_code,
+                "duration_ms": round(duration * 1000, 2),
+                "timings_ms": {
+                    name: round(seconds * 1000, 2) for name, seconds in timings.items()
+                },
+                "profile": stream.getvalue(),
+            }
+            self._profiles.append(profile)
+        return profile
+
+    def list(self) -> List[dict]:
+        """
+        List the stored profiles, newest first, without their call statistics.
+
+        Returns:
+            List[dict]: Profile summaries.
+        """
+        with self._lock:
+            profiles = list(self._profiles)
+        return [
+            {key: value for key, value in profile.items() if key != "profile"}
+            for profile in reversed(profiles)
+        ]
+
+    def get(self, profile_id: int) -> Optional[dict]:
+        with self._lock:
+            for profile in self._profiles:
+                if profile["id"] == profile_id:
+                    return profile
+        return None
+
+
+profile_store = ProfileStore()
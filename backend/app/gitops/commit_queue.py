@@ -0,0 +1,329 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple
+
+from app.clients.gitlab import GitLabClient, GitLabClientError
+from app.core.config import settings
+from app.gitops.manifest_index import ManifestIndex, git_blob_sha
+
+BatchKey = Tuple[str, str]
+
+# GitLab answers 400 with one of these when a create/update action does not
+# match the state of the branch, e.g. after a concurrent commit moved its head.
+FILE_CONFLICT_MESSAGES = (
+    "A file with this name already exists",
+    "A file with this name doesn't exist",
+)
+
+
+def squash_action(previous: Optional[dict], action: dict) -> Optional[dict]:
+    """
+    Merge a new action on a file path with the action already queued for it.
+
+    Args:
+        previous (Optional[dict]): The queued action for the same file path, if any.
+        action (dict): The new action.
+
+    Returns:
+        Optional[dict]: The single equivalent action, or None if they cancel out.
+    """
+    if previous is None:
+        return action
+    before, after = previous["action"], action["action"]
+    if before == "create" and after == "delete":
+        return None
+    if before == "create" and after == "update":
+        return {**action, "action": "create"}
+    if before == "delete" and after == "create":
+        return {**action, "action": "update"}
+    return action
+
+
+def is_branch_conflict(error: GitLabClientError) -> bool:
+    """
+    Check whether a failed commit conflicts with the current branch state.
+
+    Args:
+        error (GitLabClientError): The error raised by the commit.
+
+    Returns:
+        bool: True for 409 responses and create/update mismatches.
+    """
+    response = error.raw_response
+    if response is None:
+        return False
+    if response.status_code == 409:
+        return True
+    return response.status_code == 400 and any(
+        message in response.text for message in FILE_CONFLICT_MESSAGES
+    )
+
+
+class CommitBatch:
+    """
+    Actions and callers waiting to be committed to one branch of one project.
+    """
+
+    def __init__(self) -> None:
+        self.actions: "OrderedDict[str, Optional[dict]]" = OrderedDict()
+        self.messages: List[str] = []
+        self.futures: List[Future] = []
+        self.timer: Optional[threading.Timer] = None
+
+    def add(
+        self, actions: List[dict], commit_message: str, future: Optional[Future] = None
+    ) -> None:
+        for action in actions:
+            path = action["file_path"]
+            self.actions[path] = squash_action(self.actions.get(path), action)
+        if commit_message not in self.messages:
+            self.messages.append(commit_message)
+        if future is not None:
+            self.futures.append(future)
+
+    def pending_actions(self) -> List[dict]:
+        return [action for action in self.actions.values() if action is not None]
+
+    def commit_message(self) -> str:
+        if len(self.messages) == 1:
+            return self.messages[0]
+        return f"Apply {len(self.messages)} changes\n\n" + "\n".join(
+            f"- {message}" for message in self.messages
+        )
+
+
+class CommitQueue:
+    """
+    Collects GitOps changes and commits them to GitLab in batches.
+
+    Changes submitted for the same (project, branch) within the debounce window
+    are merged into a single multi-action commit. Repeated writes to a file
+    path are squashed, so only its final content is committed. Every caller
+    receives a Future resolved with the GitLab commit that contains its change.
+    """
+
+    def __init__(
+        self,
+        gitlab_client: GitLabClient,
+        debounce: Optional[float] = None,
+        max_actions: Optional[int] = None,
+        conflict_retries: Optional[int] = None,
+        manifest_index: Optional[ManifestIndex] = None,
+    ) -> None:
+        """
+        Initialize CommitQueue.
+
+        Args:
+            gitlab_client (GitLabClient): Client used to create the commits.
+            debounce (Optional[float]): Seconds to gather changes (defaults to GITOPS_COMMIT_DEBOUNCE).
+            max_actions (Optional[int]): Actions that trigger an immediate commit (defaults to GITOPS_COMMIT_MAX_ACTIONS).
+            conflict_retries (Optional[int]): Retries after a branch conflict (defaults to GITOPS_COMMIT_CONFLICT_RETRIES).
+            manifest_index (Optional[ManifestIndex]): Index kept current with the commits made.
+        """
+        self.gitlab_client = gitlab_client
+        self.debounce = (
+            settings.GITOPS_COMMIT_DEBOUNCE if debounce is None else debounce
+        )
+        self.max_actions = max_actions or settings.GITOPS_COMMIT_MAX_ACTIONS
+        self.conflict_retries = (
+            settings.GITOPS_COMMIT_CONFLICT_RETRIES
+            if conflict_retries is None
+            else conflict_retries
+        )
+        self.manifest_index = manifest_index
+        self.commits = 0
+        self.submitted = 0
+        self.conflicts = 0
+        self._batches: Dict[BatchKey, CommitBatch] = {}
+        self._lock = threading.Lock()
+
+    def submit(
+        self, project_id: str, branch: str, commit_message: str, actions: List[dict]
+    ) -> Future:
+        """
+        Queue actions for the next commit to a branch.
+
+        Never blocks on GitLab, so it can be called from the event loop;
+        async callers await the result with asyncio.wrap_future.
+
+        Args:
+            project_id (str): The ID of the GitLab project.
+            branch (str): The branch name to commit to.
+            commit_message (str): Description of the change.
+            actions (List[dict]): GitLab commit actions.
+
+        Returns:
+            Future: Resolved with the GitLab commit, or None if the batch ended up empty.
+        """
+        future: Future = Future()
+        key = (project_id, branch)
+        with self._lock:
+            self.submitted += 1
+            batch = self._batches.get(key)
+            if batch is None:
+                batch = self._batches[key] = CommitBatch()
+                batch.timer = threading.Timer(self.debounce, self.flush, key)
+                batch.timer.daemon = True
+                batch.timer.start()
+            batch.add(actions, commit_message, future)
+            if len(batch.actions) >= self.max_actions:
+                # Commit on the timer thread right away, never in the caller,
+                # which may be running the event loop.
+                batch.timer.cancel()
+                batch.timer = threading.Timer(0, self.flush, key)
+                batch.timer.daemon = True
+                batch.timer.start()
+        return future
+
+    def flush(self, project_id: str, branch: str) -> None:
+        """
+        Commit the queued actions of a branch right away.
+
+        Args:
+            project_id (str): The ID of the GitLab project.
+            branch (str): The branch name.
+        """
+        with self._lock:
+            batch = self._batches.pop((project_id, branch), None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+
+        # A submitter that went away (e.g. a disconnected client) cancelled its
+        # future; its actions are still committed, but nobody gets the result.
+        futures = [
+            future for future in batch.futures if future.set_running_or_notify_cancel()
+        ]
+        try:
+            commit = self._commit(project_id, branch, batch)
+        except Exception as e:
+            for future in futures:
+                future.set_exception(e)
+        else:
+            for future in futures:
+                future.set_result(commit)
+
+    def commit(
+        self, project_id: str, branch: str, commit_message: str, actions: List[dict]
+    ) -> Optional[dict]:
+        """
+        Commit actions right away as one commit, however many there are.
+
+        Unlike submit(), this skips the debounce window and the action limit,
+        e.g. for regenerating a whole fleet, but still squashes the actions and
+        retries branch conflicts.
+
+        Args:
+            project_id (str): The ID of the GitLab project.
+            branch (str): The branch name to commit to.
+            commit_message (str): The commit message.
+            actions (List[dict]): GitLab commit actions.
+
+        Returns:
+            Optional[dict]: The GitLab commit, or None if there was nothing to commit.
+        """
+        batch = CommitBatch()
+        batch.add(actions, commit_message)
+        with self._lock:
+            self.submitted += 1
+        return self._commit(project_id, branch, batch)
+
+    def close(self) -> None:
+        """
+        Commit everything still queued.
+        """
+        with self._lock:
+            keys = list(self._batches)
+        for key in keys:
+            self.flush(*key)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get queue counters.
+
+        Returns:
+            Dict[str, int]: Submitted changes, commits made, conflicts retried and pending batches.
+        """
+        return {
+            "submitted": self.submitted,
+            "commits": self.commits,
+            "conflicts": self.conflicts,
+            "pending_batches": len(self._batches),
+        }
+
+    def _commit(
+        self, project_id: str, branch: str, batch: CommitBatch
+    ) -> Optional[dict]:
+        actions = batch.pending_actions()
+        if not actions:
+            return None
+        attempt = 0
+        while True:
+            try:
+                commit = self.gitlab_client.perform_commit(
+                    project_id, branch, batch.commit_message(), actions
+                )
+            except GitLabClientError as e:
+                if attempt >= self.conflict_retries or not is_branch_conflict(e):
+                    raise
+                attempt += 1
+                self.conflicts += 1
+                if self.manifest_index is not None:
+                    self.manifest_index.invalidate(project_id, branch)
+                time.sleep(settings.HTTP_RETRY_BACKOFF_BASE * attempt)
+                actions = self._rebase_actions(project_id, branch, actions)
+                if not actions:
+                    return None
+                continue
+            self.commits += 1
+            if self.manifest_index is not None:
+                self.manifest_index.record(project_id, branch, actions)
+            return commit
+
+    def _rebase_actions(
+        self, project_id: str, branch: str, actions: List[dict]
+    ) -> List[dict]:
+        """
+        Re-derive create/update actions from the current branch head.
+
+        Args:
+            project_id (str): The ID of the GitLab project.
+            branch (str): The branch name.
+            actions (List[dict]): Actions of the conflicting commit.
+
+        Returns:
+            List[dict]: Actions matching the files present on the branch; deletes
+            of files that are already gone are dropped.
+        """
+        # With an index, one tree listing replaces a request per file and also
+        # drops writes that a concurrent commit has already made.
+        blobs = (
+            self.manifest_index.blobs(project_id, branch, refresh=True)
+            if self.manifest_index is not None
+            else None
+        )
+        rebased = []
+        for action in actions:
+            if action["action"] not in ("create", "update", "delete"):
+                rebased.append(action)
+                continue
+            path = action["file_path"]
+            if blobs is None:
+                exists = self.gitlab_client.file_exists(project_id, path, branch)
+            else:
+                exists = path in blobs
+                if (
+                    action["action"] != "delete"
+                    and exists
+                    and blobs[path] == git_blob_sha(action.get("content", ""))
+                ):
+                    continue
+            if action["action"] == "delete":
+                if exists:
+                    rebased.append(action)
+            else:
+                rebased.append({**action, "action": "update" if exists else "create"})
+        return rebased
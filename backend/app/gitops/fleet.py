@@ -0,0 +1,195 @@
+import asyncio
+import re
+from collections import deque
+from concurrent.futures import Executor
+from typing import AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from app.clients.mlflow import AsyncMLflowClient
+from app.core.config import settings
+from app.kubernetes.kserve_resource import InferenceServiceResource
+
+# Kubernetes object names are DNS-1123 labels.
+MAX_SERVICE_NAME_LENGTH = 63
+
+Document = Tuple[str, str]
+
+
+def service_name(model_name: str, version: str) -> str:
+    """
+    Derive the InferenceService name of a model version.
+
+    Args:
+        model_name (str): The registered model name.
+        version (str): The model version.
+
+    Returns:
+        str: A DNS-1123 compliant name. Model names that differ only in case
+        or punctuation, or share their first 60 characters, get the same name;
+        FleetRenderer reports such collisions.
+    """
+    suffix = f"-v{version}"
+    slug = re.sub(r"[^a-z0-9-]+", "-", model_name.lower()).strip("-") or "model"
+    return slug[: MAX_SERVICE_NAME_LENGTH - len(suffix)].rstrip("-") + suffix
+
+
+def fleet_resource(
+    model: dict, instance_type: str, service_account: Optional[str] = None
+) -> InferenceServiceResource:
+    """
+    Build the InferenceService of a model version parsed by the MLflow client.
+
+    Args:
+        model (dict): The parsed model version.
+        instance_type (str): The server type to deploy on.
+        service_account (Optional[str]): Service account (defaults to KSERVE_SERVICE_ACCOUNT).
+
+    Returns:
+        InferenceServiceResource: The resource serving the model version.
+    """
+    return InferenceServiceResource(
+        name=service_name(model["name"], str(model["version"])),
+        service_account=service_account or settings.KSERVE_SERVICE_ACCOUNT,
+        storage_uri=model["source"],
+        instance_type=instance_type,
+    )
+
+
+def render_documents(resources: List[InferenceServiceResource]) -> List[Document]:
+    """
+    Render resources to YAML; runs in the render process pool.
+
+    Args:
+        resources (List[InferenceServiceResource]): The resources to render.
+
+    Returns:
+        List[Document]: (name, YAML document) pairs in input order.
+    """
+    return [(resource.name, resource.to_yaml()) for resource in resources]
+
+
+async def iter_fleet_models(
+    mlflow_client: AsyncMLflowClient,
+    filter: Optional[str] = None,
+    versions: Optional[List[Tuple[str, int]]] = None,
+    chunk_size: Optional[int] = None,
+) -> AsyncIterator[Tuple[List[dict], List[dict]]]:
+    """
+    Resolve the model versions of a fleet in bounded chunks.
+
+    Args:
+        mlflow_client (AsyncMLflowClient): Client used to resolve the versions.
+        filter (Optional[str]): Model version search filter.
+        versions (Optional[List[Tuple[str, int]]]): Explicit (name, version) pairs, used instead of the filter.
+        chunk_size (Optional[int]): Versions resolved per chunk (defaults to FLEET_CHUNK_SIZE).
+
+    Yields:
+        Tuple[List[dict], List[dict]]: Parsed model versions and failed lookups of one chunk.
+    """
+    chunk_size = chunk_size or settings.FLEET_CHUNK_SIZE
+    if versions is None:
+        async for page in mlflow_client.iter_model_version_pages(
+            filter=filter, page_size=chunk_size
+        ):
+            yield page, []
+        return
+
+    for start in range(0, len(versions), chunk_size):
+        results = await mlflow_client.get_model_version_batch(
+            versions[start : start + chunk_size]
+        )
+        yield (
+            [result["model"] for result in results if "model" in result],
+            [result for result in results if "model" not in result],
+        )
+
+
+class FleetRenderer:
+    """
+    Renders the manifests of a fleet in a process pool with bounded memory.
+
+    At most `window` chunks are rendering at once, and chunks are yielded in
+    resolution order as soon as they are done, so the stream starts before
+    the whole fleet has been resolved. A model version whose service name is
+    already taken by another model is not rendered but listed in `collisions`,
+    so it never overwrites the other's manifest.
+    """
+
+    def __init__(
+        self,
+        executor: Executor,
+        instance_type: str,
+        service_account: Optional[str] = None,
+        window: Optional[int] = None,
+    ) -> None:
+        """
+        Initialize FleetRenderer.
+
+        Args:
+            executor (Executor): Pool the YAML is rendered in.
+            instance_type (str): The server type to deploy on.
+            service_account (Optional[str]): Service account (defaults to KSERVE_SERVICE_ACCOUNT).
+            window (Optional[int]): Chunks rendering at once (defaults to FLEET_RENDER_WINDOW).
+        """
+        self.executor = executor
+        self.instance_type = instance_type
+        self.service_account = service_account
+        self.window = window or settings.FLEET_RENDER_WINDOW
+        self.failed: List[dict] = []
+        self.collisions: List[dict] = []
+        self._services: Dict[str, Tuple[str, str]] = {}
+
+    async def render(
+        self, chunks: AsyncIterator[Tuple[List[dict], List[dict]]]
+    ) -> AsyncIterator[List[Document]]:
+        """
+        Render resolved chunks of model versions.
+
+        Failed lookups are collected in `failed` and service name collisions
+        in `collisions` instead of being rendered.
+
+        Args:
+            chunks (AsyncIterator[Tuple[List[dict], List[dict]]]): Output of iter_fleet_models.
+
+        Yields:
+            List[Document]: (name, YAML document) pairs of one chunk.
+        """
+        loop = asyncio.get_running_loop()
+        pending: Deque[asyncio.Future] = deque()
+        try:
+            async for models, failed in chunks:
+                self.failed.extend(failed)
+                # Identical specs are rendered once.
+                resources = list(dict.fromkeys(self._claim(models)))
+                if resources:
+                    pending.append(
+                        loop.run_in_executor(self.executor, render_documents, resources)
+                    )
+                if len(pending) >= self.window:
+                    yield await pending.popleft()
+            while pending:
+                yield await pending.popleft()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def _claim(self, models: List[dict]) -> List[InferenceServiceResource]:
+        resources = []
+        for model in models:
+            resource = fleet_resource(model, self.instance_type, self.service_account)
+            owner = (model["name"], str(model["version"]))
+            claimed = self._services.setdefault(resource.name, owner)
+            if claimed != owner:
+                self.collisions.append(
+                    {
+                        "name": model["name"],
+                        "version": int(model["version"]),
+                        "error": (
+                            f"service name {resource.name} is already used by "
+                            f"{claimed[0]} version {claimed[1]}"
+                        ),
+                        "status_code": 409,
+                    }
+                )
+                continue
+            resources.append(resource)
+        return resources
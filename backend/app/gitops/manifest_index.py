@@ -0,0 +1,201 @@
+import hashlib
+import threading
+import time
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+from app.clients.gitlab import GitLabClient
+from app.core.config import settings
+from app.kubernetes.base_resource import BaseResource
+
+BranchKey = Tuple[str, str]
+
+
+def git_blob_sha(content: str) -> str:
+    """
+    Compute the Git object ID of a file's content.
+
+    Args:
+        content (str): The file content.
+
+    Returns:
+        str: The SHA-1 Git assigns to the content as a blob.
+    """
+    data = content.encode()
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def render_manifest(resource: BaseResource) -> str:
+    """
+    Render the canonical file content of a resource's manifest.
+
+    Args:
+        resource (BaseResource): The Kubernetes resource.
+
+    Returns:
+        str: The YAML rendering of the resource's to_dict() output.
+    """
+    return resource.to_yaml()
+
+
+class ManifestIndex:
+    """
+    Blob SHAs of the manifests committed to each GitOps branch.
+
+    The index is warmed from a single recursive tree listing per branch and
+    kept current with the commits made through it, so it can tell, without a
+    request per file, whether a manifest is new, changed or already committed.
+    """
+
+    def __init__(
+        self,
+        gitlab_client: GitLabClient,
+        ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize ManifestIndex.
+
+        Args:
+            gitlab_client (GitLabClient): Client used to list repository trees.
+            ttl (Optional[float]): Seconds before a branch is listed again (defaults to GITOPS_TREE_TTL).
+            clock (Callable[[], float]): Monotonic clock.
+        """
+        self.gitlab_client = gitlab_client
+        self.ttl = settings.GITOPS_TREE_TTL if ttl is None else ttl
+        self.clock = clock
+        self.warmups = 0
+        self.unchanged = 0
+        self.changed = 0
+        self._branches: Dict[BranchKey, Tuple[float, Dict[str, str]]] = {}
+        self._lock = threading.Lock()
+
+    def blobs(
+        self, project_id: str, branch: str, refresh: bool = False
+    ) -> Dict[str, str]:
+        """
+        Get the blob SHAs of a branch, listing its tree if needed.
+
+        Args:
+            project_id (str): The ID of the GitLab project.
+            branch (str): The branch name.
+            refresh (bool): Whether to list the tree even if the index is fresh.
+
+        Returns:
+            Dict[str, str]: Git blob SHA of every file, keyed by its path.
+        """
+        key = (project_id, branch)
+        with self._lock:
+            entry = self._branches.get(key)
+            if entry and not refresh and self.clock() - entry[0] < self.ttl:
+                return entry[1]
+
+        blobs = self.gitlab_client.get_tree(project_id, branch)
+        with self._lock:
+            self.warmups += 1
+            self._branches[key] = (self.clock(), blobs)
+        return blobs
+
+    def plan(
+        self,
+        project_id: str,
+        branch: str,
+        manifests: Mapping[str, BaseResource],
+    ) -> List[dict]:
+        """
+        Build the commit actions for manifests that differ from the branch.
+
+        Args:
+            project_id (str): The ID of the GitLab project.
+            branch (str): The branch name.
+            manifests (Mapping[str, BaseResource]): Resources keyed by their file path.
+
+        Returns:
+            List[dict]: `create` actions for new files and `update` actions for
+            changed ones; manifests already committed as-is are left out.
+        """
+        return self.plan_documents(
+            project_id,
+            branch,
+            {path: render_manifest(resource) for path, resource in manifests.items()},
+        )
+
+    def plan_documents(
+        self, project_id: str, branch: str, documents: Mapping[str, str]
+    ) -> List[dict]:
+        """
+        Build the commit actions for rendered files that differ from the branch.
+
+        Args:
+            project_id (str): The ID of the GitLab project.
+            branch (str): The branch name.
+            documents (Mapping[str, str]): File contents keyed by their path.
+
+        Returns:
+            List[dict]: `create` and `update` actions for new and changed files.
+        """
+        blobs = self.blobs(project_id, branch)
+        actions = []
+        for file_path, content in documents.items():
+            committed = blobs.get(file_path)
+            if committed == git_blob_sha(content):
+                self.unchanged += 1
+                continue
+            self.changed += 1
+            actions.append(
+                {
+                    "action": "create" if committed is None else "update",
+                    "file_path": file_path,
+                    "content": content,
+                }
+            )
+        return actions
+
+    def record(self, project_id: str, branch: str, actions: List[dict]) -> None:
+        """
+        Apply the actions of a successful commit to the index.
+
+        Args:
+            project_id (str): The ID of the GitLab project.
+            branch (str): The branch the commit was made to.
+            actions (List[dict]): The committed GitLab commit actions.
+        """
+        with self._lock:
+            entry = self._branches.get((project_id, branch))
+            if entry is None:
+                return
+            blobs = dict(entry[1])
+            for action in actions:
+                if action["action"] == "delete":
+                    blobs.pop(action["file_path"], None)
+                elif action["action"] in ("create", "update") and "content" in action:
+                    blobs[action["file_path"]] = git_blob_sha(action["content"])
+                else:
+                    # Moves and chmods are not tracked; list the tree next time.
+                    self._branches.pop((project_id, branch))
+                    return
+            self._branches[(project_id, branch)] = (entry[0], blobs)
+
+    def invalidate(self, project_id: str, branch: str) -> None:
+        """
+        Forget a branch, e.g. after a commit that was made elsewhere.
+
+        Args:
+            project_id (str): The ID of the GitLab project.
+            branch (str): The branch name.
+        """
+        with self._lock:
+            self._branches.pop((project_id, branch), None)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get index counters.
+
+        Returns:
+            Dict[str, int]: Tree listings, unchanged and changed manifests, and indexed branches.
+        """
+        return {
+            "warmups": self.warmups,
+            "unchanged": self.unchanged,
+            "changed": self.changed,
+            "branches": len(self._branches),
+        }
@@ -1,10 +1,12 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from typing import Any, Dict, Iterable
 
-import yaml
+from app.kubernetes.rendering import renderer
 
 
 class BaseResource(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -22,4 +24,17 @@ class BaseResource(ABC):
         Returns:
             str: A YAML string representation of the resource.
         """
-        return yaml.dump(self.to_dict(), sort_keys=False)
+        return renderer.render(self.to_dict())
+
+    @staticmethod
+    def to_yaml_stream(resources: Iterable["BaseResource"]) -> str:
+        """
+        Converts many resources to a single multi-document YAML stream.
+
+        Args:
+            resources (Iterable[BaseResource]): The resources to convert.
+
+        Returns:
+            str: The YAML documents, each starting with `---`.
+        """
+        return renderer.render_all(resource.to_dict() for resource in resources)
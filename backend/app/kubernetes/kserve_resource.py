@@ -1,90 +1,104 @@
-from typing import Dict, Optional
+from dataclasses import dataclass, field
+from typing import Any, ClassVar, Dict, Optional
 
 from app.core.config import settings
 from app.kubernetes.base_resource import BaseResource
 
 
+@dataclass(frozen=True, slots=True)
 class InferenceServiceResource(BaseResource):
-    API_VERSION: str = "serving.kserve.io/v1beta1"
-    KIND: str = "InferenceService"
+    """
+    KServe InferenceService spec.
 
-    def __init__(
-        self,
-        name: str,
-        service_account: str,
-        storage_uri: str,
-        instance_type: str,
-        model_format: str = "mlflow",
-        batcher: bool = False,
-        timeout: int = 60,
-        max_batch_size: int = 32,
-        max_latency: int = 500,
-        autoscaling: bool = False,
-        min_replicas: int = 1,
-        max_replicas: int = 1,
-        logger: bool = False,
-        mode: str = "all",
-        url: Optional[str] = None,
-        prometheus: bool = False,
-        port: str = "8082",
-        path: str = "/metrics",
-        runtime: str = "kserve-mlserver",
-    ) -> None:
-        self.api_version = self.API_VERSION
-        self.kind = self.KIND
-        self.metadata: Dict[str, Dict[str, str]] = {"name": name, "annotations": {}}
-        self.spec: Dict[str, Dict[str, Dict[str, str]]] = {"predictor": {"model": {}}}
+    Instances are immutable and hashable, so identical specs can be deduplicated
+    and used as cache keys. The manifest is only built by to_dict().
+    """
 
-        self.spec["predictor"].update(
-            {
-                "model": {
-                    "modelFormat": {"name": model_format},
-                    "runtime": runtime,
-                    "storageUri": storage_uri,
-                },
-                "serviceAccountName": service_account,
-            }
-        )
+    API_VERSION: ClassVar[str] = "serving.kserve.io/v1beta1"
+    KIND: ClassVar[str] = "InferenceService"
 
-        cpu = settings.SERVER_TYPES[instance_type]["cpu"]
-        memory = settings.SERVER_TYPES[instance_type]["memory"]
-        resources = {
-            "requests": {"cpu": cpu, "memory": memory},
-            "limits": {"cpu": cpu, "memory": memory},
-        }
-        self.spec["predictor"]["model"].update({"resources": resources})
+    name: str
+    service_account: str
+    storage_uri: str
+    instance_type: str
+    model_format: str = "mlflow"
+    batcher: bool = False
+    timeout: int = 60
+    max_batch_size: int = 32
+    max_latency: int = 500
+    autoscaling: bool = False
+    min_replicas: int = 1
+    max_replicas: int = 1
+    logger: bool = False
+    mode: str = "all"
+    url: Optional[str] = None
+    prometheus: bool = False
+    port: str = "8082"
+    path: str = "/metrics"
+    runtime: str = "kserve-mlserver"
+    cpu: str = field(init=False, repr=False, compare=False)
+    memory: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        server_type = settings.SERVER_TYPES[self.instance_type]
+        object.__setattr__(self, "cpu", server_type["cpu"])
+        object.__setattr__(self, "memory", server_type["memory"])
 
-        if batcher:
-            self.spec["predictor"].update(
-                {
-                    "batcher": {
-                        "timeout": timeout,
-                        "maxBatchSize": max_batch_size,
-                        "maxLatency": max_latency,
-                    }
-                }
-            )
+    @property
+    def api_version(self) -> str:
+        return self.API_VERSION
 
-        if logger:
-            self.spec["predictor"].update({"logger": {"mode": mode, "url": url}})
+    @property
+    def kind(self) -> str:
+        return self.KIND
 
-        if autoscaling:
-            self.spec["predictor"].update(
-                {"minReplicas": min_replicas, "maxReplicas": max_replicas}
-            )
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        annotations = (
+            {"serving.kserve.io/enable-prometheus-scraping": "true"}
+            if self.prometheus
+            else {}
+        )
+        return {"name": self.name, "annotations": annotations}
 
-        if prometheus:
-            self.metadata["annotations"].update(
-                {"serving.kserve.io/enable-prometheus-scraping": "true"}
-            )
-            self.spec.setdefault("annotations", {}).update(
-                {"prometheus.kserve.io/port": port, "prometheus.kserve.io/path": path}
-            )
+    @property
+    def spec(self) -> Dict[str, Any]:
+        predictor: Dict[str, Any] = {
+            "model": {
+                "modelFormat": {"name": self.model_format},
+                "runtime": self.runtime,
+                "storageUri": self.storage_uri,
+                "resources": {
+                    "requests": {"cpu": self.cpu, "memory": self.memory},
+                    "limits": {"cpu": self.cpu, "memory": self.memory},
+                },
+            },
+            "serviceAccountName": self.service_account,
+        }
+        if self.batcher:
+            predictor["batcher"] = {
+                "timeout": self.timeout,
+                "maxBatchSize": self.max_batch_size,
+                "maxLatency": self.max_latency,
+            }
+        if self.logger:
+            predictor["logger"] = {"mode": self.mode, "url": self.url}
+        if self.autoscaling:
+            predictor["minReplicas"] = self.min_replicas
+            predictor["maxReplicas"] = self.max_replicas
+
+        spec: Dict[str, Any] = {"predictor": predictor}
+        if self.prometheus:
+            spec["annotations"] = {
+                "prometheus.kserve.io/port": self.port,
+                "prometheus.kserve.io/path": self.path,
+            }
+        return spec
 
     def to_dict(self) -> Dict[str, Dict]:
         return {
-            "apiVersion": self.api_version,
-            "kind": self.kind,
+            "apiVersion": self.API_VERSION,
+            "kind": self.KIND,
             "metadata": self.metadata,
             "spec": self.spec,
         }
@@ -0,0 +1,126 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional
+
+import orjson
+import yaml
+
+from app.core.config import settings
+
+# libyaml emits the same documents as the pure-Python emitter, several times faster.
+YAML_DUMPER = getattr(yaml, "CDumper", yaml.Dumper)
+
+
+def dump_yaml(data: Dict[str, Any]) -> str:
+    """
+    Render a manifest as YAML, keeping the key order of the dictionary.
+
+    Args:
+        data (Dict[str, Any]): The manifest.
+
+    Returns:
+        str: The YAML document.
+    """
+    return yaml.dump(data, Dumper=YAML_DUMPER, sort_keys=False)
+
+
+def manifest_digest(data: Dict[str, Any]) -> bytes:
+    """
+    Hash the canonical form of a manifest.
+
+    Key order is part of the rendered YAML, so it is part of the digest too.
+
+    Args:
+        data (Dict[str, Any]): The manifest.
+
+    Returns:
+        bytes: A 16-byte digest of the manifest.
+    """
+    return hashlib.blake2b(orjson.dumps(data), digest_size=16).digest()
+
+
+class YAMLRenderer:
+    """
+    Renders manifests to YAML, reusing the output of manifests seen before.
+
+    Regenerating a fleet mostly re-renders specs that did not change, and
+    hashing a manifest is much cheaper than emitting it.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None) -> None:
+        """
+        Initialize YAMLRenderer.
+
+        Args:
+            max_entries (Optional[int]): Rendered documents to keep (defaults to YAML_RENDER_CACHE_SIZE).
+        """
+        self.max_entries = (
+            settings.YAML_RENDER_CACHE_SIZE if max_entries is None else max_entries
+        )
+        self.hits = 0
+        self.misses = 0
+        self._documents: "OrderedDict[bytes, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def render(self, data: Dict[str, Any]) -> str:
+        """
+        Render a manifest as a YAML document.
+
+        Args:
+            data (Dict[str, Any]): The manifest.
+
+        Returns:
+            str: The YAML document.
+        """
+        key = manifest_digest(data)
+        with self._lock:
+            document = self._documents.get(key)
+            if document is not None:
+                self._documents.move_to_end(key)
+                self.hits += 1
+                return document
+            self.misses += 1
+
+        document = dump_yaml(data)
+        if self.max_entries > 0:
+            with self._lock:
+                self._documents[key] = document
+                while len(self._documents) > self.max_entries:
+                    self._documents.popitem(last=False)
+        return document
+
+    def render_all(self, manifests: Iterable[Dict[str, Any]]) -> str:
+        """
+        Render manifests as one multi-document YAML stream.
+
+        Args:
+            manifests (Iterable[Dict[str, Any]]): The manifests.
+
+        Returns:
+            str: The YAML documents, each starting with `---`.
+        """
+        return "".join(f"---\n{self.render(data)}" for data in manifests)
+
+    def clear(self) -> None:
+        """
+        Drop all rendered documents.
+        """
+        with self._lock:
+            self._documents.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get renderer counters.
+
+        Returns:
+            Dict[str, int]: Hits, misses and rendered documents kept.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._documents),
+        }
+
+
+renderer = YAMLRenderer()
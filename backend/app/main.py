@@ -1,14 +1,147 @@
+import asyncio
+import contextlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List
+
+from anyio import to_thread
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.api import metrics
 from app.api.api_v1.api import api_router
+from app.api.middleware import MetricsMiddleware, ProfilingMiddleware
+from app.catalog.events import CatalogEventBroker, CatalogEventFanout
+from app.catalog.index import CatalogIndex
+from app.catalog.invalidation import CatalogInvalidator, RegistryChangePoller
+from app.catalog.mirror import CatalogMirror
+from app.catalog.sync import CatalogMirrorSync
+from app.catalog.warm_start import CacheSnapshot, CatalogPreWarmer
+from app.clients.gitlab import GitLabClient
+from app.clients.mlflow import AsyncMLflowClient
+from app.core import lifecycle
 from app.core.config import settings
+from app.gitops.commit_queue import CommitQueue
+from app.gitops.manifest_index import ManifestIndex
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Create the shared upstream clients on startup and close them on shutdown.
+
+    Args:
+        app (FastAPI): The application instance.
+    """
+    to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_SIZE
+    app.state.mlflow_client = AsyncMLflowClient()
+    app.state.gitlab_client = GitLabClient()
+    # Workers are spawned on first use; fork is unsafe with the running threads.
+    app.state.render_pool = ProcessPoolExecutor(
+        max_workers=settings.FLEET_RENDER_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+    app.state.manifest_index = ManifestIndex(app.state.gitlab_client)
+    app.state.commit_queue = CommitQueue(
+        app.state.gitlab_client, manifest_index=app.state.manifest_index
+    )
+    app.state.catalog_events = CatalogEventBroker()
+    # Open streams would otherwise hold a stopping server until its timeout.
+    lifecycle.on_shutdown(app.state.catalog_events.close)
+    app.state.event_fanout = None
+    if settings.SERVER_SHARED_DIR:
+        app.state.event_fanout = CatalogEventFanout()
+        await run_in_threadpool(app.state.event_fanout.open)
+    app.state.catalog_invalidator = CatalogInvalidator(
+        app.state.mlflow_client,
+        on_change=app.state.catalog_events.publish,
+        share=app.state.event_fanout.publish if app.state.event_fanout else None,
+    )
+    app.state.change_poller = None
+    app.state.cache_snapshot = None
+    app.state.prewarmer = None
+    app.state.catalog_mirror = None
+    app.state.catalog_sync = None
+    app.state.catalog_index = None
+    background: List[asyncio.Task] = []
+    # Jobs writing shared state run in the primary worker only; a cache shared
+    # by the workers is also kept warm by that worker alone.
+    primary = settings.SERVER_PRIMARY
+    warms_cache = primary or not settings.MLFLOW_CACHE_PATH
+    if settings.MLFLOW_CACHE_SNAPSHOT_PATH:
+        app.state.cache_snapshot = CacheSnapshot(app.state.mlflow_client)
+        await run_in_threadpool(app.state.cache_snapshot.load)
+        if primary:
+            background.append(asyncio.create_task(app.state.cache_snapshot.run()))
+    if app.state.event_fanout is not None:
+        background.append(
+            asyncio.create_task(
+                app.state.event_fanout.run(app.state.catalog_invalidator)
+            )
+        )
+    # The other workers get the changes the primary one polls through the fan-out.
+    if settings.MLFLOW_CHANGE_POLL_INTERVAL > 0 and primary:
+        app.state.change_poller = RegistryChangePoller(
+            app.state.mlflow_client, app.state.catalog_invalidator
+        )
+        background.append(asyncio.create_task(app.state.change_poller.run()))
+    if settings.MLFLOW_PREWARM_TOP_N > 0 and warms_cache:
+        app.state.prewarmer = CatalogPreWarmer(app.state.mlflow_client)
+        background.append(asyncio.create_task(app.state.prewarmer.run()))
+    if settings.CATALOG_MIRROR_ENABLED:
+        app.state.catalog_mirror = CatalogMirror()
+        await run_in_threadpool(app.state.catalog_mirror.open)
+        app.state.catalog_sync = CatalogMirrorSync(
+            app.state.mlflow_client, app.state.catalog_mirror
+        )
+        background.append(
+            asyncio.create_task(
+                app.state.catalog_sync.run()
+                if primary
+                else app.state.catalog_sync.follow()
+            )
+        )
+    if settings.CATALOG_INDEX_ENABLED:
+        app.state.catalog_index = CatalogIndex(app.state.mlflow_client)
+        background.append(asyncio.create_task(app.state.catalog_index.run()))
+    app.state.metrics_publisher = None
+    if settings.SERVER_SHARED_DIR:
+        app.state.metrics_publisher = metrics.WorkerMetricsPublisher(app.state)
+        background.append(asyncio.create_task(app.state.metrics_publisher.run()))
+    try:
+        yield
+    finally:
+        lifecycle.remove_shutdown(app.state.catalog_events.close)
+        app.state.catalog_events.close()
+        for task in background:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        # Losing the last interval of counts must not stop the shutdown.
+        with contextlib.suppress(OSError):
+            await metrics.write_worker_metrics(app.state)
+        if app.state.event_fanout is not None:
+            # Hands the last detected changes on to the workers still serving.
+            await app.state.event_fanout.exchange(app.state.catalog_invalidator)
+            app.state.event_fanout.close()
+        if app.state.cache_snapshot is not None and primary:
+            await app.state.cache_snapshot.checkpoint()
+        if app.state.catalog_mirror is not None:
+            app.state.catalog_mirror.close()
+        await run_in_threadpool(app.state.commit_queue.close)
+        await app.state.mlflow_client.close()
+        app.state.gitlab_client.close()
+        app.state.render_pool.shutdown(cancel_futures=True)
+
 
 app = FastAPI(
     title="Formenos API",
     description="MLOps Platform, automating model deployment and monitoring.",
     version="0.1.0",
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
 )
 
 if settings.BACKEND_CORS_ORIGINS:
@@ -22,4 +155,8 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_headers=["*"],
     )
 
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
+app.include_router(metrics.router)
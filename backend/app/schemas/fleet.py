@@ -0,0 +1,56 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from app.core.config import settings
+from app.schemas.model_catalog import MLflowModelVersionBatchItem, ModelVersionRef
+
+
+class FleetManifestRequest(BaseModel):
+    """
+    Represents a catalog query whose model versions are turned into InferenceService manifests.
+    Either a model version search filter or an explicit list of versions selects the fleet.
+    """
+
+    filter: Optional[str] = None
+    versions: Optional[List[ModelVersionRef]] = Field(
+        None, min_length=1, max_length=settings.FLEET_MAX_VERSIONS
+    )
+    instance_type: str = "ml.cpu.small"
+    service_account: Optional[str] = None
+
+    @field_validator("instance_type")
+    @classmethod
+    def check_instance_type(cls, v: str) -> str:
+        if v not in settings.SERVER_TYPES:
+            raise ValueError(f"unknown instance type {v!r}")
+        return v
+
+    @model_validator(mode="after")
+    def check_query(self) -> "FleetManifestRequest":
+        if self.filter is not None and self.versions is not None:
+            raise ValueError("specify either a filter or a list of versions, not both")
+        return self
+
+
+class FleetCommitRequest(FleetManifestRequest):
+    """
+    Represents a fleet whose manifests are committed to a GitOps repository in a single commit.
+    """
+
+    project_id: str
+    branch: str
+    directory: str = "inference-services"
+    commit_message: str = "Regenerate fleet manifests"
+
+
+class FleetCommit(BaseModel):
+    """
+    Represents the outcome of committing a fleet, including versions that could not be resolved.
+    """
+
+    commit_id: Optional[str] = None
+    created: int
+    updated: int
+    unchanged: int
+    failed: List[MLflowModelVersionBatchItem]
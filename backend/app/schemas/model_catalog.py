@@ -1,6 +1,8 @@
 from typing import List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+from app.core.config import settings
 
 
 class ModelTag(BaseModel):
@@ -41,3 +43,42 @@ class MLflowRegisteredModels(BaseModel):
 
     models: List[MLflowModelVersion]
     page_token: Optional[str] = None
+
+
+class ModelVersionRef(BaseModel):
+    """
+    Identifies a single model version by model name and version number.
+    """
+
+    name: str
+    version: int
+
+
+class MLflowModelVersionBatchRequest(BaseModel):
+    """
+    Represents a request for many MLflow model versions at once.
+    """
+
+    versions: List[ModelVersionRef] = Field(
+        ..., min_length=1, max_length=settings.MLFLOW_BATCH_MAX_ITEMS
+    )
+
+
+class MLflowModelVersionBatchItem(BaseModel):
+    """
+    Represents the outcome of looking up one model version of a batch, either the model or an error.
+    """
+
+    name: str
+    version: int
+    model: Optional[MLflowModelVersion] = None
+    error: Optional[str] = None
+    status_code: Optional[int] = None
+
+
+class MLflowModelVersionBatch(BaseModel):
+    """
+    Represents the results of a batch lookup, one item per distinct requested version.
+    """
+
+    results: List[MLflowModelVersionBatchItem]
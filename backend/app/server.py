@@ -0,0 +1,354 @@
+"""
+Production server: pre-forked uvicorn workers sharing one listening socket.
+
+The parent imports the application and binds the socket once, then forks
+the workers, so they start from a warm interpreter instead of each
+re-importing the application. Every worker runs its own event loop (uvloop
+and httptools when installed) and its own lifespan, so upstream clients,
+pools and caches are per worker. Each worker also gets its own fleet render
+pool; size FLEET_RENDER_WORKERS so that both fit the cores.
+
+The first worker is the primary (SERVER_PRIMARY): only it runs the
+background jobs a server needs once, such as the catalog mirror sync. Its
+replacements are primary in turn.
+
+The workers share a temporary directory (SERVER_SHARED_DIR, on /dev/shm when
+available) where each writes its metrics, so a scrape of /metrics reports
+the whole server whichever worker answers. The counters of exited workers
+are kept there too, so totals never go down on a restart. The registry
+changes a worker receives by webhook are passed on to the others there.
+
+Signals:
+    SIGHUP: Rolling restart. Each worker is replaced once its replacement
+        serves, and then drains its in-flight requests for up to
+        SERVER_GRACEFUL_TIMEOUT. Replacements fork from the same preloaded
+        parent, so code is not reloaded; restart the server to deploy.
+    SIGTERM, SIGINT: Drain every worker and exit.
+
+A worker that exits is replaced; a worker that fails to start stops the server.
+
+Throughput grows with workers up to the available cores; workers beyond
+them only add memory. To measure the scaling on a host:
+    python -m benchmarks.load_test --workers 1 --output one.json
+    python -m benchmarks.load_test --workers 4 --baseline one.json
+
+Usage:
+    SERVER_WORKERS=4 python -m app.server --host 0.0.0.0 --port 8000 app.main:app
+"""
+
+import argparse
+import logging
+import math
+import os
+import select
+import shutil
+import signal
+import socket
+import sys
+import tempfile
+import time
+import traceback
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+import uvicorn
+from uvicorn.importer import import_from_string
+
+from app.api.metrics import metrics_directory
+from app.core import lifecycle
+from app.core.config import settings
+from app.core.metrics import retire_process_metrics
+
+logger = logging.getLogger("uvicorn.error")
+
+SIGNALS = {signal.SIGCHLD, signal.SIGHUP, signal.SIGINT, signal.SIGTERM}
+# Exit status when a worker cannot start, as uvicorn uses.
+STARTUP_FAILURE = 3
+# Seconds past the graceful timeout before stopping workers are killed.
+KILL_GRACE = 5.0
+
+
+def available_cpus(cgroup_root: str = "/sys/fs/cgroup") -> int:
+    """
+    Count the CPUs this process may use.
+
+    Args:
+        cgroup_root (str): Mount point of the cgroup v2 hierarchy.
+
+    Returns:
+        int: CPUs in the affinity mask, capped by the cgroup CPU quota.
+    """
+    if hasattr(os, "sched_getaffinity"):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count() or 1
+    try:
+        with open(os.path.join(cgroup_root, "cpu.max")) as cpu_max:
+            quota, period = cpu_max.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+class WorkerServer(uvicorn.Server):
+    """
+    A uvicorn server that reports on a pipe once it accepts connections and
+    runs the lifecycle shutdown callbacks as soon as it stops.
+    """
+
+    def __init__(self, config: uvicorn.Config, ready_fd: int) -> None:
+        super().__init__(config)
+        self.ready_fd = ready_fd
+
+    async def startup(self, sockets: Optional[List[socket.socket]] = None) -> None:
+        await super().startup(sockets=sockets)
+        if not self.should_exit:
+            os.write(self.ready_fd, b"1")
+
+    async def shutdown(self, sockets: Optional[List[socket.socket]] = None) -> None:
+        # Before waiting for connections, so long-lived responses can end.
+        lifecycle.shutting_down()
+        await super().shutdown(sockets=sockets)
+
+
+class Supervisor:
+    """
+    Forks the workers from the preloaded parent and keeps them running.
+
+    Workers keep their position in `pids`; the one at position 0 is primary.
+    """
+
+    def __init__(
+        self,
+        config: uvicorn.Config,
+        workers: int,
+        ready_timeout: Optional[float] = None,
+        graceful_timeout: Optional[float] = None,
+    ) -> None:
+        """
+        Initialize Supervisor.
+
+        Args:
+            config (uvicorn.Config): Loaded server configuration shared by the workers.
+            workers (int): Number of worker processes.
+            ready_timeout (Optional[float]): Seconds a worker has to start (defaults to SERVER_READY_TIMEOUT).
+            graceful_timeout (Optional[float]): Seconds a worker has to drain (defaults to SERVER_GRACEFUL_TIMEOUT).
+        """
+        self.config = config
+        self.workers = workers
+        self.ready_timeout = (
+            settings.SERVER_READY_TIMEOUT if ready_timeout is None else ready_timeout
+        )
+        self.graceful_timeout = (
+            settings.SERVER_GRACEFUL_TIMEOUT
+            if graceful_timeout is None
+            else graceful_timeout
+        )
+        self.socket: Optional[socket.socket] = None
+        self.shared_dir: Optional[str] = None
+        self.pids: List[int] = []
+        # Replaced workers still draining their requests.
+        self.retiring: Set[int] = set()
+
+    def _fork(self, primary: bool) -> Tuple[int, int]:
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            signal.pthread_sigmask(signal.SIG_SETMASK, set())
+            settings.SERVER_PRIMARY = primary
+            code = 1
+            try:
+                server = WorkerServer(self.config, write_fd)
+                server.run(sockets=[self.socket])
+                code = 0 if server.started else STARTUP_FAILURE
+            except BaseException:
+                traceback.print_exc()
+            finally:
+                os._exit(code)
+        os.close(write_fd)
+        return pid, read_fd
+
+    def _wait_ready(self, pending: Dict[int, int]) -> List[int]:
+        """
+        Wait for forked workers to accept connections.
+
+        Args:
+            pending (Dict[int, int]): Ready pipe of each worker, by pid.
+
+        Returns:
+            List[int]: The workers that started within the ready timeout.
+        """
+        ready = []
+        deadline = time.monotonic() + self.ready_timeout
+        try:
+            while pending:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                readable, _, _ = select.select(list(pending.values()), [], [], timeout)
+                for pid, fd in list(pending.items()):
+                    if fd in readable:
+                        # A worker exiting before it is ready closes the pipe empty.
+                        if os.read(fd, 1):
+                            ready.append(pid)
+                        del pending[pid]
+                        os.close(fd)
+        finally:
+            for fd in pending.values():
+                os.close(fd)
+        return ready
+
+    def _spawn(self, primary: bool) -> Optional[int]:
+        pid, fd = self._fork(primary)
+        if self._wait_ready({pid: fd}):
+            return pid
+        os.kill(pid, signal.SIGKILL)
+        os.waitpid(pid, 0)
+        return None
+
+    def start(self) -> bool:
+        """
+        Bind the socket and fork every worker.
+
+        Returns:
+            bool: Whether all the workers started.
+        """
+        self.socket = self.config.bind_socket()
+        self.shared_dir = tempfile.mkdtemp(
+            prefix="formenos-", dir="/dev/shm" if os.path.isdir("/dev/shm") else None
+        )
+        # Forked workers inherit the setting.
+        settings.SERVER_SHARED_DIR = self.shared_dir
+        os.mkdir(metrics_directory())
+        pending = dict(self._fork(i == 0) for i in range(self.workers))
+        self.pids = list(pending)
+        return len(self._wait_ready(pending)) == len(self.pids)
+
+    def restart(self) -> None:
+        """
+        Replace the workers one at a time, each only once its replacement serves.
+        """
+        for old in list(self.pids):
+            new = self._spawn(self.pids.index(old) == 0)
+            if new is None:
+                logger.error(
+                    "Replacement worker failed to start; keeping [%d] and aborting the restart.",
+                    old,
+                )
+                return
+            self.pids[self.pids.index(old)] = new
+            self.retiring.add(old)
+            os.kill(old, signal.SIGTERM)
+
+    def reap(self) -> bool:
+        """
+        Collect exited workers and replace the ones that were serving.
+
+        Returns:
+            bool: False if a replacement failed to start.
+        """
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return True
+            if pid == 0:
+                return True
+            retire_process_metrics(metrics_directory(), pid)
+            if pid in self.retiring:
+                self.retiring.discard(pid)
+            elif pid in self.pids:
+                logger.warning(
+                    "Worker [%d] exited with status %d; replacing it.",
+                    pid,
+                    os.waitstatus_to_exitcode(status),
+                )
+                new = self._spawn(self.pids.index(pid) == 0)
+                if new is None:
+                    self.pids.remove(pid)
+                    return False
+                self.pids[self.pids.index(pid)] = new
+
+    def stop(self) -> None:
+        """
+        Drain every worker, killing the ones still running after the graceful timeout.
+        """
+        remaining = set(self.pids) | self.retiring
+        for pid in remaining:
+            os.kill(pid, signal.SIGTERM)
+        deadline = time.monotonic() + self.graceful_timeout + KILL_GRACE
+        while remaining and time.monotonic() < deadline:
+            for pid in list(remaining):
+                if os.waitpid(pid, os.WNOHANG)[0]:
+                    remaining.discard(pid)
+            time.sleep(0.1)
+        for pid in remaining:
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+        self.pids, self.retiring = [], set()
+        if self.socket is not None:
+            self.socket.close()
+        if self.shared_dir is not None:
+            shutil.rmtree(self.shared_dir, ignore_errors=True)
+
+    def run(self) -> int:
+        """
+        Start the workers and supervise them until SIGTERM or SIGINT.
+
+        Returns:
+            int: Process exit status.
+        """
+        # Signals are handled synchronously below; forked workers unblock them.
+        signal.pthread_sigmask(signal.SIG_BLOCK, SIGNALS)
+        logger.info("Starting %d workers in parent [%d].", self.workers, os.getpid())
+        if not self.start():
+            logger.error("Workers failed to start.")
+            self.stop()
+            return STARTUP_FAILURE
+        while True:
+            info = signal.sigtimedwait(SIGNALS, 1.0)
+            if not self.reap():
+                logger.error("Replacement worker failed to start; stopping.")
+                self.stop()
+                return STARTUP_FAILURE
+            if info is None or info.si_signo == signal.SIGCHLD:
+                continue
+            if info.si_signo == signal.SIGHUP:
+                logger.info("Restarting workers.")
+                self.restart()
+            else:
+                logger.info("Stopping workers.")
+                self.stop()
+                return 0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("app", nargs="?", default="app.main:app")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args(argv)
+
+    config = uvicorn.Config(
+        import_from_string(args.app),
+        host=args.host,
+        port=args.port,
+        loop="auto",
+        http="auto",
+        backlog=settings.SERVER_BACKLOG,
+        timeout_keep_alive=settings.SERVER_KEEP_ALIVE,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_TIMEOUT,
+        limit_max_requests=settings.SERVER_MAX_REQUESTS,
+        log_level=args.log_level,
+    )
+    config.load()
+    return Supervisor(config, settings.SERVER_WORKERS or available_cpus()).run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
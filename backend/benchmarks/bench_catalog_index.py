@@ -0,0 +1,111 @@
+"""
+Measure the memory, build time and query latency of the in-memory catalog
+index for registries of different sizes.
+
+The model versions are shaped like the MLflow client parses them, with
+realistic sources and descriptions and a few tags each.
+
+Usage:
+    python -m benchmarks.bench_catalog_index --sizes 10000 100000
+"""
+
+import argparse
+import gc
+import json
+import random
+import time
+import tracemalloc
+from typing import Callable, List
+
+from app.catalog.index import CatalogSnapshot
+
+TAG_VALUES = {
+    "team": [f"team-{i}" for i in range(40)],
+    "stage": ["dev", "evaluation", "staging", "production"],
+    "approved": ["true", "false"],
+}
+
+
+def make_versions(size: int, versions_per_model: int, seed: int) -> List[dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "name": f"model_{i // versions_per_model:06d}",
+            "version": str(i % versions_per_model + 1),
+            "creation_timestamp": 1715438791345 + i,
+            "tags": [
+                {"key": key, "value": rng.choice(values)}
+                for key, values in TAG_VALUES.items()
+            ],
+            "description": f"Version {i % versions_per_model + 1} of model {i // versions_per_model}.",
+            "source": f"mlflow-artifacts:/{i // versions_per_model}/{rng.getrandbits(128):032x}/artifacts/model",
+        }
+        for i in range(size)
+    ]
+
+
+def allocated(build: Callable[[], object]) -> tuple:
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def query_us(snapshot: CatalogSnapshot, repeat: int, **query) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        snapshot.search(**query)
+    return round((time.perf_counter() - start) / repeat * 1e6, 1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--versions-per-model", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        versions, versions_bytes = allocated(
+            lambda size=size: make_versions(size, args.versions_per_model, args.seed)
+        )
+        _snapshot, index_bytes = allocated(
+            lambda versions=versions: CatalogSnapshot(versions)
+        )
+        # Timed separately, tracing allocations slows the build down.
+        start = time.perf_counter()
+        snapshot = CatalogSnapshot(versions)
+        build_s = time.perf_counter() - start
+        results.append(
+            {
+                "versions": size,
+                "version_dicts_mb": round(versions_bytes / 2**20, 1),
+                "index_mb": round(index_bytes / 2**20, 1),
+                "build_s": round(build_s, 3),
+                "tag_query_us": query_us(
+                    snapshot, args.repeat, tags=[("team", "team-7")]
+                ),
+                "two_tag_query_us": query_us(
+                    snapshot,
+                    args.repeat,
+                    tags=[("team", "team-7"), ("stage", "production")],
+                ),
+                "prefix_query_us": query_us(snapshot, args.repeat, prefix="model_0012"),
+                "tag_and_prefix_query_us": query_us(
+                    snapshot,
+                    args.repeat,
+                    tags=[("approved", "true")],
+                    prefix="model_001",
+                ),
+            }
+        )
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
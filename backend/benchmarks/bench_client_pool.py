@@ -0,0 +1,115 @@
+"""
+Compare per-request clients against a shared, pooled client.
+
+Starts a local stub of the MLflow ``model-versions/get`` endpoint and issues
+requests from a thread pool, mirroring how Starlette runs sync endpoints.
+
+Usage:
+    python -m benchmarks.bench_client_pool --requests 2000 --concurrency 32
+"""
+
+import argparse
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List
+
+import uvicorn
+
+from app.clients.base_client import BaseClient, BaseClientError
+
+MODEL_VERSION = json.dumps(
+    {
+        "model_version": {
+            "name": "churn_model",
+            "version": "2",
+            "creation_timestamp": 1715438791345,
+            "description": "Model to predict customer churn.",
+            "source": "mlflow-artifacts:/1/2/artifacts/model",
+            "tags": [],
+        }
+    }
+).encode()
+
+
+async def stub_app(scope, _receive, send) -> None:
+    if scope["type"] != "http":
+        return
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"application/json")],
+        }
+    )
+    await send({"type": "http.response.body", "body": MODEL_VERSION})
+
+
+def start_server(port: int) -> uvicorn.Server:
+    config = uvicorn.Config(stub_app, port=port, log_level="error", backlog=4096)
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server
+
+
+def run(call: Callable[[], None], requests: int, concurrency: int) -> List[float]:
+    def timed(_: int) -> float:
+        start = time.perf_counter()
+        call()
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(timed, range(requests)))
+
+
+def report(label: str, latencies: List[float], elapsed: float) -> dict:
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "mode": label,
+        "requests": len(latencies),
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(quantiles[49] * 1000, 3),
+        "p99_ms": round(quantiles[98] * 1000, 3),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    server = start_server(args.port)
+    base_uri = f"http://127.0.0.1:{args.port}"
+    path = "/api/2.0/mlflow/model-versions/get"
+    params = {"name": "churn_model", "version": "2"}
+
+    def per_request() -> None:
+        # Previous behaviour: a new client (and TCP connection) for each request.
+        with BaseClient(base_uri=base_uri, error_class=BaseClientError) as client:
+            client.perform_request("get", path, params=params)
+
+    shared = BaseClient(base_uri=base_uri, error_class=BaseClientError)
+
+    def pooled() -> None:
+        shared.perform_request("get", path, params=params)
+
+    results = []
+    for label, call in (("per_request", per_request), ("pooled", pooled)):
+        run(call, min(args.requests, 100), args.concurrency)  # warm up
+        start = time.perf_counter()
+        latencies = run(call, args.requests, args.concurrency)
+        results.append(report(label, latencies, time.perf_counter() - start))
+
+    shared.close()
+    server.should_exit = True
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Measure the overhead of the request metrics on a catalog endpoint.
+
+Serves the model version route in-process, once with MetricsMiddleware and the
+serialization histogram and once without, and compares the mean latency.
+
+Usage:
+    python -m benchmarks.bench_metrics --requests 5000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from app.api import deps, responses
+from app.api.api_v1.api import api_router
+from app.api.middleware import MetricsMiddleware
+from app.core.config import settings
+from app.core.metrics import RESPONSE_SERIALIZATION_DURATION
+
+MODEL_VERSION = {
+    "name": "churn_model",
+    "version": "2",
+    "creation_timestamp": 1715438791345,
+    "description": "Model to predict customer churn.",
+    "source": "mlflow-artifacts:/1/2/artifacts/model",
+    "tags": [{"key": "stage", "value": "production"}],
+}
+
+
+class StubMLflowClient:
+    async def get_model_version(self, **_kwargs) -> dict:
+        return MODEL_VERSION
+
+
+class NullHistogram:
+    def observe(self, *_args) -> None:
+        pass
+
+
+def make_app(instrumented: bool) -> FastAPI:
+    app = FastAPI()
+    if instrumented:
+        app.add_middleware(MetricsMiddleware)
+    app.include_router(api_router, prefix=settings.API_V1_STR)
+    stub = StubMLflowClient()
+    app.dependency_overrides[deps.get_mlflow_client] = lambda: stub
+    return app
+
+
+async def mean_latency_us(app: FastAPI, requests: int) -> float:
+    url = f"{settings.API_V1_STR}/model-catalog/mlflow/models/churn_model/versions/2"
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        for _ in range(200):
+            await client.get(url)
+        start = time.perf_counter()
+        for _ in range(requests):
+            await client.get(url)
+        return (time.perf_counter() - start) / requests * 1e6
+
+
+async def run(requests: int, rounds: int) -> dict:
+    baseline, instrumented = [], []
+    for _ in range(rounds):
+        responses.RESPONSE_SERIALIZATION_DURATION = NullHistogram()
+        baseline.append(await mean_latency_us(make_app(False), requests))
+        responses.RESPONSE_SERIALIZATION_DURATION = RESPONSE_SERIALIZATION_DURATION
+        instrumented.append(await mean_latency_us(make_app(True), requests))
+
+    observe_start = time.perf_counter()
+    for _ in range(100000):
+        RESPONSE_SERIALIZATION_DURATION.observe(0.0003, "bench")
+    observe_ns = (time.perf_counter() - observe_start) / 100000 * 1e9
+
+    best_baseline, best_instrumented = min(baseline), min(instrumented)
+    return {
+        "requests": requests,
+        "baseline_us": round(best_baseline, 1),
+        "instrumented_us": round(best_instrumented, 1),
+        "overhead_percent": round(
+            (best_instrumented - best_baseline) / best_baseline * 100, 2
+        ),
+        "histogram_observe_ns": round(observe_ns),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(args.requests, args.rounds)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
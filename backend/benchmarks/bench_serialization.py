@@ -0,0 +1,80 @@
+"""
+Compare the cost of serializing catalog pages through the response model
+against the schema-shaped orjson path used by the catalog endpoints.
+
+Usage:
+    python -m benchmarks.bench_serialization --repeat 200
+"""
+
+import argparse
+import json
+import timeit
+from functools import partial
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.api.responses import CatalogResponse, mlflow_model_version_rows
+from app.schemas.model_catalog import MLflowRegisteredModels
+
+
+def make_page(size: int) -> dict:
+    return {
+        "models": [
+            {
+                "name": f"model_{i}",
+                "version": str(i % 7 + 1),
+                "creation_timestamp": 1715438791345 + i,
+                "tags": [
+                    {"key": "stage", "value": "production"},
+                    {"key": "approved", "value": "true"},
+                ],
+                "description": "Model to predict customer churn.",
+                "source": f"mlflow-artifacts:/1/{i:032x}/artifacts/model",
+            }
+            for i in range(size)
+        ],
+        "page_token": None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    def response_model_path(page: dict) -> bytes:
+        # What FastAPI does for a dict returned with response_model set.
+        value = MLflowRegisteredModels.model_validate(page)
+        content = jsonable_encoder(value.model_dump(mode="json"))
+        return JSONResponse(content).body
+
+    def catalog_path(page: dict) -> bytes:
+        return CatalogResponse(
+            {
+                "models": mlflow_model_version_rows(page["models"]),
+                "page_token": page["page_token"],
+            }
+        ).body
+
+    results = []
+    for size in (10, 100, 1000):
+        page = make_page(size)
+        assert json.loads(response_model_path(page)) == json.loads(catalog_path(page))
+        row = {"items": size}
+        for label, fn in (
+            ("response_model_us", response_model_path),
+            ("catalog_response_us", catalog_path),
+        ):
+            seconds = min(
+                timeit.repeat(partial(fn, page), number=args.repeat, repeat=3)
+            )
+            row[label] = round(seconds / args.repeat * 1e6, 1)
+        row["speedup"] = round(row["response_model_us"] / row["catalog_response_us"], 1)
+        results.append(row)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Measure the read and write overhead of the shared MLflow response cache
+against the in-process cache.
+
+Both caches are filled with model versions keyed like the MLflow client keys
+them, then read back by random hits, misses and writes. Run it with --path on
+the filesystem the workers would use, e.g. /dev/shm.
+
+Upstream call reduction across workers is measured end to end with
+benchmarks.load_test --workers 8 --shared-cache.
+
+Usage:
+    python -m benchmarks.bench_shared_cache --entries 2000 --repeat 20000
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from typing import Callable, Union
+
+from app.clients.cache import SharedTTLCache, TTLCache, make_cache_key
+
+Cache = Union[TTLCache, SharedTTLCache]
+
+
+def model_version(i: int) -> dict:
+    return {
+        "name": f"model_{i:05d}",
+        "version": "1",
+        "creation_timestamp": 1715438791345 + i,
+        "tags": [{"key": "stage", "value": "production"}],
+        "description": f"Version 1 of model {i}.",
+        "source": f"mlflow-artifacts:/{i}/{i:032x}/artifacts/model",
+    }
+
+
+def key(i: int) -> tuple:
+    return make_cache_key("get_model_version", {"name": f"model_{i:05d}", "version": 1})
+
+
+def per_call_us(call: Callable[[int], object], repeat: int, keys: int) -> float:
+    rng = random.Random(0)
+    indexes = [rng.randrange(keys) for _ in range(repeat)]
+    start = time.perf_counter()
+    for i in indexes:
+        call(i)
+    return round((time.perf_counter() - start) / repeat * 1e6, 2)
+
+
+def measure(cache: Cache, entries: int, repeat: int) -> dict:
+    for i in range(entries):
+        cache.set(key(i), model_version(i), ttl=3600)
+    return {
+        "hit_us": per_call_us(lambda i: cache.get(key(i)), repeat, entries),
+        "miss_us": per_call_us(lambda i: cache.get(key(entries + i)), repeat, entries),
+        "set_us": per_call_us(
+            lambda i: cache.set(key(i), model_version(i), ttl=3600), repeat, entries
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=20000)
+    parser.add_argument("--path", help="Directory of the shared cache file.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.path) as directory:
+        shared = SharedTTLCache(
+            os.path.join(directory, "cache.sqlite3"),
+            max_entries=args.entries * 2,
+            max_bytes=64 * 2**20,
+        )
+        results = {
+            "in_process": measure(
+                TTLCache(max_entries=args.entries * 2, max_bytes=64 * 2**20),
+                args.entries,
+                args.repeat,
+            ),
+            "shared": measure(shared, args.entries, args.repeat),
+        }
+        shared.close()
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Compare rendering InferenceService manifests with the pure-Python YAML
+emitter against the libyaml renderer, cold and with memoized documents.
+
+Usage:
+    python -m benchmarks.bench_yaml_rendering --sizes 1000 10000
+"""
+
+import argparse
+import json
+import time
+from typing import Callable, List
+
+import yaml
+
+from app.kubernetes.kserve_resource import InferenceServiceResource
+from app.kubernetes.rendering import YAMLRenderer
+
+
+def make_fleet(size: int) -> List[InferenceServiceResource]:
+    return [
+        InferenceServiceResource(
+            name=f"model-{i}",
+            service_account="default",
+            storage_uri=f"s3://models/{i}/artifacts/model",
+            instance_type="ml.cpu.small",
+            batcher=i % 2 == 0,
+            autoscaling=i % 3 == 0,
+            max_replicas=3,
+            prometheus=i % 5 == 0,
+        )
+        for i in range(size)
+    ]
+
+
+def timed(fn: Callable[[], str]) -> float:
+    start = time.perf_counter()
+    fn()
+    return round(time.perf_counter() - start, 4)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        manifests = [resource.to_dict() for resource in make_fleet(size)]
+        renderer = YAMLRenderer(max_entries=size)
+
+        def pure_python(manifests=manifests) -> str:
+            return yaml.dump_all(
+                manifests, Dumper=yaml.Dumper, sort_keys=False, explicit_start=True
+            )
+
+        def renderer_stream(renderer=renderer, manifests=manifests) -> str:
+            return renderer.render_all(manifests)
+
+        assert pure_python() == YAMLRenderer(max_entries=0).render_all(manifests)
+        row = {
+            "resources": size,
+            "pure_python_s": timed(pure_python),
+            "libyaml_cold_s": timed(renderer_stream),
+            "memoized_warm_s": timed(renderer_stream),
+        }
+        row["cold_speedup"] = round(row["pure_python_s"] / row["libyaml_cold_s"], 1)
+        row["warm_speedup"] = round(row["pure_python_s"] / row["memoized_warm_s"], 1)
+        results.append(row)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
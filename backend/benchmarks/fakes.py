@@ -0,0 +1,288 @@
+"""
+Stand-in MLflow tracking server and GitLab API for load tests.
+
+Serves the MLflow registry and GitLab repository endpoints used by the
+Formenos clients from a generated catalog, with configurable latency and
+error rate. GET /_stats returns the number of calls per endpoint and
+POST /_reset clears it.
+
+Usage:
+    python -m benchmarks.fakes --port 5001 --models 10000 --latency-ms 20
+"""
+
+import argparse
+import asyncio
+import hashlib
+import random
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+CREATION_TIMESTAMP = 1715438791345
+NAME_FILTER = re.compile(r"^\s*name\s*(=|LIKE)\s*'([^']*)'\s*$", re.IGNORECASE)
+
+
+@dataclass
+class FakeConfig:
+    models: int = 10000
+    versions_per_model: int = 3
+    latency_ms: float = 20.0
+    jitter_ms: float = 5.0
+    error_rate: float = 0.0
+    seed: int = 0
+
+
+def model_name(index: int) -> str:
+    return f"model_{index:05d}"
+
+
+class FakeCatalog:
+    """
+    A deterministic MLflow catalog of `models` models with `versions_per_model` versions each.
+    """
+
+    def __init__(self, models: int, versions_per_model: int) -> None:
+        self.names = [model_name(i) for i in range(models)]
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.versions_per_model = versions_per_model
+
+    def model_version(self, name: str, version: int) -> dict:
+        return {
+            "name": name,
+            "version": str(version),
+            "creation_timestamp": CREATION_TIMESTAMP + version,
+            "last_updated_timestamp": CREATION_TIMESTAMP + version,
+            "current_stage": "Production" if version == 1 else "None",
+            "description": f"Version {version} of {name}.",
+            "source": f"mlflow-artifacts:/{self.index[name]}/{version:032x}/artifacts/model",
+            "run_id": f"{self.index[name]:016x}{version:016x}",
+            "status": "READY",
+            "tags": [{"key": "approved", "value": "true"}],
+        }
+
+    def versions(self, name: str) -> List[dict]:
+        return [
+            self.model_version(name, version)
+            for version in range(1, self.versions_per_model + 1)
+        ]
+
+    def registered_model(self, name: str) -> dict:
+        return {
+            "name": name,
+            "creation_timestamp": CREATION_TIMESTAMP,
+            "last_updated_timestamp": CREATION_TIMESTAMP,
+            "latest_versions": self.versions(name),
+        }
+
+    def matching_names(self, filter: Optional[str]) -> List[str]:
+        match = NAME_FILTER.match(filter or "")
+        if not match:
+            return self.names
+        operator, value = match.groups()
+        if operator == "=":
+            return [value] if value in self.index else []
+        prefix = value.rstrip("%")
+        return [name for name in self.names if name.startswith(prefix)]
+
+
+def page(items: list, request: Request, default_size: int) -> tuple:
+    size = int(request.query_params.get("max_results", default_size))
+    start = int(request.query_params.get("page_token") or 0)
+    end = start + size
+    return items[start:end], (str(end) if end < len(items) else None)
+
+
+def create_app(config: FakeConfig) -> Starlette:
+    """
+    Build the fake upstream application.
+
+    Args:
+        config (FakeConfig): Catalog size, latency and error rate.
+
+    Returns:
+        Starlette: The ASGI application.
+    """
+    catalog = FakeCatalog(config.models, config.versions_per_model)
+    rng = random.Random(config.seed)
+    calls: Counter = Counter()
+    files: Dict[str, Dict[str, str]] = {}
+
+    def endpoint(label: str):
+        def decorator(handler):
+            async def wrapped(request: Request) -> Response:
+                calls[label] += 1
+                delay = config.latency_ms + rng.uniform(
+                    -config.jitter_ms, config.jitter_ms
+                )
+                await asyncio.sleep(max(0.0, delay) / 1000)
+                if rng.random() < config.error_rate:
+                    return JSONResponse({"error_code": "UNAVAILABLE"}, status_code=503)
+                return await handler(request)
+
+            return wrapped
+
+        return decorator
+
+    def not_found(message: str) -> JSONResponse:
+        return JSONResponse(
+            {"error_code": "RESOURCE_DOES_NOT_EXIST", "message": message},
+            status_code=404,
+        )
+
+    @endpoint("mlflow.registered_models.search")
+    async def search_registered_models(request: Request) -> Response:
+        names = catalog.matching_names(request.query_params.get("filter"))
+        names, token = page(names, request, 100)
+        return JSONResponse(
+            {
+                "registered_models": [catalog.registered_model(n) for n in names],
+                **({"next_page_token": token} if token else {}),
+            }
+        )
+
+    @endpoint("mlflow.registered_models.get")
+    async def get_registered_model(request: Request) -> Response:
+        name = request.query_params.get("name")
+        if name not in catalog.index:
+            return not_found(f"Registered Model with name={name} not found")
+        return JSONResponse({"registered_model": catalog.registered_model(name)})
+
+    @endpoint("mlflow.registered_models.alias")
+    async def get_model_version_by_alias(request: Request) -> Response:
+        name = request.query_params.get("name")
+        if name not in catalog.index:
+            return not_found(f"Registered Model with name={name} not found")
+        version = catalog.versions_per_model
+        return JSONResponse({"model_version": catalog.model_version(name, version)})
+
+    @endpoint("mlflow.registered_models.get_latest_versions")
+    async def get_latest_versions(request: Request) -> Response:
+        name = request.query_params.get("name")
+        if name not in catalog.index:
+            return not_found(f"Registered Model with name={name} not found")
+        return JSONResponse({"model_versions": catalog.versions(name)[-1:]})
+
+    @endpoint("mlflow.model_versions.search")
+    async def search_model_versions(request: Request) -> Response:
+        names = catalog.matching_names(request.query_params.get("filter"))
+        size = int(request.query_params.get("max_results", 200))
+        start = int(request.query_params.get("page_token") or 0)
+        per_model = catalog.versions_per_model
+        versions = [
+            catalog.model_version(names[i // per_model], i % per_model + 1)
+            for i in range(start, min(start + size, len(names) * per_model))
+        ]
+        end = start + size
+        token = str(end) if end < len(names) * per_model else None
+        return JSONResponse(
+            {
+                "model_versions": versions,
+                **({"next_page_token": token} if token else {}),
+            }
+        )
+
+    @endpoint("mlflow.model_versions.get")
+    async def get_model_version(request: Request) -> Response:
+        name = request.query_params.get("name")
+        version = int(request.query_params.get("version") or 0)
+        if name not in catalog.index or not 1 <= version <= catalog.versions_per_model:
+            return not_found(
+                f"Model Version (name={name}, version={version}) not found"
+            )
+        return JSONResponse({"model_version": catalog.model_version(name, version)})
+
+    @endpoint("gitlab.commits.create")
+    async def create_commit(request: Request) -> Response:
+        payload = await request.json()
+        tree = files.setdefault(request.path_params["project_id"], {})
+        for action in payload["actions"]:
+            if action["action"] == "delete":
+                tree.pop(action["file_path"], None)
+            else:
+                content = action.get("content", "").encode()
+                tree[action["file_path"]] = hashlib.sha1(
+                    b"blob %d\0" % len(content) + content
+                ).hexdigest()
+        commit_id = hashlib.sha1(repr(sorted(tree.items())).encode()).hexdigest()
+        return JSONResponse({"id": commit_id}, status_code=201)
+
+    @endpoint("gitlab.tree")
+    async def get_tree(request: Request) -> Response:
+        tree = files.get(request.path_params["project_id"], {})
+        entries = [
+            {"id": sha, "path": path, "type": "blob"} for path, sha in tree.items()
+        ]
+        per_page = int(request.query_params.get("per_page", 20))
+        current = int(request.query_params.get("page", 1))
+        start = (current - 1) * per_page
+        has_next = start + per_page < len(entries)
+        return JSONResponse(
+            entries[start : start + per_page],
+            headers={"x-next-page": str(current + 1) if has_next else ""},
+        )
+
+    @endpoint("gitlab.files.head")
+    async def head_file(request: Request) -> Response:
+        tree = files.get(request.path_params["project_id"], {})
+        return Response(status_code=200 if request.path_params["path"] in tree else 404)
+
+    async def stats(_request: Request) -> Response:
+        return JSONResponse(dict(calls))
+
+    async def reset(_request: Request) -> Response:
+        calls.clear()
+        return Response(status_code=204)
+
+    mlflow = "/api/2.0/mlflow"
+    gitlab = "/api/v4/projects/{project_id}/repository"
+    return Starlette(
+        routes=[
+            Route(f"{mlflow}/registered-models/search", search_registered_models),
+            Route(f"{mlflow}/registered-models/get", get_registered_model),
+            Route(f"{mlflow}/registered-models/alias", get_model_version_by_alias),
+            Route(
+                f"{mlflow}/registered-models/get-latest-versions", get_latest_versions
+            ),
+            Route(f"{mlflow}/model-versions/search", search_model_versions),
+            Route(f"{mlflow}/model-versions/get", get_model_version),
+            Route(f"{gitlab}/commits", create_commit, methods=["POST"]),
+            Route(f"{gitlab}/tree", get_tree),
+            Route(f"{gitlab}/files/{{path:path}}", head_file, methods=["HEAD"]),
+            Route("/_stats", stats),
+            Route("/_reset", reset, methods=["POST"]),
+        ]
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5001)
+    parser.add_argument("--models", type=int, default=10000)
+    parser.add_argument("--versions-per-model", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--jitter-ms", type=float, default=5.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    config = FakeConfig(
+        models=args.models,
+        versions_per_model=args.versions_per_model,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
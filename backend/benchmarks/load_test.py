@@ -0,0 +1,324 @@
+"""
+Load test the Formenos API against stand-in MLflow and GitLab servers.
+
+Starts benchmarks.fakes and the API (app.server) as subprocesses, drives each
+scenario at a fixed concurrency and prints one JSON report with RPS,
+latency percentiles and upstream calls per scenario. With --baseline, the
+report also compares against an earlier report, e.g. from another commit.
+
+With --shared-cache, the API workers share one MLflow response cache
+(MLFLOW_CACHE_PATH); compare upstream calls against a run without it.
+
+Usage:
+    python -m benchmarks.load_test --requests 2000 --concurrency 32 \\
+        --output report.json --baseline previous.json
+    python -m benchmarks.load_test --workers 8 --output per_worker.json
+    python -m benchmarks.load_test --workers 8 --shared-cache \\
+        --baseline per_worker.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+
+from benchmarks.fakes import model_name
+
+API_PREFIX = "/api/v1"
+CATALOG = f"{API_PREFIX}/model-catalog/mlflow"
+
+RequestSpec = Tuple[str, str, Optional[dict]]
+
+
+def make_scenarios(
+    models: int, versions_per_model: int
+) -> Dict[str, Callable[[random.Random], RequestSpec]]:
+    def name(rng: random.Random) -> str:
+        return model_name(rng.randrange(models))
+
+    def refs(rng: random.Random, count: int) -> List[dict]:
+        return [
+            {"name": name(rng), "version": rng.randint(1, versions_per_model)}
+            for _ in range(count)
+        ]
+
+    return {
+        "registered_models": lambda rng: (
+            "GET",
+            f"{CATALOG}/models/registered?max_results=100",
+            None,
+        ),
+        "model_versions_search": lambda rng: (
+            "GET",
+            f"{CATALOG}/models/versions?filter=name%3D%27{name(rng)}%27",
+            None,
+        ),
+        "latest_version": lambda rng: (
+            "GET",
+            f"{CATALOG}/models/{name(rng)}/latest-version",
+            None,
+        ),
+        "model_version": lambda rng: (
+            "GET",
+            f"{CATALOG}/models/{name(rng)}/versions/"
+            f"{rng.randint(1, versions_per_model)}",
+            None,
+        ),
+        "version_batch": lambda rng: (
+            "POST",
+            f"{CATALOG}/models/versions/batch",
+            {"versions": refs(rng, 50)},
+        ),
+        "fleet_manifests": lambda rng: (
+            "POST",
+            f"{API_PREFIX}/fleet/manifests",
+            {"versions": refs(rng, 200)},
+        ),
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            httpx.get(url, timeout=1.0)
+            return
+        except httpx.TransportError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+@contextmanager
+def process(args: List[str], ready_url: str, env: Optional[dict] = None) -> Iterator:
+    proc = subprocess.Popen([sys.executable, *args], env=env)
+    try:
+        wait_until_ready(ready_url)
+        yield proc
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    fakes: httpx.AsyncClient,
+    make_request: Callable[[random.Random], RequestSpec],
+    requests: int,
+    concurrency: int,
+    seed: int,
+) -> dict:
+    rng = random.Random(seed)
+    specs = [make_request(rng) for _ in range(requests)]
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    await fakes.post("/_reset")
+
+    async def worker() -> None:
+        while specs:
+            method, url, body = specs.pop()
+            started = time.perf_counter()
+            response = await client.request(method, url, json=body)
+            await response.aread()
+            latencies.append(time.perf_counter() - started)
+            key = str(response.status_code)
+            statuses[key] = statuses.get(key, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    upstream_calls = (await fakes.get("/_stats")).json()
+
+    return {
+        "requests": requests,
+        "rps": round(requests / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2),
+        "statuses": statuses,
+        "upstream_calls": upstream_calls,
+        "upstream_calls_per_request": round(sum(upstream_calls.values()) / requests, 3),
+    }
+
+
+def compare(results: dict, baseline: dict) -> dict:
+    """
+    Compare scenario results with a baseline report.
+
+    Args:
+        results (dict): Results of this run, keyed by scenario.
+        baseline (dict): A report written by an earlier run.
+
+    Returns:
+        dict: Percentage change of RPS, p99 and upstream calls per request, per
+        scenario present in both.
+    """
+
+    def change(new: float, old: float) -> Optional[float]:
+        return round((new - old) / old * 100, 1) if old else None
+
+    return {
+        scenario: {
+            "rps_change_percent": change(result["rps"], previous["rps"]),
+            "p99_change_percent": change(result["p99_ms"], previous["p99_ms"]),
+            "upstream_calls_change_percent": change(
+                result["upstream_calls_per_request"],
+                previous["upstream_calls_per_request"],
+            ),
+        }
+        for scenario, result in results.items()
+        if (previous := baseline.get("results", {}).get(scenario))
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def drive(args: argparse.Namespace, api_url: str, fakes_url: str) -> dict:
+    scenarios = make_scenarios(args.models, args.versions_per_model)
+    limits = httpx.Limits(max_connections=args.concurrency)
+    results = {}
+    async with httpx.AsyncClient(
+        base_url=api_url, limits=limits, timeout=60.0
+    ) as client, httpx.AsyncClient(base_url=fakes_url) as fakes:
+        for scenario in args.scenarios:
+            results[scenario] = await run_scenario(
+                client,
+                fakes,
+                scenarios[scenario],
+                args.requests,
+                args.concurrency,
+                args.seed,
+            )
+    return results
+
+
+def main() -> None:
+    scenario_names = list(make_scenarios(1, 1))
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--scenarios", nargs="+", default=scenario_names)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument(
+        "--shared-cache",
+        action="store_true",
+        help="Share the MLflow response cache between the API workers.",
+    )
+    parser.add_argument("--models", type=int, default=10000)
+    parser.add_argument("--versions-per-model", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--jitter-ms", type=float, default=5.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Also write the report to this file.")
+    parser.add_argument("--baseline", help="Report of an earlier run to compare with.")
+    args = parser.parse_args()
+    unknown = set(args.scenarios) - set(scenario_names)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    fakes_port, api_port = free_port(), free_port()
+    fakes_url = f"http://127.0.0.1:{fakes_port}"
+    api_url = f"http://127.0.0.1:{api_port}"
+    env = {
+        **os.environ,
+        "MLFLOW_TRACKING_URI": fakes_url,
+        "GITLAB_BASE_URI": fakes_url,
+        "GITLAB_ACCESS_TOKEN": os.environ.get("GITLAB_ACCESS_TOKEN", "load-test"),
+        "KSERVE_SERVICE_ACCOUNT": os.environ.get("KSERVE_SERVICE_ACCOUNT", "default"),
+        "SERVER_WORKERS": str(args.workers),
+        **{
+            key: os.environ.get(key, default)
+            for key, default in (
+                ("POSTGRES_SERVER", "localhost"),
+                ("POSTGRES_PORT", "5432"),
+                ("POSTGRES_USER", "formenos"),
+                ("POSTGRES_PASSWORD", "formenos"),
+                ("POSTGRES_DB", "formenos"),
+            )
+        },
+    }
+    fakes_args = [
+        "-m",
+        "benchmarks.fakes",
+        f"--port={fakes_port}",
+        f"--models={args.models}",
+        f"--versions-per-model={args.versions_per_model}",
+        f"--latency-ms={args.latency_ms}",
+        f"--jitter-ms={args.jitter_ms}",
+        f"--error-rate={args.error_rate}",
+        f"--seed={args.seed}",
+    ]
+    api_args = [
+        "-m",
+        "app.server",
+        "app.main:app",
+        f"--port={api_port}",
+        "--log-level=warning",
+    ]
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        if args.shared_cache:
+            env["MLFLOW_CACHE_PATH"] = os.path.join(cache_dir, "mlflow-cache.sqlite3")
+        else:
+            env.pop("MLFLOW_CACHE_PATH", None)
+        with process(fakes_args, f"{fakes_url}/_stats"), process(
+            api_args, f"{api_url}/metrics", env=env
+        ):
+            results = asyncio.run(drive(args, api_url, fakes_url))
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.time(),
+        "config": {
+            key: value
+            for key, value in vars(args).items()
+            if key not in ("output", "baseline")
+        },
+        "results": results,
+    }
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            report["comparison"] = compare(results, json.load(baseline))
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,5 +3,14 @@
 export APP_MODULE=${APP_MODULE-app.main:app}
 export HOST=${HOST:-0.0.0.0}
 export PORT=${PORT:-8000}
+# "dev" reloads on code changes; "prod" serves with pre-forked workers (app/server.py),
+# tuned by SERVER_WORKERS, SERVER_BACKLOG, SERVER_KEEP_ALIVE, SERVER_GRACEFUL_TIMEOUT
+# and THREADPOOL_SIZE.
+export MODE=${MODE:-dev}
 
-exec uvicorn --reload --host $HOST --port $PORT "$APP_MODULE"
\ No newline at end of file
+if [ "$MODE" = "prod" ]; then
+    exec python -m app.server --host $HOST --port $PORT "$APP_MODULE"
+fi
+
+# Bounds how long a reload waits for open responses, such as event streams.
+exec uvicorn --reload --timeout-graceful-shutdown 5 --host $HOST --port $PORT "$APP_MODULE"
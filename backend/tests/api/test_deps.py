@@ -0,0 +1,18 @@
+from fastapi.testclient import TestClient
+
+from app.clients.gitlab import GitLabClient
+from app.clients.mlflow import AsyncMLflowClient
+from app.main import app
+
+
+def test_lifespan_manages_shared_clients():
+    with TestClient(app):
+        mlflow_client = app.state.mlflow_client
+        gitlab_client = app.state.gitlab_client
+        assert isinstance(mlflow_client, AsyncMLflowClient)
+        assert isinstance(gitlab_client, GitLabClient)
+        assert not mlflow_client.session.is_closed
+        assert not gitlab_client.session.is_closed
+
+    assert mlflow_client.session.is_closed
+    assert gitlab_client.session.is_closed
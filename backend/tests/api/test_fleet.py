@@ -0,0 +1,197 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+import yaml
+from httpx import Response
+
+from app.api import deps
+from app.clients.base_client import request_error
+from app.clients.mlflow import MLflowClient, MLflowClientError
+from app.core.config import settings
+from app.gitops.fleet import fleet_resource, render_documents
+from app.gitops.manifest_index import git_blob_sha
+from app.main import app
+from tests import mlflow_test_data
+
+
+@pytest.fixture
+def fleet_client(client):
+    async def iter_model_version_pages(**_kwargs):
+        yield mlflow_test_data.models_without_type
+
+    mlflow_client = AsyncMock()
+    mlflow_client.iter_model_version_pages = iter_model_version_pages
+    mlflow_client.get_model_version_batch.return_value = [
+        {
+            "name": "churn_model",
+            "version": 1,
+            "model": mlflow_test_data.models_without_type[0],
+        },
+        {"name": "churn_model", "version": 9, "error": "not found", "status_code": 404},
+    ]
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        app.dependency_overrides[deps.get_mlflow_client] = lambda: mlflow_client
+        app.dependency_overrides[deps.get_render_pool] = lambda: pool
+        yield client
+
+
+def test_render_fleet_manifests(fleet_client):
+    response = fleet_client.post(
+        f"{settings.API_V1_STR}/fleet/manifests",
+        json={"filter": "tags.approved = 'true'"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/yaml")
+    documents = list(yaml.safe_load_all(response.text))
+    assert [document["metadata"]["name"] for document in documents] == [
+        "churn-model-v1",
+        "churn-model-v2",
+        "uplift-model-v1",
+    ]
+
+
+def test_render_fleet_manifests_reports_failed_versions(fleet_client):
+    response = fleet_client.post(
+        f"{settings.API_V1_STR}/fleet/manifests",
+        json={
+            "versions": [
+                {"name": "churn_model", "version": 1},
+                {"name": "churn_model", "version": 9},
+            ]
+        },
+    )
+
+    assert response.status_code == 200
+    assert len(list(yaml.safe_load_all(response.text))) == 1
+    assert response.text.endswith("# skipped churn_model version 9: not found\n")
+
+
+def test_render_fleet_manifests_comments_out_multiline_errors(fleet_client):
+    error = request_error(
+        MLflowClient(),
+        MLflowClientError,
+        "get",
+        "/model-versions/get",
+        Response(404, text="RESOURCE_DOES_NOT_EXIST: churn_model 9"),
+    )
+    mlflow_client = app.dependency_overrides[deps.get_mlflow_client]()
+    mlflow_client.get_model_version_batch.return_value[1]["error"] = error.message
+    body = {
+        "versions": [
+            {"name": "churn_model", "version": 1},
+            {"name": "churn_model", "version": 9},
+        ]
+    }
+
+    response = fleet_client.post(f"{settings.API_V1_STR}/fleet/manifests", json=body)
+
+    [document] = yaml.safe_load_all(response.text)
+    assert set(document) == {"apiVersion", "kind", "metadata", "spec"}
+    assert response.text.endswith(
+        "# skipped churn_model version 9: MLflowClient request failure:\n"
+        "# GET: /model-versions/get\n"
+        "# Message: RESOURCE_DOES_NOT_EXIST: churn_model 9\n"
+    )
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        {"filter": "name='x'", "versions": [{"name": "x", "version": 1}]},
+        {"instance_type": "ml.gpu.unknown"},
+        {"versions": []},
+    ],
+)
+def test_render_fleet_manifests_invalid_request(fleet_client, body):
+    response = fleet_client.post(f"{settings.API_V1_STR}/fleet/manifests", json=body)
+
+    assert response.status_code == 422
+
+
+def test_commit_fleet_manifests(fleet_client):
+    _, unchanged = render_documents(
+        [fleet_resource(mlflow_test_data.models_without_type[1], "ml.cpu.small")]
+    )[0]
+    gitlab_client = Mock()
+    gitlab_client.get_tree.return_value = {
+        "models/churn-model-v1.yaml": "0" * 40,
+        "models/churn-model-v2.yaml": git_blob_sha(unchanged),
+    }
+    gitlab_client.perform_commit.return_value = {"id": "abc123"}
+    app.state.manifest_index.gitlab_client = gitlab_client
+    app.state.commit_queue.gitlab_client = gitlab_client
+
+    response = fleet_client.post(
+        f"{settings.API_V1_STR}/fleet/commit",
+        json={"project_id": "1", "branch": "main", "directory": "/models/"},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "commit_id": "abc123",
+        "created": 1,
+        "updated": 1,
+        "unchanged": 1,
+        "failed": [],
+    }
+    project_id, branch, _, actions = gitlab_client.perform_commit.call_args.args
+    assert (project_id, branch) == ("1", "main")
+    assert [(action["action"], action["file_path"]) for action in actions] == [
+        ("update", "models/churn-model-v1.yaml"),
+        ("create", "models/uplift-model-v1.yaml"),
+    ]
+
+
+def test_deploy_fleet_manifests_are_batched(fleet_client, monkeypatch):
+    gitlab_client = Mock()
+    gitlab_client.get_tree.return_value = {}
+    gitlab_client.perform_commit.return_value = {"id": "abc123"}
+    app.state.manifest_index.gitlab_client = gitlab_client
+    app.state.commit_queue.gitlab_client = gitlab_client
+    monkeypatch.setattr(app.state.commit_queue, "debounce", 0.01)
+
+    response = fleet_client.post(
+        f"{settings.API_V1_STR}/fleet/deploy",
+        json={
+            "project_id": "1",
+            "branch": "main",
+            "versions": [{"name": "churn_model", "version": 1}],
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.json()["commit_id"] == "abc123"
+    assert response.json()["created"] == 1
+    gitlab_client.perform_commit.assert_called_once()
+
+
+def test_commit_fleet_manifests_rejects_service_name_collisions(fleet_client):
+    churn = mlflow_test_data.models_without_type[0]
+    app.dependency_overrides[deps.get_mlflow_client] = lambda: Mock(
+        get_model_version_batch=AsyncMock(
+            return_value=[
+                {"name": name, "version": 1, "model": {**churn, "name": name}}
+                for name in ("churn_model", "Churn.Model")
+            ]
+        )
+    )
+    gitlab_client = Mock()
+    app.state.manifest_index.gitlab_client = gitlab_client
+
+    response = fleet_client.post(
+        f"{settings.API_V1_STR}/fleet/commit",
+        json={
+            "project_id": "1",
+            "branch": "main",
+            "versions": [
+                {"name": "churn_model", "version": 1},
+                {"name": "Churn.Model", "version": 1},
+            ],
+        },
+    )
+
+    assert response.status_code == 409
+    assert response.json()["detail"][0]["name"] == "Churn.Model"
+    gitlab_client.perform_commit.assert_not_called()
@@ -0,0 +1,75 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from starlette.datastructures import State
+
+from app.api import deps, metrics
+from app.api.metrics import WorkerMetricsPublisher
+from app.core.config import settings
+from app.core.metrics import Counter, write_process_metrics
+from app.main import app
+from tests import mlflow_test_data
+
+
+def test_get_metrics(client):
+    mock = AsyncMock()
+    mock.get_model_version.return_value = mlflow_test_data.models_without_type[0]
+    app.dependency_overrides[deps.get_mlflow_client] = lambda: mock
+    client.get(
+        f"{settings.API_V1_STR}/model-catalog/mlflow/models/churn_model/versions/1"
+    )
+    client.get("/does-not-exist")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    route = f"{settings.API_V1_STR}/model-catalog/mlflow/models/{{name}}/versions/{{version}}"
+    assert (
+        f'formenos_http_request_duration_seconds_count{{method="GET",route="{route}",status="200"}}'
+        in text
+    )
+    assert 'route="unmatched",status="404"' in text
+    assert "churn_model" not in text
+    assert 'formenos_response_serialization_seconds_count{response="catalog"}' in text
+    assert 'formenos_http_pool_connections{upstream="gitlab",state="idle"} 0' in text
+    assert 'formenos_cache_requests_total{cache="mlflow",result="hit"}' in text
+    assert 'formenos_threadpool_threads{state="max"} 40' in text
+
+
+def test_unknown_methods_share_a_label(client):
+    client.request("BREW", "/metrics")
+
+    response = client.get("/metrics")
+
+    assert 'method="other",route="/metrics",status="405"' in response.text
+    assert "BREW" not in response.text
+
+
+def test_metrics_merge_the_server_workers(client, monkeypatch, tmp_path):
+    (tmp_path / "metrics").mkdir()
+    monkeypatch.setattr(settings, "SERVER_SHARED_DIR", str(tmp_path))
+    other = Counter("formenos_upstream_retries_total", "Retries.", ("upstream",))
+    other.inc("gitlab", amount=5)
+    write_process_metrics(str(tmp_path / "metrics"), 1, [other])
+
+    response = client.get("/metrics")
+
+    assert 'formenos_upstream_retries_total{upstream="gitlab"} 5' in response.text
+    assert 'formenos_threadpool_threads{state="max"} 40' in response.text
+
+
+@pytest.mark.anyio
+async def test_publisher_records_failed_writes(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "SERVER_SHARED_DIR", str(tmp_path / "missing"))
+    monkeypatch.setattr(metrics, "collect_runtime_metrics", lambda _state: [])
+    publisher = WorkerMetricsPublisher(State(), interval=0.01)
+
+    task = asyncio.ensure_future(publisher.run())
+    await asyncio.sleep(0.05)
+    task.cancel()
+
+    assert publisher.stats()["failures"] >= 2
+    assert "missing" in publisher.stats()["last_error"]
@@ -1,4 +1,11 @@
+import json
+from unittest.mock import AsyncMock, Mock
+
+from app.api import deps
+from app.catalog.index import CatalogSnapshot, encode_cursor
+from app.catalog.mirror import InvalidPageToken
 from app.core.config import settings
+from app.main import app
 from tests import mlflow_test_data
 
 
@@ -45,3 +52,233 @@ def test_get_model_version(client):
     expected_result = mlflow_test_data.models_with_type[1]
     assert response.status_code == 200
     assert result == expected_result
+
+
+def test_cache_control_no_cache_forces_refresh(client):
+    mock = AsyncMock()
+    mock.get_model_version.return_value = mlflow_test_data.models_without_type[1]
+    app.dependency_overrides[deps.get_mlflow_client] = lambda: mock
+
+    url = f"{settings.API_V1_STR}/model-catalog/mlflow/models/churn_model/versions/2"
+    client.get(url)
+    client.get(url, headers={"Cache-Control": "no-cache"})
+
+    assert mock.get_model_version.await_args_list[0].kwargs["refresh"] is False
+    assert mock.get_model_version.await_args_list[1].kwargs["refresh"] is True
+
+
+def test_export_model_versions(client):
+    async def iter_model_version_pages(**_kwargs):
+        yield mlflow_test_data.models_without_type[:2]
+        yield mlflow_test_data.models_without_type[2:]
+
+    mock = AsyncMock()
+    mock.iter_model_version_pages = iter_model_version_pages
+    app.dependency_overrides[deps.get_mlflow_client] = lambda: mock
+
+    response = client.get(f"{settings.API_V1_STR}/model-catalog/mlflow/models/export")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines == mlflow_test_data.models_with_type
+
+
+def test_get_model_version_batch(client):
+    mock = AsyncMock()
+    mock.get_model_version_batch.return_value = [
+        {
+            "name": "churn_model",
+            "version": 2,
+            "model": mlflow_test_data.models_without_type[1],
+        },
+        {"name": "churn_model", "version": 9, "error": "not found", "status_code": 404},
+    ]
+    app.dependency_overrides[deps.get_mlflow_client] = lambda: mock
+
+    response = client.post(
+        f"{settings.API_V1_STR}/model-catalog/mlflow/models/versions/batch",
+        json={
+            "versions": [
+                {"name": "churn_model", "version": 2},
+                {"name": "churn_model", "version": 9},
+            ]
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "results": [
+            {
+                "name": "churn_model",
+                "version": 2,
+                "model": mlflow_test_data.models_with_type[1],
+                "error": None,
+                "status_code": None,
+            },
+            {
+                "name": "churn_model",
+                "version": 9,
+                "model": None,
+                "error": "not found",
+                "status_code": 404,
+            },
+        ]
+    }
+    refs = list(mock.get_model_version_batch.await_args.args[0])
+    assert refs == [("churn_model", 2), ("churn_model", 9)]
+
+
+def test_get_model_version_batch_rejects_empty(client):
+    response = client.post(
+        f"{settings.API_V1_STR}/model-catalog/mlflow/models/versions/batch",
+        json={"versions": []},
+    )
+    assert response.status_code == 422
+
+
+def test_get_latest_model_version_by_stage(client):
+    mock = AsyncMock()
+    mock.get_latest_model_version.return_value = mlflow_test_data.models_without_type[2]
+    app.dependency_overrides[deps.get_mlflow_client] = lambda: mock
+
+    response = client.get(
+        f"{settings.API_V1_STR}/model-catalog/mlflow/models/uplift_model/latest-version",
+        params={"stage": "Production"},
+    )
+
+    assert response.status_code == 200
+    mock.get_latest_model_version.assert_awaited_once_with(
+        name="uplift_model", stage="Production", alias=None, refresh=False
+    )
+
+
+def test_get_latest_model_version_rejects_stage_and_alias(client):
+    response = client.get(
+        f"{settings.API_V1_STR}/model-catalog/mlflow/models/uplift_model/latest-version",
+        params={"stage": "Production", "alias": "champion"},
+    )
+    assert response.status_code == 400
+
+
+def test_get_latest_model_version_not_found(client):
+    mock = AsyncMock()
+    mock.get_latest_model_version.return_value = {}
+    app.dependency_overrides[deps.get_mlflow_client] = lambda: mock
+
+    response = client.get(
+        f"{settings.API_V1_STR}/model-catalog/mlflow/models/unknown/latest-version"
+    )
+    assert response.status_code == 404
+
+
+def test_registered_models_etag_revalidation(client):
+    url = f"{settings.API_V1_STR}/model-catalog/mlflow/models/registered"
+    response = client.get(url)
+    etag = response.headers["etag"]
+
+    assert response.headers["cache-control"] == "no-cache"
+
+    not_modified = client.get(url, headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+
+    stale = client.get(url, headers={"If-None-Match": '"outdated"'})
+    assert stale.status_code == 200
+
+
+def test_model_version_cache_control(client):
+    response = client.get(
+        f"{settings.API_V1_STR}/model-catalog/mlflow/models/churn_model/versions/2"
+    )
+    max_age = int(settings.MLFLOW_CACHE_TTL_MODEL_VERSION)
+    assert response.headers["cache-control"] == f"public, max-age={max_age}"
+    assert response.headers["etag"]
+
+
+def test_fresh_mirror_answers_model_version(client):
+    mirror = Mock()
+    mirror.serves.return_value = True
+    mirror.get_model_version.return_value = mlflow_test_data.models_without_type[1]
+    mock = AsyncMock()
+    app.dependency_overrides[deps.get_catalog_mirror] = lambda: mirror
+    app.dependency_overrides[deps.get_mlflow_client] = lambda: mock
+
+    response = client.get(
+        f"{settings.API_V1_STR}/model-catalog/mlflow/models/churn_model/versions/2"
+    )
+
+    assert response.json() == mlflow_test_data.models_with_type[1]
+    mirror.get_model_version.assert_called_once_with(name="churn_model", version=2)
+    mock.get_model_version.assert_not_awaited()
+
+
+def test_stale_mirror_falls_back_to_mlflow(client):
+    mirror = Mock()
+    mirror.serves.return_value = False
+    app.dependency_overrides[deps.get_catalog_mirror] = lambda: mirror
+
+    response = client.get(f"{settings.API_V1_STR}/model-catalog/mlflow/models/versions")
+
+    assert response.json()["models"] == mlflow_test_data.models_with_type
+    mirror.serves.assert_called_once_with("model_versions", None)
+    mirror.search_model_versions.assert_not_called()
+
+
+def test_mirror_rejects_invalid_page_token(client):
+    mirror = Mock()
+    mirror.serves.return_value = True
+    mirror.search_registered_models.side_effect = InvalidPageToken(
+        "Invalid page token."
+    )
+    app.dependency_overrides[deps.get_catalog_mirror] = lambda: mirror
+
+    response = client.get(
+        f"{settings.API_V1_STR}/model-catalog/mlflow/models/registered",
+        params={"page_token": "mirror:garbage"},
+    )
+
+    assert response.status_code == 400
+
+
+def test_search_catalog_index(client):
+    catalog_index = Mock()
+    catalog_index.snapshot = CatalogSnapshot(mlflow_test_data.models_without_type)
+    app.dependency_overrides[deps.get_catalog_index] = lambda: catalog_index
+    url = f"{settings.API_V1_STR}/model-catalog/mlflow/models/search"
+
+    response = client.get(url, params={"tag": "stage=evaluation", "max_results": 1})
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "models": [mlflow_test_data.models_with_type[0]],
+        "page_token": encode_cursor(("churn_model", 1)),
+    }
+    next_page = client.get(
+        url,
+        params={
+            "tag": "stage=evaluation",
+            "max_results": 1,
+            "page_token": response.json()["page_token"],
+        },
+    )
+    assert next_page.json()["models"] == [mlflow_test_data.models_with_type[1]]
+    assert next_page.json()["page_token"] is None
+
+
+def test_search_catalog_index_unavailable(client):
+    url = f"{settings.API_V1_STR}/model-catalog/mlflow/models/search"
+    assert client.get(url).status_code == 404
+
+    catalog_index = Mock(snapshot=None)
+    app.dependency_overrides[deps.get_catalog_index] = lambda: catalog_index
+    assert client.get(url).status_code == 503
+
+
+def test_catalog_events_limit_subscribers(client, monkeypatch):
+    monkeypatch.setattr(app.state.catalog_events, "max_subscribers", 0)
+
+    response = client.get(f"{settings.API_V1_STR}/model-catalog/mlflow/events")
+
+    assert response.status_code == 503
@@ -0,0 +1,20 @@
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import app
+
+
+def test_get_stats():
+    with TestClient(app) as client:
+        response = client.get(f"{settings.API_V1_STR}/monitoring/stats")
+
+    assert response.status_code == 200
+    assert response.json()["gitlab"]["circuit_breaker"]["state"] == "closed"
+    assert set(response.json()["mlflow"]["cache"]) == {
+        "hits",
+        "misses",
+        "evictions",
+        "expirations",
+        "entries",
+        "bytes",
+    }
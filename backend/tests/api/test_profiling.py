@@ -0,0 +1,100 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.api import deps
+from app.core.config import settings
+from app.core.profiling import record_phase
+from app.main import app
+from tests import mlflow_test_data
+
+MODEL_VERSION_URL = (
+    f"{settings.API_V1_STR}/model-catalog/mlflow/models/churn_model/versions/1"
+)
+
+
+@pytest.fixture
+def profiled_client(client, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILING_TOKEN", "secret")
+    monkeypatch.setattr(settings, "PROFILING_THRESHOLD", 0.0)
+
+    async def get_model_version(**_kwargs):
+        record_phase("upstream", 0.01)
+        return mlflow_test_data.models_without_type[0]
+
+    mock = AsyncMock()
+    mock.get_model_version = get_model_version
+    app.dependency_overrides[deps.get_mlflow_client] = lambda: mock
+    return client
+
+
+def test_requests_are_not_profiled_by_default(profiled_client):
+    response = profiled_client.get(MODEL_VERSION_URL)
+
+    assert response.status_code == 200
+    assert "server-timing" not in response.headers
+
+
+def test_profiling_token_enables_server_timing(profiled_client):
+    response = profiled_client.get(
+        MODEL_VERSION_URL, headers={"X-Profiling-Token": "secret"}
+    )
+
+    assert response.status_code == 200
+    phases = [
+        metric.split(";")[0] for metric in response.headers["server-timing"].split(", ")
+    ]
+    assert phases == ["upstream", "serialize", "total"]
+
+
+def test_slow_requests_are_kept_for_the_admin_endpoint(profiled_client):
+    headers = {"X-Profiling-Token": "secret"}
+    profiled_client.get(MODEL_VERSION_URL, headers=headers)
+
+    response = profiled_client.get(
+        f"{settings.API_V1_STR}/monitoring/profiles", headers=headers
+    )
+
+    assert response.status_code == 200
+    latest = response.json()[0]
+    assert latest["path"] == MODEL_VERSION_URL
+    assert latest["timings_ms"]["upstream"] == 10.0
+
+    response = profiled_client.get(
+        f"{settings.API_V1_STR}/monitoring/profiles/{latest['id']}", headers=headers
+    )
+    assert response.status_code == 200
+    assert "function calls" in response.text
+
+
+def test_profiles_require_the_token(profiled_client):
+    response = profiled_client.get(
+        f"{settings.API_V1_STR}/monitoring/profiles",
+        headers={"X-Profiling-Token": "wrong"},
+    )
+
+    assert response.status_code == 403
+
+
+def test_profiles_are_hidden_when_profiling_is_off(client):
+    response = client.get(f"{settings.API_V1_STR}/monitoring/profiles")
+
+    assert response.status_code == 404
+
+
+def test_non_latin1_profiling_token(profiled_client, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILING_TOKEN", "sécret-😀")
+    headers = {"X-Profiling-Token": "sécret-😀".encode()}
+
+    response = profiled_client.get(MODEL_VERSION_URL, headers=headers)
+    assert "server-timing" in response.headers
+
+    response = profiled_client.get(
+        f"{settings.API_V1_STR}/monitoring/profiles", headers=headers
+    )
+    assert response.status_code == 200
+    response = profiled_client.get(
+        f"{settings.API_V1_STR}/monitoring/profiles",
+        headers={"X-Profiling-Token": "wrong"},
+    )
+    assert response.status_code == 403
@@ -0,0 +1,72 @@
+import time
+
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+
+from app.clients.cache import make_cache_key
+from app.core.config import settings
+from app.main import app
+from tests.catalog.test_invalidation import sign
+
+URL = f"{settings.API_V1_STR}/webhooks/mlflow"
+BODY = orjson.dumps(
+    {
+        "entity": "model_version",
+        "action": "created",
+        "data": {"name": "iris", "version": "3"},
+    }
+)
+
+
+def headers(body, secret="secret"):
+    timestamp = str(int(time.time()))
+    return {
+        "X-MLflow-Delivery-Id": "delivery",
+        "X-MLflow-Timestamp": timestamp,
+        "X-MLflow-Signature": sign(secret, "delivery", timestamp, body),
+    }
+
+
+@pytest.fixture
+def webhook_client(monkeypatch):
+    monkeypatch.setattr(settings, "MLFLOW_WEBHOOK_SECRET", "secret")
+    with TestClient(app) as client:
+        yield client
+
+
+def test_webhook_evicts_changed_model(webhook_client):
+    cache = app.state.mlflow_client.cache
+    key = make_cache_key("get_latest_model_version", {"name": "iris"})
+    cache.set(key, {"name": "iris", "version": "2"}, ttl=60)
+    app.state.catalog_invalidator.refresh = lambda name: None
+
+    response = webhook_client.post(URL, content=BODY, headers=headers(BODY))
+
+    assert response.status_code == 202
+    assert response.json() == {
+        "event": "model_version.created",
+        "name": "iris",
+        "version": "3",
+        "invalidated": 1,
+    }
+    assert cache.get(key) is None
+
+
+def test_webhook_rejects_bad_signature(webhook_client):
+    response = webhook_client.post(URL, content=BODY, headers=headers(BODY, "wrong"))
+
+    assert response.status_code == 403
+
+
+def test_webhook_rejects_unknown_payload(webhook_client):
+    body = b'{"hello": "world"}'
+
+    assert (
+        webhook_client.post(URL, content=body, headers=headers(body)).status_code == 400
+    )
+
+
+def test_webhooks_disabled_without_secret():
+    with TestClient(app) as client:
+        assert client.post(URL, content=BODY, headers=headers(BODY)).status_code == 404
@@ -0,0 +1,195 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import orjson
+import pytest
+
+from app.catalog.events import (
+    BrokerClosed,
+    CatalogEventBroker,
+    CatalogEventFanout,
+    SubscriberLimitReached,
+    format_event,
+)
+from app.catalog.invalidation import CatalogInvalidator, RegistryEvent
+from app.clients.cache import TTLCache, make_cache_key
+
+
+def change(name="iris", version="3"):
+    return RegistryEvent("model_version.created", name, version)
+
+
+def drain(queue):
+    events = []
+    while not queue.empty():
+        events.append(queue.get_nowait())
+    return events
+
+
+@pytest.fixture
+def broker():
+    return CatalogEventBroker(buffer_size=4, queue_size=3, max_subscribers=2)
+
+
+def test_format_event():
+    event = {"id": "1-1", "event": "model_version", "data": {"name": "iris"}}
+
+    assert format_event(event) == (
+        b'id: 1-1\nevent: model_version\ndata: {"name":"iris"}\n\n'
+    )
+
+
+@pytest.mark.anyio
+async def test_publish_fans_out(broker):
+    first, second = broker.subscribe(), broker.subscribe()
+
+    event = broker.publish(change())
+
+    assert event["event"] == "model_version"
+    assert event["data"] == {
+        "name": "iris",
+        "version": "3",
+        "change": "model_version.created",
+    }
+    assert drain(first) == drain(second) == [event]
+    with pytest.raises(SubscriberLimitReached):
+        broker.subscribe()
+
+
+@pytest.mark.anyio
+async def test_resume_from_last_event_id(broker):
+    first = broker.publish(change(version="1"))
+    second = broker.publish(change(version="2"))
+
+    assert drain(broker.subscribe(first["id"])) == [second]
+    assert drain(broker.subscribe(second["id"])) == []
+
+
+@pytest.mark.anyio
+async def test_unknown_or_expired_id_gets_reset(broker):
+    first = broker.publish(change(version="1"))
+    for version in range(2, 7):
+        broker.publish(change(version=str(version)))
+
+    [reset] = drain(broker.subscribe(first["id"]))
+    assert reset["event"] == "reset"
+    assert reset["id"] == broker.stats()["last_event_id"]
+    assert drain(broker.subscribe("0-1"))[0]["event"] == "reset"
+
+
+@pytest.mark.anyio
+async def test_ids_of_another_broker_get_reset(broker):
+    other = CatalogEventBroker(buffer_size=4, queue_size=3, max_subscribers=2)
+    broker.publish(change())
+    event = other.publish(change())
+
+    assert other.epoch != broker.epoch
+    assert drain(broker.subscribe(event["id"]))[0]["event"] == "reset"
+
+
+@pytest.mark.anyio
+async def test_slow_subscriber_is_evicted(broker):
+    slow, fast = broker.subscribe(), broker.subscribe()
+    for version in range(1, 5):
+        broker.publish(change(version=str(version)))
+        drain(fast)
+
+    assert drain(slow) == [None]
+    assert broker.stats()["subscribers"] == 1
+    assert broker.stats()["evicted"] == 1
+
+
+@pytest.mark.anyio
+async def test_stream_ends_on_eviction(broker):
+    queue = broker.subscribe()
+    broker.publish(change())
+    stream = broker.stream(queue, heartbeat=0.01)
+
+    event = await stream.__anext__()
+    assert orjson.loads(event.split(b"data: ")[1])["name"] == "iris"
+    assert await stream.__anext__() == b": keep-alive\n\n"
+    for version in range(1, 5):
+        broker.publish(change(version=str(version)))
+    assert [chunk async for chunk in stream] == []
+    assert broker.stats()["subscribers"] == 0
+
+
+@pytest.mark.anyio
+async def test_close_ends_streams_and_refuses_subscribers(broker):
+    queue = broker.subscribe()
+    broker.publish(change())
+
+    broker.close()
+
+    assert [chunk async for chunk in broker.stream(queue)] == []
+    with pytest.raises(BrokerClosed):
+        broker.subscribe()
+
+
+@pytest.mark.anyio
+async def test_invalidator_publishes_changes(broker):
+    client = Mock()
+    client.cache = TTLCache(max_entries=10, max_bytes=4096)
+    client.invalidate_matching = AsyncMock(side_effect=client.cache.invalidate_matching)
+    queue = broker.subscribe()
+
+    await CatalogInvalidator(client, on_change=broker.publish).invalidate(change())
+
+    assert (await asyncio.wait_for(queue.get(), 1))["data"]["name"] == "iris"
+
+
+def worker(path, buffer_size=10):
+    client = Mock()
+    client.cache = TTLCache(max_entries=10, max_bytes=4096)
+    client.invalidate_matching = AsyncMock(side_effect=client.cache.invalidate_matching)
+    broker = CatalogEventBroker(buffer_size=4, queue_size=3, max_subscribers=2)
+    fanout = CatalogEventFanout(path, interval=1.0, buffer_size=buffer_size)
+    fanout.open()
+    # Forked workers have their own pid.
+    fanout.origin = id(fanout)
+    invalidator = CatalogInvalidator(
+        client, on_change=broker.publish, share=fanout.publish
+    )
+    return client, broker, fanout, invalidator
+
+
+@pytest.mark.anyio
+async def test_fanout_passes_changes_to_the_other_workers(tmp_path):
+    path = str(tmp_path / "events.sqlite3")
+    first_client, first_broker, first, first_invalidator = worker(path)
+    second_client, second_broker, second, second_invalidator = worker(path)
+    key = make_cache_key("get_latest_model_version", {"name": "iris"})
+    second_client.cache.set(key, {"version": "2"}, ttl=60)
+    queue = second_broker.subscribe()
+
+    await first_invalidator.invalidate(change())
+    await first.exchange(first_invalidator)
+    await second.exchange(second_invalidator)
+    await first.exchange(first_invalidator)
+
+    assert second_client.cache.get(key) is None
+    assert drain(queue)[0]["data"]["name"] == "iris"
+    assert first_broker.published == 1
+    assert first.stats()["shared"] == 1
+    assert (first.stats()["received"], second.stats()["received"]) == (0, 1)
+    first.close()
+    second.close()
+
+
+@pytest.mark.anyio
+async def test_fanout_evicts_everything_when_changes_were_missed(tmp_path):
+    path = str(tmp_path / "events.sqlite3")
+    _, _, first, first_invalidator = worker(path, buffer_size=1)
+    second_client, _, second, second_invalidator = worker(path, buffer_size=1)
+    other = make_cache_key("get_latest_model_version", {"name": "wine"})
+    second_client.cache.set(other, {"version": "1"}, ttl=60)
+
+    for version in ("1", "2", "3"):
+        await first_invalidator.invalidate(change(version=version))
+    await first.exchange(first_invalidator)
+    await second.exchange(second_invalidator)
+
+    assert second.stats()["missed"] == 1
+    assert second_client.cache.get(other) is None
+    first.close()
+    second.close()
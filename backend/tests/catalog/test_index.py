@@ -0,0 +1,130 @@
+from unittest.mock import Mock
+
+import pytest
+
+from app.catalog.index import (
+    CatalogIndex,
+    CatalogSnapshot,
+    decode_cursor,
+    encode_cursor,
+    parse_tag_filter,
+    prefix_end,
+)
+from app.catalog.mirror import InvalidPageToken
+
+
+def version(name, number, **tags):
+    return {
+        "name": name,
+        "version": str(number),
+        "creation_timestamp": 1000 + number,
+        "tags": [{"key": key, "value": value} for key, value in tags.items()],
+        "description": "",
+        "source": f"s3://models/{name}/{number}",
+    }
+
+
+@pytest.fixture
+def snapshot():
+    return CatalogSnapshot(
+        [
+            version("iris", 2, team="vision", stage="production"),
+            version("churn", 1, team="growth"),
+            version("iris", 1, team="vision"),
+            version("iris_v2", 1, team="vision", stage="production"),
+            version("wine", 10, team="growth", stage="production"),
+            version("wine", 9),
+        ]
+    )
+
+
+def keys(models):
+    return [(m["name"], int(m["version"])) for m in models]
+
+
+def test_parse_tag_filter():
+    assert parse_tag_filter("team=vision") == ("team", "vision")
+    assert parse_tag_filter("url=a=b") == ("url", "a=b")
+    assert parse_tag_filter("approved") == ("approved", None)
+
+
+def test_prefix_end():
+    assert prefix_end("iris") == "irit"
+    assert prefix_end("") is None
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(("iris", 2))) == ("iris", 2)
+    with pytest.raises(InvalidPageToken):
+        decode_cursor("not-a-cursor")
+
+
+def test_model_versions_are_sorted(snapshot):
+    assert keys(snapshot.model_versions("wine")) == [("wine", 9), ("wine", 10)]
+    assert snapshot.model_versions("unknown") == []
+
+
+def test_search_by_prefix(snapshot):
+    models, after = snapshot.search(prefix="iris")
+
+    assert keys(models) == [("iris", 1), ("iris", 2), ("iris_v2", 1)]
+    assert after is None
+
+
+def test_search_by_tags_and_prefix(snapshot):
+    assert keys(snapshot.search(tags=[("stage", "production")])[0]) == [
+        ("iris", 2),
+        ("iris_v2", 1),
+        ("wine", 10),
+    ]
+    assert keys(
+        snapshot.search(
+            tags=[("stage", "production"), ("team", "vision")], prefix="iris_"
+        )[0]
+    ) == [("iris_v2", 1)]
+    assert keys(snapshot.search(tags=[("stage", None)], prefix="w")[0]) == [
+        ("wine", 10)
+    ]
+    assert snapshot.search(tags=[("team", "unknown")])[0] == []
+
+
+def test_search_pages_with_cursor(snapshot):
+    pages, after = [], None
+    while True:
+        models, after = snapshot.search(
+            tags=[("team", None)], max_results=2, after=after
+        )
+        pages.append(keys(models))
+        if after is None:
+            break
+
+    assert pages == [
+        [("churn", 1), ("iris", 1)],
+        [("iris", 2), ("iris_v2", 1)],
+        [("wine", 10)],
+    ]
+
+
+def test_cursor_survives_removed_model(snapshot):
+    models, _ = snapshot.search(after=("iris", 5))
+
+    assert keys(models)[0] == ("iris_v2", 1)
+    assert keys(snapshot.search(after=("j", 1))[0])[0] == ("wine", 9)
+
+
+@pytest.mark.anyio
+async def test_refresh_swaps_snapshot():
+    async def iter_model_version_pages():
+        yield [version("iris", 1, team="vision")]
+        yield [version("wine", 1)]
+
+    mlflow_client = Mock()
+    mlflow_client.iter_model_version_pages = iter_model_version_pages
+    index = CatalogIndex(mlflow_client, clock=lambda: 50.0)
+
+    assert index.stats()["versions"] == 0
+    await index.refresh()
+
+    assert index.stats()["versions"] == 2
+    assert index.stats()["models"] == 2
+    assert index.age() == 0.0
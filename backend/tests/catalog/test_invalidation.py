@@ -0,0 +1,151 @@
+import base64
+import hashlib
+import hmac
+from collections import Counter
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from app.catalog.invalidation import (
+    CatalogInvalidator,
+    RegistryChangePoller,
+    RegistryEvent,
+    affects,
+    parse_registry_event,
+    verify_signature,
+)
+from app.clients.cache import TTLCache, make_cache_key
+
+
+def sign(secret, delivery_id, timestamp, body):
+    digest = hmac.new(
+        secret.encode(), f"{delivery_id}.{timestamp}.".encode() + body, hashlib.sha256
+    ).digest()
+    return "v1," + base64.b64encode(digest).decode()
+
+
+def test_parse_mlflow_and_databricks_events():
+    assert parse_registry_event(
+        {
+            "entity": "model_version",
+            "action": "created",
+            "data": {"name": "iris", "version": "3"},
+        }
+    ) == RegistryEvent("model_version.created", "iris", "3")
+    assert parse_registry_event(
+        {
+            "event": "MODEL_VERSION_TRANSITIONED_STAGE",
+            "model_name": "iris",
+            "version": 2,
+        }
+    ) == RegistryEvent("MODEL_VERSION_TRANSITIONED_STAGE", "iris", "2")
+    assert parse_registry_event({"entity": "model_version", "data": {}}) is None
+    assert parse_registry_event([]) is None
+
+
+def test_verify_signature():
+    body = b'{"entity": "model_version"}'
+    signature = sign("secret", "d-1", "1000", body)
+
+    assert verify_signature("secret", body, "d-1", "1000", signature, 300, now=1100)
+    assert not verify_signature("other", body, "d-1", "1000", signature, 300, now=1100)
+    assert not verify_signature("secret", body, "d-2", "1000", signature, 300, now=1100)
+    assert not verify_signature("secret", body, "d-1", "1000", signature, 300, now=2000)
+    assert not verify_signature("secret", body, "d-1", "soon", signature, 300, now=1100)
+
+
+def test_affects_only_the_changed_model():
+    event = RegistryEvent("model_version_tag.set", "iris", "2")
+
+    assert affects(make_cache_key("get_latest_model_version", {"name": "iris"}), event)
+    assert affects(
+        make_cache_key(
+            "get_latest_model_version", {"name": "iris", "alias": "champion"}
+        ),
+        event,
+    )
+    assert affects(
+        make_cache_key("get_model_version", {"name": "iris", "version": 2}), event
+    )
+    assert not affects(
+        make_cache_key("get_model_version", {"name": "iris", "version": 1}), event
+    )
+    assert not affects(
+        make_cache_key("get_latest_model_version", {"name": "wine"}), event
+    )
+    assert affects(make_cache_key("get_registered_models", {"max_results": 10}), event)
+
+
+def mlflow_client():
+    client = Mock()
+    client.cache = TTLCache(max_entries=10, max_bytes=4096)
+    client.popularity = Counter()
+    client.invalidate_matching = AsyncMock(side_effect=client.cache.invalidate_matching)
+    client.get_latest_model_version = AsyncMock(return_value={})
+    return client
+
+
+@pytest.mark.anyio
+async def test_invalidator_evicts_affected_entries():
+    client = mlflow_client()
+    for name in ("iris", "wine"):
+        client.cache.set(
+            make_cache_key("get_latest_model_version", {"name": name}), {}, 60
+        )
+    invalidator = CatalogInvalidator(client)
+
+    assert (
+        await invalidator.invalidate(
+            RegistryEvent("model_version.created", "iris", "3")
+        )
+        == 1
+    )
+    assert (
+        client.cache.get(make_cache_key("get_latest_model_version", {"name": "wine"}))
+        == {}
+    )
+    assert invalidator.stats()["invalidated"] == 1
+
+
+@pytest.mark.anyio
+async def test_invalidator_records_refresh_failures():
+    client = mlflow_client()
+    client.get_latest_model_version.side_effect = RuntimeError("MLflow is down")
+    invalidator = CatalogInvalidator(client)
+
+    await invalidator.refresh("iris")
+
+    assert invalidator.stats()["failures"] == 1
+
+
+@pytest.mark.anyio
+async def test_poller_reports_models_updated_since_last_poll():
+    registry = {"iris": 100, "wine": 200}
+
+    async def perform_request(_method, _path, params):
+        models = sorted(registry.items(), key=lambda item: -item[1])
+        response = Mock()
+        response.json.return_value = {
+            "registered_models": [
+                {"name": name, "last_updated_timestamp": updated}
+                for name, updated in models[: params["max_results"]]
+            ]
+        }
+        return response
+
+    client = mlflow_client()
+    client.perform_request = perform_request
+    client.cache.set(
+        make_cache_key("get_latest_model_version", {"name": "iris"}), {}, 60
+    )
+    poller = RegistryChangePoller(client, CatalogInvalidator(client), interval=1.0)
+
+    assert await poller.poll() == []
+    assert poller.watermark == 200
+    assert await poller.poll() == []
+
+    registry["iris"] = 300
+    assert await poller.poll() == ["iris"]
+    assert len(client.cache) == 0
+    client.get_latest_model_version.assert_awaited_once_with("iris", refresh=True)
+    assert await poller.poll() == []
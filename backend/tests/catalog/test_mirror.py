@@ -0,0 +1,225 @@
+import sqlite3
+
+import pytest
+
+from app.catalog.mirror import (
+    CatalogMirror,
+    InvalidPageToken,
+    parse_order_by,
+    translate_filter,
+)
+
+
+def model(name, updated, versions):
+    return {
+        "name": name,
+        "creation_timestamp": 1000,
+        "last_updated_timestamp": updated,
+        "latest_versions": [{"name": name, "version": str(v)} for v in versions],
+    }
+
+
+def version(name, number, stage="None", created=None):
+    return {
+        "name": name,
+        "version": str(number),
+        "creation_timestamp": created or 1000 + number,
+        "last_updated_timestamp": 1000 + number,
+        "current_stage": stage,
+        "description": f"{name} v{number}",
+        "source": f"s3://models/{name}/{number}",
+        "tags": [{"key": "approved", "value": "true"}],
+    }
+
+
+@pytest.fixture
+def now():
+    return [100.0]
+
+
+@pytest.fixture
+def mirror(tmp_path, now):
+    mirror = CatalogMirror(
+        connect=lambda: sqlite3.connect(
+            tmp_path / "mirror.db", check_same_thread=False
+        ),
+        paramstyle="qmark",
+        pool_size=2,
+        max_lag=60.0,
+        clock=lambda: now[0],
+    )
+    mirror.open()
+    mirror.replace_all(
+        [
+            model("churn", 3000, [2]),
+            model("iris", 2000, [1, 3]),
+            model("wine", 1000, [1]),
+        ],
+        [
+            version("churn", 1),
+            version("churn", 2),
+            version("iris", 1, stage="Production"),
+            version("iris", 2),
+            version("iris", 3),
+            version("wine", 1),
+        ],
+        synced_at=now[0],
+    )
+    yield mirror
+    mirror.close()
+
+
+def test_translate_filter():
+    assert translate_filter(None) == ([], [])
+    assert translate_filter("name = 'o''brien'") == (["name = ?"], ["o'brien"])
+    assert translate_filter("name ILIKE 'Ir%'") == (
+        ["LOWER(name) LIKE LOWER(?)"],
+        ["Ir%"],
+    )
+    assert translate_filter("tags.approved = 'true'") is None
+
+
+def test_parse_order_by():
+    columns = {"name": "name", "last_updated_timestamp": "last_updated_timestamp"}
+    assert parse_order_by(None, columns) == ("name", False)
+    assert parse_order_by(["last_updated_timestamp DESC"], columns) == (
+        "last_updated_timestamp",
+        True,
+    )
+    assert parse_order_by(["name", "last_updated_timestamp"], columns) is None
+    assert parse_order_by(["run_id"], columns) is None
+
+
+def test_search_registered_models_lists_latest_versions(mirror):
+    result = mirror.search_registered_models(max_results=10)
+
+    assert [(m["name"], m["version"]) for m in result["models"]] == [
+        ("churn", "2"),
+        ("iris", "1"),
+        ("iris", "3"),
+        ("wine", "1"),
+    ]
+    assert result["models"][0] == {
+        "name": "churn",
+        "version": "2",
+        "creation_timestamp": 1002,
+        "tags": [{"key": "approved", "value": "true"}],
+        "description": "churn v2",
+        "source": "s3://models/churn/2",
+    }
+    assert result["page_token"] is None
+
+
+def test_keyset_pagination_follows_ordering(mirror):
+    order_by = ["last_updated_timestamp DESC"]
+
+    first = mirror.search_registered_models(max_results=2, order_by=order_by)
+    second = mirror.search_registered_models(
+        max_results=2, order_by=order_by, page_token=first["page_token"]
+    )
+
+    assert [m["name"] for m in first["models"]] == ["churn", "iris", "iris"]
+    assert [m["name"] for m in second["models"]] == ["wine"]
+    assert second["page_token"] is None
+    with pytest.raises(InvalidPageToken):
+        mirror.search_registered_models(max_results=2, page_token=first["page_token"])
+
+
+def test_search_model_versions(mirror):
+    pages, token = [], None
+    while True:
+        result = mirror.search_model_versions(
+            filter="name LIKE 'i%'",
+            max_results=2,
+            order_by=["version_number DESC"],
+            page_token=token,
+        )
+        pages.append([m["version"] for m in result["models"]])
+        token = result["page_token"]
+        if token is None:
+            break
+
+    assert pages == [["3", "2"], ["1"]]
+
+
+def test_unsupported_search_returns_none(mirror):
+    assert mirror.search_model_versions(filter="run_id = 'abc'") is None
+    assert mirror.search_registered_models(order_by=["name", "timestamp"]) is None
+
+
+def test_point_lookups(mirror):
+    assert mirror.get_model_version("iris", 2)["source"] == "s3://models/iris/2"
+    assert mirror.get_model_version("iris", 9) is None
+    assert mirror.get_latest_model_version("iris")["version"] == "3"
+    assert mirror.get_latest_model_version("iris", stage="production")["version"] == "1"
+
+
+def test_replace_models_keeps_other_models(mirror, now):
+    now[0] = 130.0
+    mirror.replace_models(
+        [model("iris", 4000, [4])], [version("iris", 4)], synced_at=now[0]
+    )
+
+    result = mirror.search_model_versions(filter="name = 'iris'")
+    assert [m["version"] for m in result["models"]] == ["4"]
+    assert mirror.get_model_version("wine", 1) is not None
+    assert mirror.watermark == 4000
+    assert mirror.synced_at == 130.0
+
+
+def test_serves_until_stale(mirror, now):
+    assert mirror.serves("model_versions")
+
+    now[0] += 61.0
+
+    assert not mirror.serves("model_versions")
+    assert mirror.serves("model_versions", page_token="mirror:abc")
+    assert not mirror.serves("model_versions", page_token="mlflow-token")
+    assert mirror.stats()["fresh"] is False
+
+
+@pytest.mark.usefixtures("mirror")
+def test_state_survives_reopen(tmp_path):
+    reopened = CatalogMirror(
+        connect=lambda: sqlite3.connect(
+            tmp_path / "mirror.db", check_same_thread=False
+        ),
+        paramstyle="qmark",
+    )
+    reopened.open()
+
+    assert reopened.watermark == 3000
+    assert reopened.synced_at == 100.0
+    assert reopened.full_synced_at == 100.0
+
+
+def test_load_state_sees_other_writers(tmp_path, mirror, now):
+    reader = CatalogMirror(
+        connect=lambda: sqlite3.connect(
+            tmp_path / "mirror.db", check_same_thread=False
+        ),
+        paramstyle="qmark",
+    )
+    reader.open()
+    mirror.replace_models([model("iris", 4000, [4])], [], synced_at=now[0] + 30)
+
+    reader.load_state()
+
+    assert reader.watermark == 4000
+    assert reader.synced_at == now[0] + 30
+
+
+def test_writes_take_the_advisory_lock(tmp_path):
+    locks = []
+
+    def connect():
+        connection = sqlite3.connect(tmp_path / "mirror.db", check_same_thread=False)
+        connection.create_function("pg_advisory_xact_lock", 1, locks.append)
+        return connection
+
+    mirror = CatalogMirror(connect=connect, paramstyle="qmark", write_lock=7)
+    mirror.open()
+    mirror.replace_all([model("iris", 2000, [1])], [version("iris", 1)], 100.0)
+    mirror.replace_models([model("iris", 3000, [1])], [version("iris", 1)], 130.0)
+
+    assert locks == [7, 7]
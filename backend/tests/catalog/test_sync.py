@@ -0,0 +1,166 @@
+import asyncio
+import sqlite3
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from app.catalog.mirror import CatalogMirror
+from app.catalog.sync import CatalogMirrorSync, name_filter
+from app.clients.mlflow import MODEL_VERSIONS_SEARCH_PATH
+
+
+def registered(name, updated, latest):
+    return {
+        "name": name,
+        "creation_timestamp": 1000,
+        "last_updated_timestamp": updated,
+        "latest_versions": [{"name": name, "version": str(latest)}],
+    }
+
+
+def version(name, number):
+    return {
+        "name": name,
+        "version": str(number),
+        "creation_timestamp": 1000 + number,
+        "last_updated_timestamp": 1000 + number,
+        "source": f"s3://models/{name}/{number}",
+    }
+
+
+class FakeMLflow:
+    """
+    Serves registered model and model version searches from lists, one result per page.
+    """
+
+    def __init__(self, models, versions):
+        self.models = models
+        self.versions = versions
+        self.perform_request = AsyncMock(side_effect=self.respond)
+
+    async def respond(self, method, path, params):
+        if path == MODEL_VERSIONS_SEARCH_PATH:
+            items = [
+                v
+                for v in self.versions
+                if "filter" not in params or params["filter"] == name_filter(v["name"])
+            ]
+            key = "model_versions"
+        else:
+            items = sorted(
+                self.models, key=lambda m: m["last_updated_timestamp"], reverse=True
+            )
+            key = "registered_models"
+        start = int(params.get("page_token", 0))
+        data = {key: items[start : start + 1]}
+        if start + 1 < len(items):
+            data["next_page_token"] = str(start + 1)
+        return Mock(json=Mock(return_value=data))
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    mirror = CatalogMirror(
+        connect=lambda: sqlite3.connect(
+            tmp_path / "mirror.db", check_same_thread=False
+        ),
+        paramstyle="qmark",
+    )
+    mirror.open()
+    yield mirror
+    mirror.close()
+
+
+def test_name_filter_quotes():
+    assert name_filter("iris") == "name='iris'"
+    assert name_filter("o'brien") == 'name="o\'brien"'
+    assert name_filter('say "o\'brien"') == "name LIKE 'say _o_brien_'"
+
+
+@pytest.mark.anyio
+async def test_first_sync_is_full(mirror):
+    mlflow = FakeMLflow(
+        [registered("iris", 2000, 2), registered("wine", 1000, 1)],
+        [version("iris", 1), version("iris", 2), version("wine", 1)],
+    )
+    sync = CatalogMirrorSync(mlflow, mirror, page_size=1)
+
+    result = await sync.sync()
+
+    assert result == {"full": True, "models": 2, "versions": 3}
+    assert mirror.watermark == 2000
+    assert mirror.get_latest_model_version("iris")["version"] == "2"
+
+
+@pytest.mark.anyio
+async def test_incremental_sync_reads_changed_models_only(mirror):
+    mlflow = FakeMLflow(
+        [registered("iris", 2000, 1), registered("wine", 1000, 1)],
+        [version("iris", 1), version("wine", 1)],
+    )
+    sync = CatalogMirrorSync(mlflow, mirror, full_sync_interval=3600, page_size=1)
+    await sync.sync()
+    mlflow.models[0] = registered("iris", 3000, 2)
+    mlflow.versions.append(version("iris", 2))
+    mlflow.perform_request.reset_mock()
+
+    result = await sync.sync()
+
+    assert result == {"full": False, "models": 1, "versions": 2}
+    assert mirror.get_model_version("iris", 2) is not None
+    assert mirror.watermark == 3000
+    # Only iris changed; its versions are read in two pages of one.
+    version_calls = [
+        call.kwargs["params"].get("filter")
+        for call in mlflow.perform_request.call_args_list
+        if call.args[1] == MODEL_VERSIONS_SEARCH_PATH
+    ]
+    assert version_calls == ["name='iris'", "name='iris'"]
+
+
+@pytest.mark.anyio
+async def test_full_sync_drops_deleted_models(mirror):
+    mlflow = FakeMLflow(
+        [registered("iris", 2000, 1), registered("wine", 1000, 1)],
+        [version("iris", 1), version("wine", 1)],
+    )
+    sync = CatalogMirrorSync(mlflow, mirror)
+    await sync.sync()
+    del mlflow.models[1]
+    del mlflow.versions[1]
+
+    await sync.sync(full=True)
+
+    assert mirror.get_model_version("wine", 1) is None
+    assert sync.stats()["full_syncs"] == 2
+
+
+@pytest.mark.anyio
+async def test_incremental_sync_drops_names_matched_by_a_pattern(mirror):
+    quoted, lookalike = 'say "o\'brien"', "say 'o\"brien'"
+    mlflow = FakeMLflow(
+        [registered(quoted, 2000, 1), registered(lookalike, 1000, 1)],
+        [version(quoted, 1), version(lookalike, 1)],
+    )
+    sync = CatalogMirrorSync(mlflow, mirror, full_sync_interval=3600)
+    await sync.sync()
+    mlflow.models[0] = registered(quoted, 3000, 1)
+
+    result = await sync.sync()
+
+    assert result == {"full": False, "models": 1, "versions": 1}
+    assert mirror.get_model_version(lookalike, 1) is not None
+
+
+@pytest.mark.anyio
+async def test_follow_reloads_the_sync_state(mirror):
+    follower = CatalogMirrorSync(Mock(), mirror, interval=0.01)
+    mirror.load_state = Mock(
+        side_effect=[None, RuntimeError("database is down"), asyncio.CancelledError]
+    )
+
+    with pytest.raises(asyncio.CancelledError):
+        await follower.follow()
+
+    assert follower.stats()["failures"] == 1
+    assert follower.stats()["last_error"] == "database is down"
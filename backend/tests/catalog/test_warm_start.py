@@ -0,0 +1,84 @@
+from collections import Counter
+from unittest.mock import AsyncMock, Mock
+
+import orjson
+import pytest
+
+from app.catalog.warm_start import SNAPSHOT_FORMAT, CacheSnapshot, CatalogPreWarmer
+from app.clients.cache import TTLCache, make_cache_key
+
+PINNED = make_cache_key("get_model_version", {"name": "iris", "version": 2})
+PAGE = make_cache_key("get_registered_models", {"max_results": 100})
+LATEST = make_cache_key("get_latest_model_version", {"name": "iris"})
+
+
+def mlflow_client():
+    client = Mock()
+    client.cache = TTLCache(max_entries=10, max_bytes=4096, clock=lambda: 0.0)
+    client.popularity = Counter()
+    return client
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "snapshot.json")
+
+
+def test_snapshot_keeps_expiry_across_restart(path):
+    before = mlflow_client()
+    before.cache.set(PINNED, {"name": "iris", "version": "2"}, ttl=100)
+    before.cache.set(PAGE, {"models": [], "page_token": None}, ttl=50)
+    before.cache.set(LATEST, {"name": "iris", "version": "2"}, ttl=100)
+    before.popularity["iris"] = 3
+
+    assert CacheSnapshot(before, path, clock=lambda: 1000.0).save() == 2
+
+    after = mlflow_client()
+    snapshot = CacheSnapshot(after, path, clock=lambda: 1060.0)
+    assert snapshot.load() == 1
+    assert after.cache.items() == [(PINNED, {"name": "iris", "version": "2"}, 40.0)]
+    assert after.popularity["iris"] == 3
+
+
+def test_incompatible_snapshot_is_ignored(path):
+    with open(path, "wb") as snapshot:
+        snapshot.write(orjson.dumps({"format": SNAPSHOT_FORMAT + 1, "entries": []}))
+
+    assert CacheSnapshot(mlflow_client(), path).load() == 0
+
+
+def test_damaged_snapshot_is_recorded(path):
+    with open(path, "w") as snapshot:
+        snapshot.write('{"format": 1, "entr')
+    snapshot = CacheSnapshot(mlflow_client(), path)
+
+    assert snapshot.load() == 0
+    assert snapshot.stats()["failures"] == 1
+    assert CacheSnapshot(mlflow_client(), path + ".missing").load() == 0
+
+
+@pytest.mark.anyio
+async def test_checkpoint_records_failures(tmp_path):
+    snapshot = CacheSnapshot(mlflow_client(), str(tmp_path / "missing" / "snapshot"))
+
+    await snapshot.checkpoint()
+
+    assert snapshot.stats()["failures"] == 1
+    assert snapshot.stats()["last_error"]
+
+
+@pytest.mark.anyio
+async def test_prewarmer_refreshes_hottest_models():
+    client = mlflow_client()
+    client.popularity.update({"iris": 5, "wine": 3, "churn": 1})
+    client.get_latest_model_version = AsyncMock(
+        side_effect=[{}, RuntimeError("MLflow is down")]
+    )
+    prewarmer = CatalogPreWarmer(client, top_n=2, interval=1.0)
+
+    assert await prewarmer.warm() == 1
+
+    client.get_latest_model_version.assert_any_await("iris", refresh=True)
+    client.get_latest_model_version.assert_any_await("wine", refresh=True)
+    assert client.popularity == Counter({"iris": 2, "wine": 1})
+    assert prewarmer.stats()["failures"] == 1
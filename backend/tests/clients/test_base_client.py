@@ -1,9 +1,12 @@
 from unittest.mock import Mock, patch
 
 import pytest
-from httpx import HTTPStatusError, Request, Response
+from httpx import ConnectError, HTTPStatusError, Limits, Request, Response
 
-from app.clients.base_client import BaseClient, BaseClientError
+from app.clients.base_client import AsyncBaseClient, BaseClient, BaseClientError
+from app.clients.resilience import CircuitBreaker, RetryPolicy
+from app.core.config import settings
+from app.core.metrics import Histogram
 
 
 class CustomClientError(BaseClientError):
@@ -72,3 +75,192 @@ class TestBaseClient:
         response = client.perform_request("post", "/test", json={"key": "value"})
         assert response.status_code == 201
         assert response.json() == {"message": "success"}
+
+    def test_pool_limits_from_settings(self, client):
+        pool = client.session._transport._pool
+        assert pool._max_connections == settings.HTTP_MAX_CONNECTIONS
+        assert (
+            pool._max_keepalive_connections == settings.HTTP_MAX_KEEPALIVE_CONNECTIONS
+        )
+        assert pool._keepalive_expiry == settings.HTTP_KEEPALIVE_EXPIRY
+
+    def test_custom_pool_limits(self):
+        client = BaseClient(
+            base_uri="http://example.com",
+            error_class=CustomClientError,
+            limits=Limits(max_connections=5, max_keepalive_connections=2),
+        )
+        assert client.session._transport._pool._max_connections == 5
+
+    def test_close(self):
+        with BaseClient(
+            base_uri="http://example.com", error_class=CustomClientError
+        ) as client:
+            assert not client.session.is_closed
+        assert client.session.is_closed
+
+
+class TestAsyncBaseClient:
+    @pytest.fixture
+    def client(self):
+        return AsyncBaseClient(
+            base_uri="http://example.com", error_class=CustomClientError
+        )
+
+    @pytest.mark.anyio
+    @patch("httpx.AsyncClient.request")
+    async def test_perform_request_success(self, mock_request, client):
+        mock_response = Mock(spec=Response)
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"message": "success"}
+        mock_request.return_value = mock_response
+
+        response = await client.perform_request("get", "/test", params={"k": "v"})
+        assert response.status_code == 200
+        assert response.json() == {"message": "success"}
+        mock_request.assert_awaited_once_with(
+            "get", "http://example.com/test", params={"k": "v"}, json=None
+        )
+
+    @pytest.mark.anyio
+    @patch("httpx.AsyncClient.request")
+    async def test_perform_request_failure(self, mock_request, client):
+        mock_response = Mock(spec=Response)
+        mock_response.status_code = 404
+        mock_response.text = "not found"
+        mock_response.raise_for_status.side_effect = HTTPStatusError(
+            "Error message", request=Mock(spec=Request), response=mock_response
+        )
+        mock_request.return_value = mock_response
+
+        with pytest.raises(CustomClientError) as excinfo:
+            await client.perform_request("get", "/test")
+        assert "AsyncBaseClient request failure" in str(excinfo.value)
+        assert excinfo.value.raw_response.status_code == 404
+
+    @pytest.mark.anyio
+    async def test_close(self):
+        async with AsyncBaseClient(
+            base_uri="http://example.com", error_class=CustomClientError
+        ) as client:
+            assert not client.session.is_closed
+        assert client.session.is_closed
+
+
+class TestBaseClientResilience:
+    @pytest.fixture
+    def client(self):
+        return BaseClient(
+            base_uri="http://example.com",
+            error_class=CustomClientError,
+            retry_policy=RetryPolicy(max_attempts=3, backoff_base=0, backoff_max=1),
+            circuit_breaker=CircuitBreaker(failure_threshold=2, recovery_timeout=60),
+        )
+
+    @staticmethod
+    def response(status_code):
+        return Response(status_code, request=Request("GET", "http://example.com"))
+
+    @patch("httpx.Client.request")
+    def test_retries_transient_failures(self, mock_request, client):
+        mock_request.side_effect = [self.response(503), self.response(200)]
+
+        response = client.perform_request("get", "/test")
+
+        assert response.status_code == 200
+        assert mock_request.call_count == 2
+        assert client.stats()["retries"] == 1
+
+    @patch("httpx.Client.request")
+    def test_gives_up_after_max_attempts(self, mock_request, client):
+        client.circuit_breaker.failure_threshold = 10
+        mock_request.return_value = self.response(502)
+
+        with pytest.raises(CustomClientError) as excinfo:
+            client.perform_request("get", "/test")
+        assert excinfo.value.raw_response.status_code == 502
+        assert mock_request.call_count == 3
+
+    @patch("httpx.Client.request")
+    def test_does_not_retry_post_on_server_error(self, mock_request, client):
+        mock_request.return_value = self.response(500)
+
+        with pytest.raises(CustomClientError):
+            client.perform_request("post", "/test", json={})
+        assert mock_request.call_count == 1
+
+    @patch("httpx.Client.request")
+    def test_retries_transport_errors(self, mock_request, client):
+        mock_request.side_effect = [ConnectError("refused"), self.response(200)]
+
+        assert client.perform_request("get", "/test").status_code == 200
+
+    @patch("httpx.Client.request")
+    def test_circuit_breaker_fails_fast(self, mock_request, client):
+        mock_request.return_value = self.response(503)
+
+        with pytest.raises(CustomClientError):
+            client.perform_request("get", "/test")
+        assert client.stats()["circuit_breaker"]["state"] == "open"
+
+        mock_request.reset_mock()
+        with pytest.raises(CustomClientError) as excinfo:
+            client.perform_request("get", "/test")
+        assert "circuit breaker is open" in str(excinfo.value)
+        mock_request.assert_not_called()
+
+    def test_timeout_settings(self, client):
+        assert client.session.timeout.read == settings.HTTP_TIMEOUT
+        assert client.session.timeout.connect == settings.HTTP_CONNECT_TIMEOUT
+
+
+class TestBaseClientMetrics:
+    @pytest.fixture
+    def client(self):
+        return BaseClient(
+            base_uri="http://example.com",
+            error_class=CustomClientError,
+            retry_policy=RetryPolicy(max_attempts=2, backoff_base=0, backoff_max=1),
+        )
+
+    @pytest.fixture
+    def histogram(self, monkeypatch):
+        histogram = Histogram("test_upstream_seconds", "test", ("u", "m", "o"))
+        monkeypatch.setattr(
+            "app.clients.base_client.UPSTREAM_REQUEST_DURATION", histogram
+        )
+        return histogram
+
+    @staticmethod
+    def counts(histogram):
+        return {
+            tuple(labels.values()): value
+            for name, labels, value in histogram.samples()
+            if name.endswith("_count")
+        }
+
+    @patch("httpx.Client.request")
+    def test_records_one_observation_per_call(self, mock_request, client, histogram):
+        request = Request("GET", "http://example.com")
+        mock_request.side_effect = [
+            Response(503, request=request),
+            Response(200, request=request),
+            Response(404, request=request),
+            ConnectError("refused"),
+            ConnectError("refused"),
+        ]
+
+        client.perform_request("get", "/test")
+        with pytest.raises(CustomClientError):
+            client.perform_request("get", "/test")
+        with pytest.raises(CustomClientError):
+            client.perform_request("get", "/test")
+
+        assert self.counts(histogram) == {
+            ("upstream", "GET", "2xx"): 1,
+            ("upstream", "GET", "4xx"): 1,
+            ("upstream", "GET", "error"): 1,
+        }
+
+    def test_pool_stats(self, client):
+        assert client.pool_stats() == {"open": 0, "idle": 0}
@@ -0,0 +1,234 @@
+import sqlite3
+import time
+
+import pytest
+
+from app.clients.cache import SharedTTLCache, TTLCache, make_cache_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(clock):
+    return TTLCache(max_entries=3, max_bytes=1024, clock=clock)
+
+
+def test_make_cache_key_normalizes_params():
+    assert make_cache_key("op", {"b": 2, "a": "1", "c": None}) == make_cache_key(
+        "op", {"a": 1, "b": "2", "c": ""}
+    )
+    assert make_cache_key("op", {"a": 1}) != make_cache_key("other", {"a": 1})
+
+
+def test_get_set(cache):
+    key = make_cache_key("op", {"a": 1})
+    assert cache.get(key) is None
+    cache.set(key, {"value": 1}, ttl=10)
+    assert cache.get(key) == {"value": 1}
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_expiry(cache, clock):
+    cache.set("key", {"value": 1}, ttl=10)
+    clock.now = 10
+    assert cache.get("key") is None
+    assert cache.stats()["expirations"] == 1
+    assert len(cache) == 0
+
+
+def test_lru_eviction_by_entries(cache):
+    for key in ("a", "b", "c"):
+        cache.set(key, {"key": key}, ttl=10)
+    cache.get("a")
+    cache.set("d", {"key": "d"}, ttl=10)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"key": "a"}
+    assert cache.stats()["evictions"] == 1
+
+
+def test_lru_eviction_by_bytes(clock):
+    cache = TTLCache(max_entries=10, max_bytes=40, clock=clock)
+    cache.set("a", {"value": "x" * 10}, ttl=10)
+    cache.set("b", {"value": "y" * 10}, ttl=10)
+
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+    assert cache.stats()["bytes"] <= 40
+
+
+def test_oversized_and_disabled(clock):
+    cache = TTLCache(max_entries=10, max_bytes=8, clock=clock)
+    cache.set("a", {"value": "too large"}, ttl=10)
+    assert len(cache) == 0
+
+    disabled = TTLCache(max_entries=0, max_bytes=1024, clock=clock)
+    disabled.set("a", {}, ttl=10)
+    assert disabled.get("a") is None
+
+
+def test_invalidate_and_clear(cache):
+    cache.set("a", {}, ttl=10)
+    cache.set("b", {}, ttl=10)
+    cache.invalidate("a")
+    assert cache.get("a") is None
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.stats()["bytes"] == 0
+
+
+@pytest.fixture
+def shared_cache(tmp_path, clock):
+    cache = SharedTTLCache(
+        str(tmp_path / "cache.sqlite3"), max_entries=3, max_bytes=1024, clock=clock
+    )
+    yield cache
+    cache.close()
+
+
+def test_shared_get_set(shared_cache):
+    key = make_cache_key("op", {"a": 1})
+    assert shared_cache.get(key) is None
+    shared_cache.set(key, {"value": 1}, ttl=10)
+
+    assert shared_cache.get(key) == {"value": 1}
+    assert shared_cache.stats()["hits"] == 1
+    assert shared_cache.stats()["misses"] == 1
+
+
+def test_shared_entries_are_visible_to_other_processes(tmp_path, clock):
+    path = str(tmp_path / "cache.sqlite3")
+    writer = SharedTTLCache(path, max_entries=10, max_bytes=1024, clock=clock)
+    reader = SharedTTLCache(path, max_entries=10, max_bytes=1024, clock=clock)
+    key = make_cache_key("op", {"a": 1})
+
+    writer.set(key, {"value": 1}, ttl=10)
+    assert reader.get(key) == {"value": 1}
+    reader.invalidate(key)
+    assert writer.get(key) is None
+
+    writer.close()
+    reader.close()
+
+
+def test_shared_expiry(shared_cache, clock):
+    shared_cache.set("key", {"value": 1}, ttl=10)
+    clock.now = 10
+
+    assert shared_cache.get("key") is None
+    assert shared_cache.stats()["expirations"] == 1
+
+
+def test_shared_eviction_prefers_entries_closest_to_expiry(tmp_path, clock):
+    cache = SharedTTLCache(
+        str(tmp_path / "cache.sqlite3"), max_entries=2, max_bytes=1024, clock=clock
+    )
+    cache.PRUNE_EVERY = 1
+    cache.set("a", {"key": "a"}, ttl=30)
+    cache.set("b", {"key": "b"}, ttl=10)
+    cache.set("c", {"key": "c"}, ttl=20)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"key": "a"}
+    assert cache.stats()["evictions"] == 1
+    assert len(cache) == 2
+    cache.close()
+
+
+def test_shared_eviction_by_bytes_is_one_statement(tmp_path, clock):
+    cache = SharedTTLCache(
+        str(tmp_path / "cache.sqlite3"), max_entries=10, max_bytes=25, clock=clock
+    )
+    statements = []
+    cache._connect().set_trace_callback(statements.append)
+    cache.PRUNE_EVERY = 4
+    for ttl, key in enumerate("abcd", start=1):
+        cache.set(key, {"key": key}, ttl=ttl * 10)
+
+    assert cache.get("a") is None
+    assert cache.get("b") is None
+    assert cache.get("c") == {"key": "c"}
+    assert cache.stats()["evictions"] == 2
+    assert sum(statement.startswith("DELETE") for statement in statements) == 2
+    cache.close()
+
+
+def test_shared_cache_does_not_wait_on_a_busy_store(shared_cache, tmp_path):
+    shared_cache.set("a", {"value": 1}, ttl=10)
+    other = sqlite3.connect(str(tmp_path / "cache.sqlite3"), isolation_level=None)
+    other.execute("BEGIN EXCLUSIVE")
+    try:
+        started = time.monotonic()
+        shared_cache.set("b", {"value": 2}, ttl=10)
+        assert time.monotonic() - started < 1.0
+        # WAL readers never wait for the writer.
+        assert shared_cache.get("a") == {"value": 1}
+    finally:
+        other.execute("ROLLBACK")
+        other.close()
+
+    assert shared_cache.get("b") is None
+
+
+def test_shared_cache_reopens_after_close(shared_cache):
+    shared_cache.set("a", {"value": 1}, ttl=10)
+    shared_cache.close()
+
+    assert shared_cache.get("a") == {"value": 1}
+
+
+def test_shared_oversized_disabled_and_clear(shared_cache, tmp_path, clock):
+    shared_cache.set("large", {"value": "x" * 2048}, ttl=10)
+    shared_cache.set("a", {}, ttl=10)
+    assert shared_cache.get("large") is None
+    shared_cache.clear()
+    assert len(shared_cache) == 0
+
+    disabled = SharedTTLCache(
+        str(tmp_path / "disabled.sqlite3"), max_entries=0, max_bytes=1024, clock=clock
+    )
+    disabled.set("a", {}, ttl=10)
+    assert disabled.get("a") is None
+    disabled.close()
+
+
+def test_items_list_live_entries(cache, clock, tmp_path):
+    cache.set(("op", (("a", "1"),)), {"value": 1}, ttl=10)
+    cache.set("expired", {}, ttl=1)
+    clock.now = 4
+    assert cache.items() == [(("op", (("a", "1"),)), {"value": 1}, 6)]
+
+    shared = SharedTTLCache(
+        str(tmp_path / "cache.sqlite3"), max_entries=3, max_bytes=1024, clock=clock
+    )
+    shared.set(("op", (("a", "1"),)), {"value": 1}, ttl=10)
+    assert shared.items() == [(("op", (("a", "1"),)), {"value": 1}, 10)]
+    shared.close()
+
+
+def test_invalidate_matching(cache, tmp_path, clock):
+    shared = SharedTTLCache(
+        str(tmp_path / "cache.sqlite3"), max_entries=3, max_bytes=1024, clock=clock
+    )
+    for target in (cache, shared):
+        target.set(("latest", (("name", "iris"),)), {}, ttl=10)
+        target.set(("latest", (("name", "wine"),)), {}, ttl=10)
+
+        assert (
+            target.invalidate_matching(lambda key: dict(key[1])["name"] == "iris") == 1
+        )
+        assert target.get(("latest", (("name", "wine"),))) == {}
+        assert len(target) == 1
+    shared.close()
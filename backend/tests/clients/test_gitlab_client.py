@@ -8,10 +8,12 @@ from app.clients.gitlab import GitLabClientError
 
 def test_perform_commit_success(gitlab_client):
     with patch.object(gitlab_client, "perform_request") as mock_perform_request:
-        mock_response = Response(201, request=Request("POST", "https://gitlab.com"))
+        mock_response = Response(
+            201, request=Request("POST", "https://gitlab.com"), json={"id": "abc123"}
+        )
         mock_perform_request.return_value = mock_response
 
-        gitlab_client.perform_commit(
+        commit = gitlab_client.perform_commit(
             project_id="57850499",
             branch="main",
             commit_message="Test commit",
@@ -39,6 +41,7 @@ def test_perform_commit_success(gitlab_client):
                 ],
             },
         )
+        assert commit == {"id": "abc123"}
 
 
 def test_perform_commit_http_error(gitlab_client):
@@ -66,3 +69,62 @@ def test_perform_commit_http_error(gitlab_client):
 
         assert str(exc_info.value) == "Failed to commit actions"
         assert exc_info.value.raw_response == mock_response
+
+
+def test_file_exists(gitlab_client):
+    with patch.object(gitlab_client, "perform_request") as mock_perform_request:
+        mock_perform_request.return_value = Response(
+            200, request=Request("HEAD", "https://gitlab.com")
+        )
+
+        assert gitlab_client.file_exists("57850499", "models/iris.yaml", "main")
+
+        mock_perform_request.assert_called_once_with(
+            "HEAD",
+            "/api/v4/projects/57850499/repository/files/models%2Firis.yaml",
+            params={"ref": "main"},
+        )
+
+
+def test_file_exists_not_found(gitlab_client):
+    with patch.object(gitlab_client, "perform_request") as mock_perform_request:
+        mock_perform_request.side_effect = GitLabClientError(
+            message="Not found",
+            raw_response=Response(404, request=Request("HEAD", "https://gitlab.com")),
+        )
+
+        assert not gitlab_client.file_exists("57850499", "models/iris.yaml", "main")
+
+
+def test_get_tree_follows_pages(gitlab_client):
+    with patch.object(gitlab_client, "perform_request") as mock_perform_request:
+        request = Request("GET", "https://gitlab.com")
+        mock_perform_request.side_effect = [
+            Response(
+                200,
+                request=request,
+                headers={"x-next-page": "2"},
+                json=[
+                    {"id": "a" * 40, "path": "models", "type": "tree"},
+                    {"id": "b" * 40, "path": "models/iris.yaml", "type": "blob"},
+                ],
+            ),
+            Response(
+                200,
+                request=request,
+                headers={"x-next-page": ""},
+                json=[{"id": "c" * 40, "path": "models/wine.yaml", "type": "blob"}],
+            ),
+        ]
+
+        blobs = gitlab_client.get_tree("57850499", "main", path="models")
+
+        assert blobs == {"models/iris.yaml": "b" * 40, "models/wine.yaml": "c" * 40}
+        assert mock_perform_request.call_count == 2
+        assert mock_perform_request.call_args.kwargs["params"] == {
+            "ref": "main",
+            "recursive": "true",
+            "per_page": 100,
+            "page": 2,
+            "path": "models",
+        }
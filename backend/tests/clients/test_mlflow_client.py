@@ -1,3 +1,19 @@
+import asyncio
+import threading
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from httpx import Response
+
+from app.clients.cache import SharedTTLCache
+from app.clients.mlflow import (
+    LATEST_VERSIONS_PATH,
+    MODEL_VERSION_BY_ALIAS_PATH,
+    REGISTERED_MODEL_PATH,
+    MLflowClient,
+    MLflowClientError,
+)
+from app.core.config import settings
 from tests import mlflow_test_data
 
 
@@ -13,11 +29,48 @@ def test_get_registered_models(mlflow_client, mock_response):
 
 
 def test_get_latest_model_version(mlflow_client, mock_response):
-    mock_response.json.return_value = mlflow_test_data.latest_model_version
+    mock_response.json.return_value = mlflow_test_data.registered_model
 
     result = mlflow_client.get_latest_model_version("churn_model")
     expected_result = mlflow_test_data.models_without_type[1]
     assert result == expected_result
+    mlflow_client.perform_request.assert_called_once_with(
+        "get", REGISTERED_MODEL_PATH, params={"name": "churn_model"}
+    )
+
+
+def test_get_latest_model_version_by_stage(mlflow_client, mock_response):
+    mock_response.json.return_value = mlflow_test_data.latest_model_version
+
+    result = mlflow_client.get_latest_model_version("churn_model", stage="Staging")
+    assert result == mlflow_test_data.models_without_type[1]
+    mlflow_client.perform_request.assert_called_once_with(
+        "get",
+        LATEST_VERSIONS_PATH,
+        params={"name": "churn_model", "stages": "Staging"},
+    )
+
+
+def test_get_latest_model_version_by_alias(mlflow_client, mock_response):
+    mock_response.json.return_value = mlflow_test_data.model_version
+
+    result = mlflow_client.get_latest_model_version("churn_model", alias="champion")
+    assert result == mlflow_test_data.models_without_type[1]
+    mlflow_client.perform_request.assert_called_once_with(
+        "get",
+        MODEL_VERSION_BY_ALIAS_PATH,
+        params={"name": "churn_model", "alias": "champion"},
+    )
+
+
+def test_get_latest_model_version_reuses_search(mlflow_client, mock_response):
+    mock_response.json.return_value = mlflow_test_data.registered_models
+
+    mlflow_client.get_registered_models()
+    result = mlflow_client.get_latest_model_version("churn_model")
+
+    assert result == mlflow_test_data.models_without_type[1]
+    assert mlflow_client.perform_request.call_count == 1
 
 
 def test_get_model_versions(mlflow_client, mock_response):
@@ -37,3 +90,285 @@ def test_get_model_version(mlflow_client, mock_response):
     result = mlflow_client.get_model_version("churn_model", "2")
     expected_result = mlflow_test_data.models_without_type[1]
     assert result == expected_result
+
+
+@pytest.mark.anyio
+async def test_async_get_registered_models(async_mlflow_client, mock_response):
+    mock_response.json.return_value = mlflow_test_data.registered_models
+
+    result = await async_mlflow_client.get_registered_models()
+    expected_result = {
+        "models": mlflow_test_data.models_without_type,
+        "page_token": None,
+    }
+    assert result == expected_result
+
+
+@pytest.mark.anyio
+async def test_async_get_latest_model_version(async_mlflow_client, mock_response):
+    mock_response.json.return_value = mlflow_test_data.registered_model
+
+    result = await async_mlflow_client.get_latest_model_version("churn_model")
+    expected_result = mlflow_test_data.models_without_type[1]
+    assert result == expected_result
+
+
+@pytest.mark.anyio
+async def test_async_get_model_versions(async_mlflow_client, mock_response):
+    mock_response.json.return_value = mlflow_test_data.model_versions
+
+    result = await async_mlflow_client.get_model_versions(filter=None)
+    expected_result = {
+        "models": mlflow_test_data.models_without_type,
+        "page_token": None,
+    }
+    assert result == expected_result
+
+
+@pytest.mark.anyio
+async def test_async_get_model_version(async_mlflow_client, mock_response):
+    mock_response.json.return_value = mlflow_test_data.model_version
+
+    result = await async_mlflow_client.get_model_version("churn_model", "2")
+    expected_result = mlflow_test_data.models_without_type[1]
+    assert result == expected_result
+
+
+def test_model_version_is_cached(mlflow_client, mock_response):
+    mock_response.json.return_value = mlflow_test_data.model_version
+
+    first = mlflow_client.get_model_version("churn_model", "2")
+    second = mlflow_client.get_model_version("churn_model", "2")
+
+    assert first == second
+    assert mlflow_client.perform_request.call_count == 1
+    assert mlflow_client.stats()["cache"]["hits"] == 1
+
+
+def test_refresh_bypasses_cache(mlflow_client, mock_response):
+    mock_response.json.return_value = mlflow_test_data.registered_models
+
+    mlflow_client.get_registered_models()
+    mlflow_client.get_registered_models(refresh=True)
+    mlflow_client.get_registered_models()
+
+    assert mlflow_client.perform_request.call_count == 2
+
+
+def test_webhooks_lengthen_latest_ttl(monkeypatch):
+    assert MLflowClient().cache_ttls["get_latest_model_version"] == (
+        settings.MLFLOW_CACHE_TTL_LATEST_VERSION
+    )
+    monkeypatch.setattr(settings, "MLFLOW_WEBHOOK_SECRET", "secret")
+
+    assert MLflowClient().cache_ttls["get_latest_model_version"] == (
+        settings.MLFLOW_CACHE_TTL_INVALIDATED
+    )
+
+
+def test_polling_keeps_short_ttls(monkeypatch):
+    monkeypatch.setattr(settings, "MLFLOW_CHANGE_POLL_INTERVAL", 5.0)
+    ttls = MLflowClient().cache_ttls
+
+    assert ttls["get_latest_model_version"] == settings.MLFLOW_CACHE_TTL_LATEST_VERSION
+    assert ttls["get_model_versions"] == settings.MLFLOW_CACHE_TTL_SEARCH
+
+
+def test_lookups_count_towards_popularity(mlflow_client, mock_response):
+    mock_response.json.return_value = mlflow_test_data.model_version
+
+    mlflow_client.get_model_version("churn_model", "2")
+    mlflow_client.get_model_version("churn_model", "2")
+    mlflow_client.get_model_version("churn_model", "2", refresh=True)
+
+    assert mlflow_client.popularity["churn_model"] == 2
+
+
+def test_failed_lookups_do_not_count_towards_popularity(mlflow_client):
+    mlflow_client.perform_request.side_effect = MLflowClientError("not found")
+
+    with pytest.raises(MLflowClientError):
+        mlflow_client.get_model_version("missing_model", "1")
+
+    assert "missing_model" not in mlflow_client.popularity
+
+
+def test_popularity_keeps_the_most_requested_names(mlflow_client, mock_response):
+    mlflow_client.POPULARITY_SIZE = 2
+    mock_response.json.return_value = mlflow_test_data.model_version
+    for name in ("a", "a", "b", "b", "c", "d", "e"):
+        mlflow_client.get_model_version(name, "1")
+
+    assert len(mlflow_client.popularity) <= 4
+    assert mlflow_client.popularity["a"] == 2
+    assert mlflow_client.popularity["b"] == 2
+
+
+def test_search_pages_are_cached_separately(mlflow_client, mock_response):
+    mock_response.json.return_value = mlflow_test_data.model_versions
+
+    mlflow_client.get_model_versions(filter="name='churn_model'")
+    mlflow_client.get_model_versions(filter="name='churn_model'", page_token="abc")
+
+    assert mlflow_client.perform_request.call_count == 2
+
+
+def test_clients_share_cache_file(monkeypatch, tmp_path, mock_response):
+    monkeypatch.setattr(settings, "MLFLOW_CACHE_PATH", str(tmp_path / "cache.sqlite3"))
+    first, second = MLflowClient(), MLflowClient()
+    for client in (first, second):
+        client.perform_request = Mock(return_value=mock_response)
+    mock_response.json.return_value = mlflow_test_data.model_version
+
+    assert isinstance(first.cache, SharedTTLCache)
+    assert first.get_model_version("churn_model", "2") == second.get_model_version(
+        "churn_model", "2"
+    )
+    assert second.perform_request.call_count == 0
+
+
+@pytest.mark.anyio
+async def test_async_model_version_is_cached(async_mlflow_client, mock_response):
+    mock_response.json.return_value = mlflow_test_data.model_version
+
+    await async_mlflow_client.get_model_version("churn_model", "2")
+    await async_mlflow_client.get_model_version("churn_model", "2")
+    await async_mlflow_client.get_model_version("churn_model", "2", refresh=True)
+
+    assert async_mlflow_client.perform_request.await_count == 2
+
+
+@pytest.mark.anyio
+async def test_async_concurrent_lookups_are_coalesced(
+    async_mlflow_client, mock_response
+):
+    mock_response.json.return_value = mlflow_test_data.model_version
+
+    async def slow_request(*_args, **_kwargs):
+        await asyncio.sleep(0.01)
+        return mock_response
+
+    async_mlflow_client.perform_request = AsyncMock(side_effect=slow_request)
+
+    results = await asyncio.gather(
+        *(async_mlflow_client.get_model_version("churn_model", "2") for _ in range(20))
+    )
+
+    assert all(result == mlflow_test_data.models_without_type[1] for result in results)
+    assert async_mlflow_client.perform_request.await_count == 1
+    assert async_mlflow_client.stats()["singleflight"]["coalesced"] == 19
+
+
+@pytest.mark.anyio
+async def test_async_refresh_after_invalidation_does_not_join_stale_lookup(
+    async_mlflow_client,
+):
+    stale = {**mlflow_test_data.model_version}
+    fresh = {
+        "model_version": {
+            **mlflow_test_data.model_version["model_version"],
+            "version": "3",
+        }
+    }
+    responses = iter([stale, fresh])
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def perform_request(*_args, **_kwargs):
+        body = next(responses)
+        started.set()
+        if body is stale:
+            await release.wait()
+        return Mock(json=Mock(return_value=body))
+
+    async_mlflow_client.perform_request = AsyncMock(side_effect=perform_request)
+    lookup = asyncio.ensure_future(
+        async_mlflow_client.get_model_version("churn_model", "2")
+    )
+    await started.wait()
+    await async_mlflow_client.invalidate_matching(lambda _key: True)
+    refreshed = await async_mlflow_client.get_model_version(
+        "churn_model", "2", refresh=True
+    )
+    release.set()
+    await lookup
+
+    assert refreshed["version"] == "3"
+    assert async_mlflow_client.perform_request.await_count == 2
+    cached = await async_mlflow_client.get_model_version("churn_model", "2")
+    assert cached["version"] == "3"
+
+
+@pytest.mark.anyio
+async def test_async_invalidation_runs_off_the_event_loop(async_mlflow_client):
+    async_mlflow_client.cache.set(("op", ()), {}, 60)
+    generation = async_mlflow_client.generation
+    threads = []
+
+    def predicate(_key):
+        threads.append(threading.get_ident())
+        return True
+
+    assert await async_mlflow_client.invalidate_matching(predicate) == 1
+
+    assert async_mlflow_client.generation == generation + 1
+    assert threads and threading.get_ident() not in threads
+
+
+@pytest.mark.anyio
+async def test_async_iter_model_version_pages(async_mlflow_client):
+    pages = [
+        {**mlflow_test_data.model_versions, "next_page_token": "page-2"},
+        {"model_versions": mlflow_test_data.model_versions["model_versions"][:1]},
+    ]
+    responses = [Mock(json=Mock(return_value=page)) for page in pages]
+    async_mlflow_client.perform_request = AsyncMock(side_effect=responses)
+
+    result = [
+        page async for page in async_mlflow_client.iter_model_version_pages(page_size=3)
+    ]
+
+    assert result == [
+        mlflow_test_data.models_without_type,
+        mlflow_test_data.models_without_type[:1],
+    ]
+    calls = async_mlflow_client.perform_request.await_args_list
+    assert calls[0].kwargs["params"]["max_results"] == 3
+    assert "page_token" not in calls[0].kwargs["params"]
+    assert calls[1].kwargs["params"]["page_token"] == "page-2"
+
+
+@pytest.mark.anyio
+async def test_async_get_model_version_batch(async_mlflow_client, mock_response):
+    not_found = Response(404, text="RESOURCE_DOES_NOT_EXIST")
+    in_flight = 0
+    max_in_flight = 0
+
+    async def perform_request(_method, _path, params=None, **_kwargs):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if params["name"] == "missing":
+            raise MLflowClientError("not found", raw_response=not_found)
+        return mock_response
+
+    mock_response.json.return_value = mlflow_test_data.model_version
+    async_mlflow_client.perform_request = AsyncMock(side_effect=perform_request)
+
+    refs = [("churn_model", version) for version in range(1, 6)]
+    results = await async_mlflow_client.get_model_version_batch(
+        [*refs, ("churn_model", 1), ("missing", 1)], concurrency=2
+    )
+
+    assert len(results) == 6
+    assert [(r["name"], r["version"]) for r in results] == [*refs, ("missing", 1)]
+    assert results[0]["model"] == mlflow_test_data.models_without_type[1]
+    assert results[-1] == {
+        "name": "missing",
+        "version": 1,
+        "error": "not found",
+        "status_code": 404,
+    }
+    assert max_in_flight == 2
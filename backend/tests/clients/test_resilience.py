@@ -0,0 +1,117 @@
+from unittest.mock import Mock
+
+import pytest
+from httpx import ConnectError, HTTPStatusError, ReadTimeout, Request, Response
+
+from app.clients.resilience import CircuitBreaker, RetryPolicy, parse_retry_after
+
+
+def make_response(status_code, headers=None):
+    return Response(status_code, headers=headers, request=Request("GET", "http://x"))
+
+
+def make_error(response):
+    return HTTPStatusError("error", request=response.request, response=response)
+
+
+@pytest.fixture
+def policy():
+    return RetryPolicy(
+        max_attempts=3, backoff_base=0.5, backoff_max=4.0, rng=lambda _, high: high
+    )
+
+
+def test_retries_idempotent_methods_on_5xx_and_429(policy):
+    for status_code in (429, 500, 502, 503, 504):
+        response = make_response(status_code)
+        assert policy.next_delay("GET", 1, make_error(response), response) == 0.5
+
+
+def test_backoff_grows_exponentially_and_stops(policy):
+    response = make_response(503)
+    error = make_error(response)
+    assert policy.next_delay("GET", 2, error, response) == 1.0
+    assert policy.next_delay("GET", 3, error, response) is None
+
+
+def test_does_not_retry_client_errors(policy):
+    response = make_response(404)
+    assert policy.next_delay("GET", 1, make_error(response), response) is None
+
+
+def test_non_idempotent_methods(policy):
+    response = make_response(500)
+    assert policy.next_delay("POST", 1, make_error(response), response) is None
+
+    throttled = make_response(429)
+    assert policy.next_delay("POST", 1, make_error(throttled), throttled) == 0.5
+
+    connect_error = ConnectError("refused")
+    assert policy.next_delay("POST", 1, connect_error, None) == 0.5
+    assert policy.next_delay("POST", 1, ReadTimeout("timeout"), None) is None
+    assert policy.next_delay("GET", 1, ReadTimeout("timeout"), None) == 0.5
+
+
+def test_honors_retry_after(policy):
+    response = make_response(503, headers={"Retry-After": "2"})
+    assert policy.next_delay("GET", 1, make_error(response), response) == 2.0
+
+    too_long = make_response(503, headers={"Retry-After": "60"})
+    assert policy.next_delay("GET", 1, make_error(too_long), too_long) is None
+
+
+def test_parse_retry_after_http_date():
+    response = make_response(
+        429, headers={"Retry-After": "Wed, 21 Oct 2015 07:28:10 GMT"}
+    )
+    assert parse_retry_after(response, now=1445412480.0) == 10.0
+    assert parse_retry_after(make_response(429), now=0) is None
+
+
+class TestCircuitBreaker:
+    @pytest.fixture
+    def clock(self):
+        return Mock(return_value=0.0)
+
+    @pytest.fixture
+    def breaker(self, clock):
+        return CircuitBreaker(failure_threshold=2, recovery_timeout=10, clock=clock)
+
+    def test_opens_after_consecutive_failures(self, breaker):
+        breaker.record_failure()
+        assert breaker.allow_request()
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow_request()
+        assert breaker.stats()["rejected"] == 1
+
+    def test_success_resets_failures(self, breaker):
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_half_open_probe(self, breaker, clock):
+        breaker.record_failure()
+        breaker.record_failure()
+        clock.return_value = 10.0
+
+        assert breaker.allow_request()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert not breaker.allow_request()
+
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.allow_request()
+
+    def test_failed_probe_reopens(self, breaker, clock):
+        breaker.record_failure()
+        breaker.record_failure()
+        clock.return_value = 10.0
+        assert breaker.allow_request()
+
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow_request()
+        assert breaker.stats()["opened"] == 2
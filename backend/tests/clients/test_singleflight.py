@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+from app.clients.singleflight import SingleFlight
+
+
+@pytest.mark.anyio
+async def test_concurrent_calls_are_coalesced():
+    singleflight = SingleFlight()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"value": calls}
+
+    results = await asyncio.gather(*(singleflight.do("key", fetch) for _ in range(10)))
+
+    assert calls == 1
+    assert results == [{"value": 1}] * 10
+    assert singleflight.stats() == {"executed": 1, "coalesced": 9, "in_flight": 0}
+
+
+@pytest.mark.anyio
+async def test_errors_are_shared():
+    singleflight = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise ValueError("upstream failure")
+
+    results = await asyncio.gather(
+        *(singleflight.do("key", fetch) for _ in range(3)), return_exceptions=True
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert singleflight.stats()["executed"] == 1
+
+
+@pytest.mark.anyio
+async def test_sequential_calls_are_not_coalesced():
+    singleflight = SingleFlight()
+
+    async def fetch():
+        return 1
+
+    await singleflight.do("key", fetch)
+    await singleflight.do("key", fetch)
+
+    assert singleflight.stats()["executed"] == 2
+
+
+@pytest.mark.anyio
+async def test_cancelled_caller_does_not_cancel_shared_call():
+    singleflight = SingleFlight()
+    release = asyncio.Event()
+
+    async def fetch():
+        await release.wait()
+        return "done"
+
+    first = asyncio.create_task(singleflight.do("key", fetch))
+    second = asyncio.create_task(singleflight.do("key", fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    assert await second == "done"
@@ -1,5 +1,5 @@
 from typing import Generator
-from unittest.mock import MagicMock, Mock
+from unittest.mock import AsyncMock, Mock
 
 import pytest
 from fastapi.testclient import TestClient
@@ -7,11 +7,16 @@ from httpx import Response
 
 from app.api import deps
 from app.clients.gitlab import GitLabClient
-from app.clients.mlflow import MLflowClient
+from app.clients.mlflow import AsyncMLflowClient, MLflowClient
 from app.main import app
 from tests import mlflow_test_data
 
 
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
 @pytest.fixture
 def mock_response():
     response = Mock(spec=Response)
@@ -26,8 +31,8 @@ def mlflow_client(mock_response):
     return client
 
 
-async def override_mlflow_dependency() -> MagicMock:
-    mock = MagicMock()
+async def override_mlflow_dependency() -> AsyncMock:
+    mock = AsyncMock()
 
     mock.get_registered_models.return_value = {
         "models": mlflow_test_data.models_without_type,
@@ -44,6 +49,14 @@ async def override_mlflow_dependency() -> MagicMock:
     return mock
 
 
+@pytest.fixture
+def async_mlflow_client(mock_response):
+    client = AsyncMLflowClient()
+    client.session = Mock()
+    client.perform_request = AsyncMock(return_value=mock_response)
+    return client
+
+
 @pytest.fixture()
 def client() -> Generator:
     with TestClient(app) as client:
@@ -44,3 +44,13 @@ def test_settings_invalid_cors():
             MLFLOW_TRACKING_URI="http://localhost:5000",
             BACKEND_CORS_ORIGINS=123,
         )
+
+
+def test_settings_server_types():
+    settings = config.Settings(
+        MLFLOW_TRACKING_URI="http://localhost:5000",
+        CUSTOM_SERVER_TYPES='{"ml.gpu.small": {"cpu": "4", "memory": "16Gi"}}',
+    )
+    assert settings.SERVER_TYPES["ml.cpu.small"] == {"cpu": "1", "memory": "2Gi"}
+    assert settings.SERVER_TYPES["ml.gpu.small"] == {"cpu": "4", "memory": "16Gi"}
+    assert settings.SERVER_TYPES is settings.SERVER_TYPES
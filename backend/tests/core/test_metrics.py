@@ -0,0 +1,153 @@
+import threading
+
+import pytest
+
+from app.core.metrics import (
+    Counter,
+    Gauge,
+    Histogram,
+    Registry,
+    collect_process_metrics,
+    format_value,
+    merge_metrics,
+    render,
+    retire_process_metrics,
+    write_process_metrics,
+)
+
+
+def test_format_value():
+    assert format_value(3.0) == "3"
+    assert format_value(0.25) == "0.25"
+    assert format_value(float("inf")) == "+Inf"
+
+
+def test_counter_render():
+    counter = Counter("requests_total", "Requests.", ("route",))
+    counter.inc("/models/{name}")
+    counter.inc("/models/{name}", amount=2)
+
+    assert counter.render() == (
+        "# HELP requests_total Requests.\n"
+        "# TYPE requests_total counter\n"
+        'requests_total{route="/models/{name}"} 3\n'
+    )
+
+
+def test_gauge_escapes_labels():
+    gauge = Gauge("temperature", "Temperature.", ("room",))
+    gauge.set(1.5, 'a "b"\n')
+
+    assert gauge.render().splitlines()[-1] == 'temperature{room="a \\"b\\"\\n"} 1.5'
+
+
+def test_gauge_callback():
+    gauge = Gauge("connections", "Connections.", ("state",), lambda: {("idle",): 4})
+
+    assert gauge.render().splitlines()[-1] == 'connections{state="idle"} 4'
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("latency_seconds", "Latency.", ("route",), (0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value, "/a")
+
+    assert histogram.render().splitlines()[2:] == [
+        'latency_seconds_bucket{route="/a",le="0.1"} 2',
+        'latency_seconds_bucket{route="/a",le="1"} 3',
+        'latency_seconds_bucket{route="/a",le="+Inf"} 4',
+        'latency_seconds_sum{route="/a"} 2.65',
+        'latency_seconds_count{route="/a"} 4',
+    ]
+
+
+def test_registry_rejects_duplicates():
+    registry = Registry()
+    registry.register(Counter("a_total", "A."))
+
+    with pytest.raises(ValueError):
+        registry.register(Counter("a_total", "A."))
+
+
+def test_registry_renders_extra_metrics():
+    registry = Registry()
+    registry.register(Counter("a_total", "A."))
+
+    text = registry.render([Gauge("b", "B.")])
+
+    assert text.index("# TYPE a_total counter") < text.index("# TYPE b gauge")
+
+
+def worker_metrics(requests: float, latency: float, lag: float):
+    counter = Counter("requests_total", "Requests.", ("route",))
+    counter.inc("/a", amount=requests)
+    histogram = Histogram("latency_seconds", "Latency.", (), (0.1, 1.0))
+    histogram.observe(latency)
+    connections = Gauge("connections", "Connections.")
+    connections.set(2)
+    lag_gauge = Gauge("lag_seconds", "Lag.", multiprocess="max")
+    lag_gauge.set(lag)
+    return [counter, histogram, connections, lag_gauge]
+
+
+def test_merge_metrics_across_processes():
+    families = [
+        metric.dump()
+        for metric in [*worker_metrics(1, 0.05, 3), *worker_metrics(2, 0.5, 7)]
+    ]
+
+    assert render(merge_metrics(families)).splitlines() == [
+        "# HELP requests_total Requests.",
+        "# TYPE requests_total counter",
+        'requests_total{route="/a"} 3',
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{le="0.1"} 1',
+        'latency_seconds_bucket{le="1"} 2',
+        'latency_seconds_bucket{le="+Inf"} 2',
+        "latency_seconds_sum 0.55",
+        "latency_seconds_count 2",
+        "# HELP connections Connections.",
+        "# TYPE connections gauge",
+        "connections 4",
+        "# HELP lag_seconds Lag.",
+        "# TYPE lag_seconds gauge",
+        "lag_seconds 7",
+    ]
+
+
+def test_exited_processes_keep_their_counters(tmp_path):
+    write_process_metrics(str(tmp_path), 10, worker_metrics(1, 0.05, 3))
+    write_process_metrics(str(tmp_path), 11, worker_metrics(2, 0.5, 7))
+
+    retire_process_metrics(str(tmp_path), 10)
+    retire_process_metrics(str(tmp_path), 12)
+    write_process_metrics(str(tmp_path), 13, worker_metrics(4, 0.5, 1))
+    retire_process_metrics(str(tmp_path), 13)
+
+    text = render(collect_process_metrics(str(tmp_path)))
+    assert 'requests_total{route="/a"} 7' in text
+    assert "latency_seconds_count 3" in text
+    assert "connections 2" in text
+    assert "lag_seconds 7" in text
+    assert not (tmp_path / "10.json").exists()
+
+
+def test_concurrent_writes_of_one_process(tmp_path):
+    errors = []
+
+    def write():
+        try:
+            for _ in range(100):
+                write_process_metrics(str(tmp_path), 10, worker_metrics(1, 0.05, 3))
+        except OSError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["10.json"]
@@ -0,0 +1,57 @@
+import cProfile
+
+from app.core.profiling import (
+    ProfileStore,
+    current_timings,
+    record_phase,
+    server_timing,
+    start_timings,
+    stop_timings,
+    timed_phase,
+)
+
+
+def test_record_phase_without_timings_is_ignored():
+    record_phase("upstream", 1.0)
+
+    assert current_timings() is None
+
+
+def test_phases_accumulate():
+    token = start_timings()
+    try:
+        record_phase("upstream", 0.25)
+        record_phase("upstream", 0.5)
+        with timed_phase("parse"):
+            pass
+        timings = current_timings()
+    finally:
+        stop_timings(token)
+
+    assert timings["upstream"] == 0.75
+    assert set(timings) == {"upstream", "parse"}
+    assert current_timings() is None
+
+
+def test_server_timing():
+    assert server_timing({"upstream": 0.0123, "serialize": 0.0004}, 0.015) == (
+        "upstream;dur=12.30, serialize;dur=0.40, total;dur=15.00"
+    )
+
+
+def test_profile_store_keeps_the_last_profiles():
+    store = ProfileStore(max_profiles=2)
+    profiler = cProfile.Profile()
+    profiler.enable()
+    sum(range(100))
+    profiler.disable()
+
+    for path in ("/a", "/b", "/c"):
+        store.add(profiler, "GET", path, 200, 0.6, {"upstream": 0.5})
+
+    assert [profile["path"] for profile in store.list()] == ["/c", "/b"]
+    assert "profile" not in store.list()[0]
+    assert store.get(1) is None
+    profile = store.get(3)
+    assert profile["timings_ms"] == {"upstream": 500.0}
+    assert "function calls" in profile["profile"]
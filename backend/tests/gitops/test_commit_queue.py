@@ -0,0 +1,246 @@
+import threading
+from unittest.mock import Mock
+
+import pytest
+from httpx import Request, Response
+
+from app.clients.gitlab import GitLabClientError
+from app.gitops.commit_queue import CommitQueue, is_branch_conflict, squash_action
+from app.gitops.manifest_index import ManifestIndex, git_blob_sha
+
+
+def action(kind, path, content="kind: InferenceService"):
+    return {"action": kind, "file_path": path, "content": content}
+
+
+def conflict_error(status_code=400, text="A file with this name already exists"):
+    response = Response(
+        status_code,
+        request=Request("POST", "https://gitlab.com"),
+        content=text.encode(),
+    )
+    return GitLabClientError(message="Failed to commit actions", raw_response=response)
+
+
+@pytest.fixture
+def gitlab_client():
+    client = Mock()
+    client.perform_commit.return_value = {"id": "abc123"}
+    return client
+
+
+@pytest.mark.parametrize(
+    "previous, new, expected",
+    [
+        (None, "update", "update"),
+        ("create", "update", "create"),
+        ("create", "delete", None),
+        ("delete", "create", "update"),
+        ("update", "delete", "delete"),
+        ("update", "update", "update"),
+    ],
+)
+def test_squash_action(previous, new, expected):
+    queued = action(previous, "a.yaml", "old") if previous else None
+
+    result = squash_action(queued, action(new, "a.yaml", "new"))
+
+    if expected is None:
+        assert result is None
+    else:
+        assert result["action"] == expected
+        assert result["content"] == "new"
+
+
+def test_is_branch_conflict():
+    assert is_branch_conflict(conflict_error())
+    assert is_branch_conflict(conflict_error(409, "Conflict"))
+    assert not is_branch_conflict(conflict_error(400, "Bad Request"))
+    assert not is_branch_conflict(GitLabClientError("circuit breaker is open"))
+
+
+def test_concurrent_submits_are_committed_once(gitlab_client):
+    queue = CommitQueue(gitlab_client, debounce=0.2)
+    futures = []
+
+    def submit(i):
+        futures.append(
+            queue.submit(
+                "1", "main", f"Deploy model {i}", [action("create", f"{i}.yaml")]
+            )
+        )
+
+    threads = [threading.Thread(target=submit, args=(i,)) for i in range(100)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert [future.result(timeout=5) for future in futures] == [{"id": "abc123"}] * 100
+    gitlab_client.perform_commit.assert_called_once()
+    _, _, message, actions = gitlab_client.perform_commit.call_args.args
+    assert len(actions) == 100
+    assert message.startswith("Apply 100 changes")
+    assert queue.stats() == {
+        "submitted": 100,
+        "commits": 1,
+        "conflicts": 0,
+        "pending_batches": 0,
+    }
+
+
+def test_repeated_writes_to_a_path_are_squashed(gitlab_client):
+    queue = CommitQueue(gitlab_client, debounce=60)
+    queue.submit("1", "main", "Deploy", [action("update", "a.yaml", "v1")])
+    queue.submit("1", "main", "Deploy", [action("update", "a.yaml", "v2")])
+
+    queue.flush("1", "main")
+
+    gitlab_client.perform_commit.assert_called_once_with(
+        "1", "main", "Deploy", [action("update", "a.yaml", "v2")]
+    )
+
+
+def test_cancelled_out_batch_skips_the_commit(gitlab_client):
+    queue = CommitQueue(gitlab_client, debounce=60)
+    first = queue.submit("1", "main", "Deploy", [action("create", "a.yaml")])
+    second = queue.submit("1", "main", "Undeploy", [action("delete", "a.yaml")])
+
+    queue.close()
+
+    assert first.result() is None
+    assert second.result() is None
+    gitlab_client.perform_commit.assert_not_called()
+
+
+def test_cancelled_submitter_does_not_stop_the_others(gitlab_client):
+    queue = CommitQueue(gitlab_client, debounce=60)
+    first = queue.submit("1", "main", "Deploy", [action("create", "a.yaml")])
+    second = queue.submit("1", "main", "Deploy", [action("create", "b.yaml")])
+    assert first.cancel()
+
+    queue.flush("1", "main")
+
+    assert second.result(timeout=0) == {"id": "abc123"}
+    gitlab_client.perform_commit.assert_called_once_with(
+        "1",
+        "main",
+        "Deploy",
+        [action("create", "a.yaml"), action("create", "b.yaml")],
+    )
+
+
+def test_branches_are_batched_separately(gitlab_client):
+    queue = CommitQueue(gitlab_client, debounce=60)
+    queue.submit("1", "main", "Deploy", [action("create", "a.yaml")])
+    queue.submit("1", "staging", "Deploy", [action("create", "a.yaml")])
+
+    queue.close()
+
+    assert gitlab_client.perform_commit.call_count == 2
+
+
+def test_max_actions_flushes_immediately(gitlab_client):
+    queue = CommitQueue(gitlab_client, debounce=60, max_actions=2)
+    first = queue.submit("1", "main", "Deploy", [action("create", "a.yaml")])
+    assert not first.done()
+
+    second = queue.submit("1", "main", "Deploy", [action("create", "b.yaml")])
+
+    assert first.result(timeout=5) == second.result(timeout=5) == {"id": "abc123"}
+    gitlab_client.perform_commit.assert_called_once()
+
+
+def test_submit_does_not_commit_in_the_caller(gitlab_client):
+    caller = threading.current_thread()
+    committers = []
+    gitlab_client.perform_commit.side_effect = lambda *_: committers.append(
+        threading.current_thread()
+    )
+    queue = CommitQueue(gitlab_client, debounce=60, max_actions=1)
+
+    queue.submit("1", "main", "Deploy", [action("create", "a.yaml")]).result(timeout=5)
+
+    assert committers and caller not in committers
+
+
+def test_conflict_is_retried_against_the_branch_head(gitlab_client, monkeypatch):
+    monkeypatch.setattr("app.gitops.commit_queue.time.sleep", lambda _: None)
+    gitlab_client.perform_commit.side_effect = [conflict_error(), {"id": "abc123"}]
+    gitlab_client.file_exists.side_effect = lambda _, path, __: path != "gone.yaml"
+    queue = CommitQueue(gitlab_client, debounce=60)
+    future = queue.submit(
+        "1",
+        "main",
+        "Deploy",
+        [action("create", "a.yaml"), action("delete", "gone.yaml")],
+    )
+
+    queue.flush("1", "main")
+
+    assert future.result() == {"id": "abc123"}
+    assert gitlab_client.perform_commit.call_args.args[3] == [
+        action("update", "a.yaml")
+    ]
+    assert queue.stats()["conflicts"] == 1
+
+
+def test_commit_error_is_set_on_every_future(gitlab_client):
+    error = conflict_error(400, "Bad Request")
+    gitlab_client.perform_commit.side_effect = error
+    queue = CommitQueue(gitlab_client, debounce=60)
+    futures = [
+        queue.submit("1", "main", "Deploy", [action("create", f"{i}.yaml")])
+        for i in range(3)
+    ]
+
+    queue.flush("1", "main")
+
+    for future in futures:
+        assert future.exception() is error
+    gitlab_client.perform_commit.assert_called_once()
+
+
+def test_conflict_rebase_uses_the_manifest_index(gitlab_client, monkeypatch):
+    monkeypatch.setattr("app.gitops.commit_queue.time.sleep", lambda _: None)
+    gitlab_client.perform_commit.side_effect = [conflict_error(), {"id": "abc123"}]
+    gitlab_client.get_tree.return_value = {
+        "a.yaml": "0" * 40,
+        "b.yaml": git_blob_sha("same"),
+    }
+    index = ManifestIndex(gitlab_client)
+    queue = CommitQueue(gitlab_client, debounce=60, manifest_index=index)
+    future = queue.submit(
+        "1",
+        "main",
+        "Deploy",
+        [action("create", "a.yaml", "new"), action("create", "b.yaml", "same")],
+    )
+
+    queue.flush("1", "main")
+
+    assert future.result() == {"id": "abc123"}
+    assert gitlab_client.perform_commit.call_args.args[3] == [
+        action("update", "a.yaml", "new")
+    ]
+    gitlab_client.file_exists.assert_not_called()
+    assert index.blobs("1", "main")["a.yaml"] == git_blob_sha("new")
+
+
+def test_conflict_rebase_keeps_deletes_of_empty_files(gitlab_client, monkeypatch):
+    monkeypatch.setattr("app.gitops.commit_queue.time.sleep", lambda _: None)
+    gitlab_client.perform_commit.side_effect = [conflict_error(), {"id": "abc123"}]
+    gitlab_client.get_tree.return_value = {"empty.yaml": git_blob_sha("")}
+    queue = CommitQueue(
+        gitlab_client, debounce=60, manifest_index=ManifestIndex(gitlab_client)
+    )
+    future = queue.submit(
+        "1", "main", "Undeploy", [{"action": "delete", "file_path": "empty.yaml"}]
+    )
+
+    queue.flush("1", "main")
+
+    assert future.result() == {"id": "abc123"}
+    assert gitlab_client.perform_commit.call_args.args[3] == [
+        {"action": "delete", "file_path": "empty.yaml"}
+    ]
@@ -0,0 +1,141 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from unittest.mock import AsyncMock
+
+import pytest
+import yaml
+
+from app.gitops.fleet import (
+    FleetRenderer,
+    fleet_resource,
+    iter_fleet_models,
+    service_name,
+)
+from tests import mlflow_test_data
+
+
+@pytest.mark.parametrize(
+    "model_name, version, expected",
+    [
+        ("churn_model", "2", "churn-model-v2"),
+        ("Churn.Model", "10", "churn-model-v10"),
+        ("__", "1", "model-v1"),
+        ("a" * 80, "3", "a" * 60 + "-v3"),
+    ],
+)
+def test_service_name(model_name, version, expected):
+    assert service_name(model_name, version) == expected
+
+
+def test_fleet_resource():
+    model = mlflow_test_data.models_without_type[0]
+
+    resource = fleet_resource(model, "ml.cpu.small", "deployer")
+
+    assert resource.name == "churn-model-v1"
+    assert resource.storage_uri == model["source"]
+    assert resource.service_account == "deployer"
+
+
+async def collect(chunks):
+    return [chunk async for chunk in chunks]
+
+
+@pytest.mark.anyio
+async def test_iter_fleet_models_pages_through_the_filter():
+    async def iter_model_version_pages(**kwargs):
+        assert kwargs == {"filter": "name='churn_model'", "page_size": 2}
+        yield mlflow_test_data.models_without_type[:2]
+
+    mlflow_client = AsyncMock()
+    mlflow_client.iter_model_version_pages = iter_model_version_pages
+
+    chunks = await collect(
+        iter_fleet_models(mlflow_client, filter="name='churn_model'", chunk_size=2)
+    )
+
+    assert chunks == [(mlflow_test_data.models_without_type[:2], [])]
+
+
+@pytest.mark.anyio
+async def test_iter_fleet_models_resolves_versions_in_chunks():
+    failed = {"name": "churn_model", "version": 9, "error": "x", "status_code": 404}
+    mlflow_client = AsyncMock()
+    mlflow_client.get_model_version_batch.side_effect = [
+        [
+            {"name": "churn_model", "version": 1, "model": {"name": "churn_model"}},
+            failed,
+        ],
+        [{"name": "uplift_model", "version": 1, "model": {"name": "uplift_model"}}],
+    ]
+    versions = [("churn_model", 1), ("churn_model", 9), ("uplift_model", 1)]
+
+    chunks = await collect(
+        iter_fleet_models(mlflow_client, versions=versions, chunk_size=2)
+    )
+
+    assert chunks == [
+        ([{"name": "churn_model"}], [failed]),
+        ([{"name": "uplift_model"}], []),
+    ]
+    assert mlflow_client.get_model_version_batch.await_args_list[1].args == (
+        [("uplift_model", 1)],
+    )
+
+
+async def model_chunks():
+    models = mlflow_test_data.models_without_type
+    yield models[:2], []
+    yield [models[2], models[2]], [{"name": "x", "version": 1, "status_code": 404}]
+
+
+@pytest.mark.anyio
+async def test_fleet_renderer_renders_in_a_process_pool():
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        renderer = FleetRenderer(pool, "ml.cpu.small", "default", window=1)
+        chunks = await collect(renderer.render(model_chunks()))
+
+    assert [[name for name, _ in chunk] for chunk in chunks] == [
+        ["churn-model-v1", "churn-model-v2"],
+        ["uplift-model-v1"],
+    ]
+    document = yaml.safe_load(chunks[1][0][1])
+    assert (
+        document["spec"]["predictor"]["model"]["storageUri"]
+        == (mlflow_test_data.models_without_type[2]["source"])
+    )
+    assert renderer.failed == [{"name": "x", "version": 1, "status_code": 404}]
+
+
+@pytest.mark.anyio
+async def test_fleet_renderer_cancels_pending_chunks_when_closed():
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        renderer = FleetRenderer(pool, "ml.cpu.small", window=2)
+        chunks = renderer.render(model_chunks())
+        await chunks.asend(None)
+        await chunks.aclose()
+
+
+@pytest.mark.anyio
+async def test_fleet_renderer_reports_service_name_collisions():
+    churn = mlflow_test_data.models_without_type[0]
+
+    async def chunks():
+        yield [churn, {**churn, "name": "Churn.Model"}], []
+        yield [churn], []
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        renderer = FleetRenderer(pool, "ml.cpu.small")
+        rendered = await collect(renderer.render(chunks()))
+
+    assert [[name for name, _ in chunk] for chunk in rendered] == [
+        ["churn-model-v1"],
+        ["churn-model-v1"],
+    ]
+    assert renderer.collisions == [
+        {
+            "name": "Churn.Model",
+            "version": 1,
+            "error": "service name churn-model-v1 is already used by churn_model version 1",
+            "status_code": 409,
+        }
+    ]
@@ -0,0 +1,116 @@
+import subprocess
+from unittest.mock import Mock
+
+import pytest
+
+from app.gitops.manifest_index import ManifestIndex, git_blob_sha, render_manifest
+from app.kubernetes.kserve_resource import InferenceServiceResource
+
+
+def resource(storage_uri="s3://bucket/model/1"):
+    return InferenceServiceResource(
+        name="iris",
+        service_account="default",
+        storage_uri=storage_uri,
+        instance_type="ml.cpu.small",
+    )
+
+
+@pytest.fixture
+def gitlab_client():
+    client = Mock()
+    client.get_tree.return_value = {
+        "models/iris.yaml": git_blob_sha(render_manifest(resource())),
+        "README.md": "0" * 40,
+    }
+    return client
+
+
+def test_git_blob_sha_matches_git():
+    content = "kind: InferenceService\n"
+    expected = (
+        subprocess.run(
+            ["git", "hash-object", "--stdin"],
+            input=content.encode(),
+            capture_output=True,
+            check=True,
+        )
+        .stdout.decode()
+        .strip()
+    )
+
+    assert git_blob_sha(content) == expected
+
+
+def test_plan_skips_unchanged_manifests(gitlab_client):
+    index = ManifestIndex(gitlab_client)
+
+    actions = index.plan("1", "main", {"models/iris.yaml": resource()})
+
+    assert actions == []
+    assert index.stats()["unchanged"] == 1
+
+
+def test_plan_detects_create_and_update(gitlab_client):
+    index = ManifestIndex(gitlab_client)
+    changed = resource("s3://bucket/model/2")
+
+    actions = index.plan(
+        "1",
+        "main",
+        {"models/iris.yaml": changed, "models/wine.yaml": resource()},
+    )
+
+    assert actions == [
+        {
+            "action": "update",
+            "file_path": "models/iris.yaml",
+            "content": render_manifest(changed),
+        },
+        {
+            "action": "create",
+            "file_path": "models/wine.yaml",
+            "content": render_manifest(resource()),
+        },
+    ]
+    gitlab_client.get_tree.assert_called_once_with("1", "main")
+
+
+def test_tree_is_listed_once_per_ttl(gitlab_client):
+    now = [0.0]
+    index = ManifestIndex(gitlab_client, ttl=60, clock=lambda: now[0])
+
+    index.plan("1", "main", {"models/iris.yaml": resource()})
+    index.plan("1", "main", {"models/iris.yaml": resource()})
+    assert gitlab_client.get_tree.call_count == 1
+
+    now[0] = 61.0
+    index.plan("1", "main", {"models/iris.yaml": resource()})
+    assert gitlab_client.get_tree.call_count == 2
+
+
+def test_record_applies_committed_actions(gitlab_client):
+    index = ManifestIndex(gitlab_client)
+    changed = resource("s3://bucket/model/2")
+    actions = index.plan("1", "main", {"models/iris.yaml": changed})
+
+    index.record(
+        "1", "main", actions + [{"action": "delete", "file_path": "README.md"}]
+    )
+
+    assert index.plan("1", "main", {"models/iris.yaml": changed}) == []
+    assert "README.md" not in index.blobs("1", "main")
+    gitlab_client.get_tree.assert_called_once()
+
+
+def test_record_of_untracked_action_forgets_the_branch(gitlab_client):
+    index = ManifestIndex(gitlab_client)
+    index.blobs("1", "main")
+
+    index.record(
+        "1",
+        "main",
+        [{"action": "move", "file_path": "b.yaml", "previous_path": "README.md"}],
+    )
+
+    assert index.stats()["branches"] == 0
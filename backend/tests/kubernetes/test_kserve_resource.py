@@ -1,3 +1,7 @@
+from dataclasses import FrozenInstanceError
+
+import pytest
+
 from app.kubernetes.kserve_resource import InferenceServiceResource
 
 
@@ -115,3 +119,40 @@ def test_to_dict():
     }
 
     assert resource.to_dict() == expected_dict
+
+
+def test_inference_service_resource_is_immutable_and_hashable():
+    resource = InferenceServiceResource(
+        name="test-service",
+        service_account="default",
+        storage_uri="s3://bucket/model",
+        instance_type="ml.cpu.small",
+    )
+    same = InferenceServiceResource(
+        name="test-service",
+        service_account="default",
+        storage_uri="s3://bucket/model",
+        instance_type="ml.cpu.small",
+    )
+
+    assert resource == same
+    assert len({resource, same}) == 1
+    assert resource != InferenceServiceResource(
+        name="test-service",
+        service_account="default",
+        storage_uri="s3://bucket/model",
+        instance_type="ml.cpu.medium",
+    )
+    assert not hasattr(resource, "__dict__")
+    with pytest.raises(FrozenInstanceError):
+        resource.storage_uri = "s3://bucket/other"
+
+
+def test_inference_service_resource_unknown_instance_type():
+    with pytest.raises(KeyError):
+        InferenceServiceResource(
+            name="test-service",
+            service_account="default",
+            storage_uri="s3://bucket/model",
+            instance_type="ml.gpu.unknown",
+        )
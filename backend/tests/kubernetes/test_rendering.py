@@ -0,0 +1,59 @@
+import yaml
+
+from app.kubernetes import rendering
+from app.kubernetes.base_resource import BaseResource
+from app.kubernetes.kserve_resource import InferenceServiceResource
+from app.kubernetes.rendering import YAMLRenderer, dump_yaml
+
+
+def resource(name="iris"):
+    return InferenceServiceResource(
+        name=name,
+        service_account="default",
+        storage_uri="s3://bucket/model",
+        instance_type="ml.cpu.small",
+        batcher=True,
+        logger=True,
+        url="http://logger",
+        prometheus=True,
+    )
+
+
+def test_dump_yaml_matches_pure_python_emitter(monkeypatch):
+    data = resource().to_dict()
+    rendered = dump_yaml(data)
+
+    monkeypatch.setattr(rendering, "YAML_DUMPER", yaml.Dumper)
+
+    assert dump_yaml(data) == rendered
+    assert rendered == yaml.dump(data, sort_keys=False)
+
+
+def test_render_reuses_unchanged_manifests():
+    renderer = YAMLRenderer(max_entries=10)
+
+    first = renderer.render(resource().to_dict())
+    second = renderer.render(resource().to_dict())
+    renderer.render(resource("wine").to_dict())
+
+    assert first is second
+    assert renderer.stats() == {"hits": 1, "misses": 2, "entries": 2}
+
+
+def test_render_evicts_least_recently_used():
+    renderer = YAMLRenderer(max_entries=1)
+
+    renderer.render(resource().to_dict())
+    renderer.render(resource("wine").to_dict())
+    renderer.render(resource().to_dict())
+
+    assert renderer.stats() == {"hits": 0, "misses": 3, "entries": 1}
+
+
+def test_to_yaml_stream():
+    resources = [resource(), resource("wine")]
+
+    stream = BaseResource.to_yaml_stream(resources)
+
+    assert stream.startswith("---\n")
+    assert list(yaml.safe_load_all(stream)) == [r.to_dict() for r in resources]
@@ -68,9 +68,12 @@ registered_models = {
     ]
 }
 
+registered_model = {"registered_model": registered_models["registered_models"][0]}
+
 latest_model_version = {
     "model_versions": [
-        {**common_data["churn_model"], "name": "churn_model", "version": "2"}
+        {**common_data["churn_model"], "name": "churn_model", "version": "1"},
+        {**common_data["churn_model"], "name": "churn_model", "version": "2"},
     ]
 }
 
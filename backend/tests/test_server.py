@@ -0,0 +1,227 @@
+import asyncio
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+import pytest
+
+from app.api.metrics import metrics_directory
+from app.core import lifecycle
+from app.core.config import settings
+from app.core.metrics import (
+    Counter,
+    collect_process_metrics,
+    render,
+    write_process_metrics,
+)
+from app.server import STARTUP_FAILURE, available_cpus
+
+SERVED = Counter("served_total", "Requests served.")
+STREAM_END = asyncio.Event()
+
+
+async def pid_app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        while (await receive())["type"] != "lifespan.shutdown":
+            await send({"type": "lifespan.startup.complete"})
+        await send({"type": "lifespan.shutdown.complete"})
+        return
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": str(os.getpid()).encode()})
+
+
+async def role_app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        await pid_app(scope, receive, send)
+        return
+    body = f"{os.getpid()} {int(settings.SERVER_PRIMARY)}".encode()
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def counting_app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        await pid_app(scope, receive, send)
+        return
+    SERVED.inc()
+    write_process_metrics(metrics_directory(), os.getpid(), [SERVED])
+    text = render(collect_process_metrics(metrics_directory()))
+    body = f"{os.getpid()} {text.splitlines()[-1].split()[-1]}".encode()
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def streaming_app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        lifecycle.on_shutdown(STREAM_END.set)
+        await pid_app(scope, receive, send)
+        return
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"open", "more_body": True})
+    await STREAM_END.wait()
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def failing_app(_scope, receive, send):
+    await receive()
+    await send({"type": "lifespan.startup.failed", "message": "broken"})
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def serve(app: str, port: int, workers: int) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, "-m", "app.server", app, f"--port={port}"],
+        env={
+            **os.environ,
+            "SERVER_WORKERS": str(workers),
+            "SERVER_READY_TIMEOUT": "10",
+        },
+    )
+
+
+def get_pid(url: str, timeout: float = 10.0) -> int:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return int(httpx.get(url, timeout=1.0).text)
+        except httpx.TransportError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+@pytest.mark.parametrize(
+    "cpu_max, expected",
+    [("max 100000", None), ("150000 100000", 2), ("50000 100000", 1)],
+)
+def test_available_cpus_honours_cgroup_quota(tmp_path, cpu_max, expected):
+    (tmp_path / "cpu.max").write_text(cpu_max)
+    affinity = len(os.sched_getaffinity(0))
+
+    assert available_cpus(str(tmp_path)) == min(affinity, expected or affinity)
+
+
+def test_available_cpus_without_cgroup(tmp_path):
+    assert available_cpus(str(tmp_path)) == len(os.sched_getaffinity(0))
+
+
+def test_rolling_restart_and_shutdown():
+    port = free_port()
+    url = f"http://127.0.0.1:{port}/"
+    server = serve("tests.test_server:pid_app", port, workers=1)
+    try:
+        before = get_pid(url)
+        server.send_signal(signal.SIGHUP)
+        deadline = time.monotonic() + 10
+        while get_pid(url) == before:
+            assert time.monotonic() < deadline
+            time.sleep(0.1)
+        server.send_signal(signal.SIGTERM)
+        assert server.wait(timeout=10) == 0
+    finally:
+        server.kill()
+        server.wait()
+
+
+def test_worker_startup_failure_stops_server():
+    server = serve("tests.test_server:failing_app", free_port(), workers=2)
+    try:
+        assert server.wait(timeout=20) == STARTUP_FAILURE
+    finally:
+        server.kill()
+        server.wait()
+
+
+def worker_roles(url: str, workers: int, timeout: float = 10.0) -> dict:
+    roles = {}
+    deadline = time.monotonic() + timeout
+    while len(roles) < workers:
+        assert time.monotonic() < deadline
+        try:
+            pid, primary = httpx.get(url, timeout=1.0).text.split()
+        except httpx.TransportError:
+            time.sleep(0.1)
+            continue
+        roles[int(pid)] = primary == "1"
+    return roles
+
+
+def test_one_worker_is_primary_across_restarts():
+    port = free_port()
+    url = f"http://127.0.0.1:{port}/"
+    server = serve("tests.test_server:role_app", port, workers=2)
+    try:
+        before = worker_roles(url, 2)
+        assert sorted(before.values()) == [False, True]
+        server.send_signal(signal.SIGHUP)
+        deadline = time.monotonic() + 10
+        while True:
+            after = worker_roles(url, 2)
+            if not set(after) & set(before):
+                break
+            assert time.monotonic() < deadline
+            time.sleep(0.1)
+        assert sorted(after.values()) == [False, True]
+        server.send_signal(signal.SIGTERM)
+        assert server.wait(timeout=10) == 0
+    finally:
+        server.kill()
+        server.wait()
+
+
+def test_counters_survive_restarts():
+    port = free_port()
+    url = f"http://127.0.0.1:{port}/"
+    server = serve("tests.test_server:counting_app", port, workers=2)
+    try:
+        first = worker_roles(url, 2)
+        server.send_signal(signal.SIGHUP)
+        deadline = time.monotonic() + 10
+        while True:
+            pid, served = httpx.get(url, timeout=1.0).text.split()
+            if int(pid) not in first:
+                break
+            assert time.monotonic() < deadline
+            time.sleep(0.1)
+        assert int(served) > len(first)
+        server.send_signal(signal.SIGTERM)
+        assert server.wait(timeout=10) == 0
+    finally:
+        server.kill()
+        server.wait()
+
+
+def test_shutdown_ends_open_streams():
+    port = free_port()
+    server = serve("tests.test_server:streaming_app", port, workers=1)
+    try:
+        deadline = time.monotonic() + 10
+        while True:
+            try:
+                stream = socket.create_connection(("127.0.0.1", port))
+                break
+            except ConnectionRefusedError:
+                assert time.monotonic() < deadline
+                time.sleep(0.1)
+        with stream:
+            stream.sendall(b"GET / HTTP/1.1\r\nHost: localhost\r\n\r\n")
+            received = b""
+            while b"open" not in received:
+                chunk = stream.recv(4096)
+                assert chunk
+                received += chunk
+            server.send_signal(signal.SIGTERM)
+            # Well within SERVER_GRACEFUL_TIMEOUT.
+            assert server.wait(timeout=10) == 0
+    finally:
+        server.kill()
+        server.wait()